@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
-from app.models.dinner import  Dinner, DinnerGroup
-from app.schemas.dinner import CreateDinnerRequest, CreateDinnerResponse
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from app.models.dinner import  Dinner, DinnerGroup, DinnerSummary
+from app.schemas.dinner import CreateDinnerRequest, CreateDinnerResponse, DinnerAdminSummary
 from typing import List, Optional
-from app.schemas.response import SuccessResponse
-from app.services.matchmaking.v1 import run_matchmaking_for_dinner, calculate_group_score, group_users_by_preferences
-from app.models.user import User
+from app.schemas.response import SuccessResponse, PaginatedResponse
+from app.core.responses import ModelResponse
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, date_id_before, id_after
+from app.db.dinner_queries import opt_in_counts_pipeline
+from app.db.read_preference import aggregate_on_secondary, find_on_secondary
+from app.services.matchmaking.runner import match_dinner
 from app.utils.send_dinner_match_email import send_dinner_match_email
 from app.dependencies.admin import get_current_admin_user
 from pydantic import EmailStr, BaseModel
@@ -12,13 +15,17 @@ from app.models.admin import AdminUser
 from app.utils.hashing import verify_password
 from app.services.session import create_or_update_session
 from app.models.venue import Venue
+from app.models.dinner_opt_in import DinnerOptIn
+from beanie.operators import In
 router = APIRouter(prefix="/admin", tags=["Admin"])
 from app.schemas.venue import CreateVenueRequest, VenueResponse
 from beanie import PydanticObjectId
 import asyncio
-import pprint
-from app.core.logger import logger
-from app.core.notifications.producer import queue_email_notification
+from app.core.executors import run_cpu_bound
+from app.services.dinner_cache import invalidate_upcoming_dinners
+from app.services.notifications.venue import notify_venue_assignments
+from app.services.venue_assignment import assign_groups_to_venues, split_for_assignment
+from pymongo import UpdateOne
 class AdminLoginRequest(BaseModel):
     email: EmailStr
     password: str
@@ -29,9 +36,16 @@ class UpdateVenueRequest(BaseModel):
     city: Optional[str]
     country: Optional[str]
     is_active: Optional[bool]
+    max_group_size: Optional[int] = None
+    capacity: Optional[int] = None
+    budget_category: Optional[str] = None
 
 class UpdateVenueRequestForDinner(BaseModel):
     venue_id: str
+
+class AssignVenuesRequest(BaseModel):
+    overwrite: bool = False  # also reassign groups that already have a venue
+    notify: bool = True
 class TokenPair(BaseModel):
     access_token: str
     refresh_token: str
@@ -41,7 +55,8 @@ async def admin_login(payload: AdminLoginRequest,  request: Request):
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
 
-    if not verify_password(payload.password, admin.password_hash):
+    # bcrypt is deliberately slow; keep it off the event loop
+    if not await run_cpu_bound(verify_password, payload.password, admin.password_hash):
         raise HTTPException(status_code=401, detail="Incorrect password")
 
    
@@ -63,17 +78,54 @@ async def create_dinner(payload: CreateDinnerRequest):
         country=payload.country,
         opted_in_user_ids=[]
     )
-    Dinner.country == payload.country
     await dinner.insert()
+    invalidate_upcoming_dinners(dinner.city, dinner.country)
     return SuccessResponse(message="Dinner created successfully", data={
         "id": str(dinner.id)
     })
 
 
-@router.get("/dinner/all", response_model=SuccessResponse[List[Dinner]], dependencies=[Depends(get_current_admin_user)])
-async def list_all_dinners():
-  dinners= await Dinner.find_all().to_list()
-  return SuccessResponse(message="Dinners fetched successfully", data=dinners)
+@router.get("/dinner/all", response_model=PaginatedResponse[DinnerAdminSummary], dependencies=[Depends(get_current_admin_user)])
+async def list_all_dinners(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    # Newest first, keyset-paginated on (date, _id); listings read from a secondary
+    dinners = await find_on_secondary(
+        Dinner,
+        date_id_before(cursor),
+        DinnerSummary,
+        sort=[("date", -1), ("_id", -1)],
+        limit=limit,
+    )
+
+    counts = {}
+    if dinners:
+        rows = await aggregate_on_secondary(
+            DinnerOptIn, opt_in_counts_pipeline([dinner.id for dinner in dinners])
+        )
+        counts = {row["_id"]: row["count"] for row in rows}
+
+    next_cursor = None
+    if len(dinners) == limit:
+        last = dinners[-1]
+        next_cursor = encode_cursor(date=last.date.isoformat(), id=str(last.id))
+
+    return ModelResponse(PaginatedResponse[DinnerAdminSummary](
+        message="Dinners fetched successfully",
+        data=[
+            DinnerAdminSummary(
+                id=str(dinner.id),
+                date=dinner.date,
+                city=dinner.city,
+                country=dinner.country,
+                matched=dinner.matched,
+                opt_in_count=counts.get(dinner.id, 0),
+            )
+            for dinner in dinners
+        ],
+        next_cursor=next_cursor,
+    ))
 
 
 @router.get("/dinner/{dinner_id}", response_model=SuccessResponse[Dinner],  dependencies=[Depends(get_current_admin_user)])
@@ -102,105 +154,91 @@ async def update_dinner_group_venue(
     if not venue or not venue.is_active:
         raise HTTPException(status_code=400, detail="Invalid or inactive venue ID")
 
-    group.venue_id = payload.venue_id
+    group.venue_id = venue.id
     await group.save()
 
     # 📬 Notify all participants in the group
-    for user_id in group.participant_ids:
-        user = await User.get(user_id)
-        if not user:
-            continue
-        queue_email_notification(
-        to_email=user.email,
-        template="venue_update",
-        data={
-            "name": user.name or "there",
-            "venue_name": venue.name,
-            "venue_address": venue.address,
-            "city": venue.city,
-            "date": group.date.strftime("%A, %d %B %Y") if hasattr(group, "date") else "your dinner date"
-        }
-    )
+    dinner = await Dinner.find_one(Dinner.id == group.dinner_id, projection_model=DinnerSummary)
+    if dinner:
+        await notify_venue_assignments(dinner, [(group, venue)])
 
     return SuccessResponse(message="Venue updated successfully and users notified", data=group)
 
 
-    return SuccessResponse(message="Venue updated successfully", data=group)
+@router.post("/dinner/{dinner_id}/assign-venues", dependencies=[Depends(get_current_admin_user)])
+async def assign_venues(dinner_id: PydanticObjectId, payload: AssignVenuesRequest):
+    dinner = await Dinner.find_one(Dinner.id == dinner_id, projection_model=DinnerSummary)
+    if not dinner:
+        raise HTTPException(status_code=404, detail="Dinner not found")
+
+    groups = await DinnerGroup.find(DinnerGroup.dinner_id == dinner.id).to_list()
+    venues = await Venue.find(
+        Venue.city == dinner.city,
+        Venue.country == dinner.country,
+        Venue.is_active == True,
+    ).to_list()
+
+    pending, used_capacity = split_for_assignment(groups, payload.overwrite)
+
+    result = await run_cpu_bound(
+        assign_groups_to_venues, pending, venues, dinner.city, dinner.country, used_capacity
+    )
+
+    if result.assignments:
+        await DinnerGroup.get_motor_collection().bulk_write(
+            [
+                UpdateOne({"_id": group_id}, {"$set": {"venue_id": venue_id}})
+                for group_id, venue_id in result.assignments.items()
+            ],
+            ordered=False,
+        )
+
+    notified = 0
+    if payload.notify and result.assignments:
+        venues_by_id = {venue.id: venue for venue in venues}
+        groups_by_id = {group.id: group for group in pending}
+        notified = await notify_venue_assignments(dinner, [
+            (groups_by_id[group_id], venues_by_id[venue_id])
+            for group_id, venue_id in result.assignments.items()
+        ])
+
+    return SuccessResponse(message="Venues assigned", data={
+        "summary": {
+            "dinner_id": str(dinner.id),
+            "groups_considered": len(pending),
+            "assigned": len(result.assignments),
+            "unassigned_group_ids": [str(group_id) for group_id in result.unassigned],
+            "total_cost": result.total_cost,
+            "notifications_queued": notified,
+        }
+    })
+
+
 @router.post("/run-matching", dependencies=[Depends(get_current_admin_user)])
 async def run_matching(dinner_id: PydanticObjectId):
-    dinner = await Dinner.get(dinner_id)
+    # Safe to call concurrently from any replica: runs are serialized per dinner by a lease
+    result = await match_dinner(dinner_id)
 
-    if not dinner or dinner.matched:
+    if result.status in ("not_found", "already_matched"):
         raise HTTPException(status_code=404, detail="Dinner not found or already matched")
+    if result.status in ("busy", "lost"):
+        raise HTTPException(status_code=409, detail="Matching for this dinner is already in progress")
 
-    user_map = {}
-    for opt_in in dinner.opted_in_users:
-        user = await User.get(opt_in.user_id)
-        if user and user.personality_answers and user.personality_scores:
-            user_map[user.id] = {
-                "user": user,
-                "budget_category": opt_in.budget_category,
-                "dietary_category": opt_in.dietary_category
-            }
-
-    if len(user_map) < 6:
+    if result.status == "skipped":
         return {
             "message": "Insufficient users",
             "summary": {
-                "dinner_id": str(dinner.id),
+                "dinner_id": str(dinner_id),
                 "status": "skipped",
-                "reason": f"Only {len(user_map)} valid users"
+                "reason": result.reason
             }
         }
 
-    users = [entry["user"] for entry in user_map.values()]
-
-    preference_groups = group_users_by_preferences(user_map)
-    logger.info("Preference groups:\n%s", pprint.pformat(preference_groups))
-
-
-    matched_groups = []
-    for (budget, dietary), user_list in preference_groups.items():
-        if len(user_list) < 6:
-            continue  # Not enough users for a group
-        new_groups = await run_matchmaking_for_dinner(user_list)
-        matched_groups.extend(new_groups)  # accumulate all matched groups
-        for group in new_groups:
-            match_score = calculate_group_score(group)
-
-            dinner_group = DinnerGroup(
-                dinner_id=dinner.id,
-                participant_ids=[u.id for u in group],
-                venue_id=None,
-                budget_category=budget,
-                dietary_category=dietary,
-                match_score=match_score
-            )
-            await dinner_group.insert()
-
-            # Notify users
-            for user in group:
-                queue_email_notification(
-                    to_email=user.email,
-                    template="dinner_update",
-                    data={
-                        "name": user.name or "there",
-                        "date": dinner.date.strftime("%A, %d %B %Y"),
-                        "time": dinner.date.strftime("%I:%M %p"),
-                        "city": dinner.city
-                    }
-                )
-                
-
-
-    dinner.matched = True
-    await dinner.save()
-
     return SuccessResponse(message= "Matching complete",data={
             "summary": {
-                "dinner_id": str(dinner.id),
-                "groups_created": len(matched_groups),
-                "ungrouped_users": len(users) % 6,
+                "dinner_id": str(dinner_id),
+                "groups_created": result.groups_created,
+                "ungrouped_users": result.ungrouped_users,
                 "status": "matched"
             }
     })
@@ -234,10 +272,20 @@ async def update_venue(venue_id: str, payload: UpdateVenueRequest):
     return SuccessResponse(message="Venue updated", data=venue)
 
 
-@router.get("/venues", response_model=SuccessResponse[List[Venue]], dependencies=[Depends(get_current_admin_user)])
-async def list_venues():
-    venues = await Venue.find_all().to_list()
-    return SuccessResponse(message="Venues fetched", data=venues)
+@router.get("/venues", response_model=PaginatedResponse[Venue], dependencies=[Depends(get_current_admin_user)])
+async def list_venues(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    venues = await find_on_secondary(Venue, id_after(cursor), Venue, sort=[("_id", 1)], limit=limit)
+
+    next_cursor = None
+    if len(venues) == limit:
+        next_cursor = encode_cursor(id=str(venues[-1].id))
+
+    return ModelResponse(PaginatedResponse[Venue](
+        message="Venues fetched", data=venues, next_cursor=next_cursor
+    ))
 
 @router.get("/venues/{venue_id}", response_model=SuccessResponse[VenueResponse], dependencies=[Depends(get_current_admin_user)])
 async def get_venue(venue_id: str):
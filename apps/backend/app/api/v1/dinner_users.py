@@ -1,18 +1,25 @@
 # dinner_routes_user.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from beanie.operators import In
 from typing import List, Optional
 from datetime import date
 from beanie import PydanticObjectId
-from app.models.user import User
-from app.models.dinner import DinnerGroup, Dinner, DinnerPublicResponse, DinnerOptInUser
+from app.models.user import AuthPrincipal
+from app.models.dinner import DinnerGroup, Dinner, DinnerPublicResponse, DinnerSummary
+from app.models.dinner_opt_in import DinnerOptIn
+from pymongo.errors import DuplicateKeyError
 from app.dependencies.auth import get_current_user
 from app.schemas.response import SuccessResponse
+from app.core.responses import ModelResponse
+from app.schemas.dinner import BookingResponse
+from app.db.dinner_queries import user_bookings_pipeline
+from app.db.read_preference import aggregate_on_secondary
+from app.services.dinner_cache import get_upcoming_dinners_body
 from datetime import datetime, time, timezone, timedelta
 from pydantic import BaseModel
-from bson import ObjectId
 from app.utils.require_active_subscription import require_active_subscription
 from app.core.notifications.producer import queue_email_notification
+from app.core.executors import run_blocking
 from zoneinfo import ZoneInfo  # Python 3.9+
 
 class OptInResponse(BaseModel):
@@ -37,44 +44,37 @@ class UserDinnerStatus(BaseModel):
 router = APIRouter(prefix="/dinner", tags=["Dinner - User"])
 
 @router.get("/upcoming", response_model=SuccessResponse[List[DinnerPublicResponse]])
-async def get_upcoming_dinners(user: User = Depends(get_current_user)):
-    today_utc = datetime.combine(date.today(), time.min).replace(tzinfo=timezone.utc)
-    cutoff_datetime = datetime.now(timezone.utc) + timedelta(hours=48)
-
-    upcoming_dinners = await Dinner.find(
-        Dinner.city == user.current_city,
-        Dinner.country == user.current_country,
-        Dinner.date >= cutoff_datetime
-    ).sort("date").limit(3).to_list()
-
-    print("UTC Today:", today_utc)
-
-    return SuccessResponse(message="Upcoming dinners fetched", data=upcoming_dinners)
+async def get_upcoming_dinners(user: AuthPrincipal = Depends(get_current_user)):
+    body = await get_upcoming_dinners_body(user.current_city, user.current_country)
+    return Response(content=body, media_type="application/json")
 
 @router.post("/opt-in", response_model=SuccessResponse[OptInResponse])
 async def opt_in_to_dinner(
     payload: OptInRequest,
-    user: User = Depends(require_active_subscription)  # 👈 This does the blocking
+    user: AuthPrincipal = Depends(require_active_subscription)  # 👈 This does the blocking
 ):
-    dinner = await Dinner.get(payload.dinner_id)
+    dinner = await Dinner.find_one(Dinner.id == payload.dinner_id, projection_model=DinnerSummary)
     if not dinner:
         raise HTTPException(status_code=404, detail="Dinner not found")
 
-    if any(u.user_id == user.id for u in dinner.opted_in_users):
+    # Single insert; the unique (dinner_id, user_id) index rejects duplicates
+    try:
+        await DinnerOptIn(
+            dinner_id=dinner.id,
+            user_id=user.id,
+            budget_category=payload.budget_category,
+            dietary_category=payload.dietary_category
+        ).insert()
+    except DuplicateKeyError:
         raise HTTPException(status_code=400, detail="Already opted in")
 
-    dinner.opted_in_users.append(DinnerOptInUser(
-        user_id=user.id,
-        budget_category=payload.budget_category,
-        dietary_category=payload.dietary_category
-    ))
-
-    await dinner.save()
     utc_dt = dinner.date
 
     ist_dt = utc_dt.astimezone(ZoneInfo("Asia/Kolkata"))
 
-    queue_email_notification(
+    # boto3 blocks; keep the SQS send off the event loop
+    await run_blocking(
+        queue_email_notification,
         to_email=user.email,
         template="dinner_opt_in",
         data={
@@ -91,45 +91,43 @@ async def opt_in_to_dinner(
     )
 
 
-@router.get("/my-bookings", response_model=SuccessResponse[List[dict]])
-async def get_user_bookings(user: User = Depends(get_current_user)) -> SuccessResponse:
-    # Step 1: Fetch all dinners where current user is a participant
-    dinners = await DinnerGroup.find(DinnerGroup.participant_ids == user.id).sort("date").to_list()
-    
-    # Step 2: Collect unique participant_ids from all dinners
-    all_participant_ids = {
-        ObjectId(pid) for dinner in dinners for pid in dinner.participant_ids if ObjectId.is_valid(pid)
-    }
-    # Step 3: Fetch users for these ObjectIds
-    participants = await User.find(In(User.id, list(all_participant_ids))).to_list()
-    # Step 4: Map user info
-    participants_dict = {
-        str(u.id): u.model_dump(include={
-            "name", "city", "country", "gender", "profession", "image_url", "identity_verified"
-        }) for u in participants
-    }
-    print("participants_dict",participants_dict)
-    # Step 5: Add participant_details to each dinner group
-    enriched_dinners = []
-    for dinner in dinners:
-        enriched_dinners.append({
-            **dinner.model_dump(),
-            "participant_details": [
-                participants_dict.get(str(pid)) for pid in dinner.participant_ids if str(pid) in participants_dict
-            ]
-        })
+@router.get("/my-bookings", response_model=SuccessResponse[List[BookingResponse]])
+async def get_user_bookings(
+    limit: int = Query(50, ge=1, le=200),
+    user: AuthPrincipal = Depends(get_current_user),
+) -> SuccessResponse:
+    # One round trip: groups -> dinner -> venue -> participants, newest first.
+    # Groups only change when matching runs, so a secondary is fresh enough
+    bookings = await aggregate_on_secondary(
+        DinnerGroup,
+        user_bookings_pipeline(user.id, limit),
+        projection_model=BookingResponse,
+    )
 
-    return SuccessResponse(message="Bookings Fetched successfully", data=enriched_dinners)
+    return ModelResponse(SuccessResponse[List[BookingResponse]](
+        message="Bookings Fetched successfully", data=bookings
+    ))
 
 @router.get("/dinners/user-view", response_model=SuccessResponse[List[UserDinnerStatus]])
-async def get_user_dinner_status(user: User = Depends(get_current_user)):
-    # Find all dinners the user opted into
+async def get_user_dinner_status(user: AuthPrincipal = Depends(get_current_user)):
+    # Find all dinners the user opted into, without dragging their opt-in lists along
+    opt_ins = await DinnerOptIn.find(DinnerOptIn.user_id == user.id).to_list()
     dinners = await Dinner.find(
-        {"opted_in_users.user_id": user.id}
+        In(Dinner.id, [opt_in.dinner_id for opt_in in opt_ins]),
+        projection_model=DinnerSummary,
     ).to_list()
-    print("dinners",dinners)
-    response_data = []
 
+    # One query for the user's groups across every matched dinner
+    matched_ids = [dinner.id for dinner in dinners if dinner.matched]
+    groups_by_dinner = {}
+    if matched_ids:
+        groups = await DinnerGroup.find(
+            In(DinnerGroup.dinner_id, matched_ids),
+            DinnerGroup.participant_ids == user.id,
+        ).to_list()
+        groups_by_dinner = {group.dinner_id: group for group in groups}
+
+    response_data = []
     for dinner in dinners:
         entry = {
             "dinner_id": dinner.id,
@@ -140,22 +138,18 @@ async def get_user_dinner_status(user: User = Depends(get_current_user)):
             "group": None
         }
 
-        if dinner.matched:
-            group = await DinnerGroup.find_one({
-                "dinner_id": dinner.id,
-                "participant_ids": user.id
-            })
-            if group:
-                entry["group"] = {
-                    "group_id": str(group.id),
-                    "venue_id": str(group.venue_id) if group.venue_id else None,
-                    "participant_ids": group.participant_ids,
-                    "match_score": group.match_score,
-                }
+        group = groups_by_dinner.get(dinner.id)
+        if group:
+            entry["group"] = {
+                "group_id": str(group.id),
+                "venue_id": str(group.venue_id) if group.venue_id else None,
+                "participant_ids": group.participant_ids,
+                "match_score": group.match_score,
+            }
 
         response_data.append(entry)
 
-    return SuccessResponse(
+    return ModelResponse(SuccessResponse[List[UserDinnerStatus]](
         message="Fetched user dinner status",
         data=response_data
-    )
+    ))
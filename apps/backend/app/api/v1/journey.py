@@ -1,11 +1,125 @@
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Tuple
+from beanie import PydanticObjectId
 from fastapi import APIRouter, Depends, HTTPException
-from app.schemas.journey import SaveJourneyRequest, SubmitJourneyResponse
-from app.services.matchmaking.v1 import compute_personality_scores
+from app.schemas.journey import (
+    SaveJourneyBatchRequest,
+    SaveJourneyBatchResponse,
+    SaveJourneyRequest,
+    SubmitJourneyResponse,
+)
+from app.services.matchmaking.v1 import (
+    QUESTION_TRAIT_MAP,
+    compute_personality_scores,
+    compute_personality_scores_batch,
+)
 from app.schemas.response import SuccessResponse
 from app.dependencies.auth import get_current_user  # middleware-based email extraction
-from app.models.user import User, PersonalityAnswer
+from app.models.user import User, AuthPrincipal, PersonalityAnswer, JourneyAnswers
 
 router = APIRouter(prefix="/journey", tags=["Journey"])
+
+PERSONALITY_QUESTION_COUNT = len(QUESTION_TRAIT_MAP)
+SCORE_REFRESH_ATTEMPTS = 3
+PROFILE_FIELDS = {"gender", "relationship_status", "profession", "country", "name", "mobile", "current_country", "current_city"}
+
+
+def _question_index(key: str) -> Optional[int]:
+    if key.startswith("q") and key[1:].isdigit():
+        index = int(key[1:])
+        if 0 <= index < PERSONALITY_QUESTION_COUNT:
+            return index
+        raise HTTPException(status_code=400, detail="Invalid question index")
+    return None
+
+
+def _profile_field(key: str, val: str) -> Tuple[str, Any]:
+    if key in PROFILE_FIELDS:
+        return key, val
+    if key == "children":
+        return key, bool(val)
+    if key == "dob":
+        try:
+            # Stored as a BSON date at midnight, the way Beanie encodes User.dob
+            return key, datetime.combine(date.fromisoformat(val), time.min)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="dob must be YYYY-MM-DD")
+    raise HTTPException(status_code=400, detail="Unknown question_key")
+
+
+def _padded_answers(answers: Optional[List[Optional[PersonalityAnswer]]]) -> List[PersonalityAnswer]:
+    answers = list(answers or [])
+    padded = [
+        answers[i] if i < len(answers) and answers[i] is not None
+        else PersonalityAnswer(trait=QUESTION_TRAIT_MAP[i], question="", answer="")
+        for i in range(PERSONALITY_QUESTION_COUNT)
+    ]
+    return padded
+
+
+async def _set_personality_answers(
+    user_id: PydanticObjectId,
+    answers: Dict[int, PersonalityAnswer],
+    fields: Optional[Dict[str, Any]] = None,
+):
+    """
+    $set the given elements of personality_answers (and any profile fields)
+    in one update. Users created before the array was defaulted may hold a
+    shorter (or no) list, in which case it is initialised once and the
+    elements set again.
+    """
+    fields = fields or {}
+    last = f"personality_answers.{PERSONALITY_QUESTION_COUNT - 1}"
+    update = {"$set": {
+        **{f"personality_answers.{index}": answer.model_dump() for index, answer in answers.items()},
+        **fields,
+    }}
+    result = await User.find_one({"_id": user_id, last: {"$exists": True}}).update(update)
+    if result.matched_count:
+        return
+
+    current = await User.find_one(User.id == user_id, projection_model=JourneyAnswers)
+    if not current:
+        raise HTTPException(status_code=404, detail="User not found")
+    padded = _padded_answers(current.personality_answers)
+    for index, answer in answers.items():
+        padded[index] = answer
+    result = await User.find_one({"_id": user_id, last: {"$exists": False}}).update(
+        {"$set": {"personality_answers": [a.model_dump() for a in padded], **fields}}
+    )
+    if not result.matched_count:
+        # Lost a race with a concurrent initialisation; the array is full now
+        await User.find_one({"_id": user_id, last: {"$exists": True}}).update(update)
+
+
+async def _refresh_personality_scores(user_id: PydanticObjectId) -> Optional[Dict[str, float]]:
+    """
+    Compute the scores of the questions answered so far. They are only stored
+    in personality_scores once every question is answered, since matchmaking
+    treats non-empty scores as a finished journey. The write only applies if
+    personality_answers is still what the scores were computed from;
+    otherwise a concurrent save got in between and the scores are computed
+    again from its answers.
+    """
+    collection = User.get_motor_collection()
+    for _ in range(SCORE_REFRESH_ATTEMPTS):
+        current = await collection.find_one({"_id": user_id}, {"personality_answers": 1})
+        if not current:
+            raise HTTPException(status_code=404, detail="User not found")
+        stored = current.get("personality_answers")
+        answered = [item for item in stored or () if item and item.get("answer")]
+        scores = compute_personality_scores_batch([answered])[0]
+        if scores is None or len(answered) < PERSONALITY_QUESTION_COUNT:
+            return scores
+        result = await collection.update_one(
+            {"_id": user_id, "personality_answers": stored},
+            {"$set": {"personality_scores": scores}},
+        )
+        if result.matched_count:
+            return scores
+    return scores
+
+
 @router.post(
     "/save",
     response_model=SuccessResponse[dict],
@@ -56,70 +170,89 @@ Used to save either a personality or identity answer.
 
 async def save_journey(
     payload: SaveJourneyRequest,
-    user: str = Depends(get_current_user)
+    user: AuthPrincipal = Depends(get_current_user)
 ):
-    user = await User.find_one(User.email == user.email)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    key = payload.question_key.value
+    index = _question_index(key)
+    if index is not None:
+        answer = PersonalityAnswer(
+            trait=QUESTION_TRAIT_MAP[index],
+            question=payload.question or "",
+            answer=payload.answer,
+        )
+        await _set_personality_answers(user.id, {index: answer})
+    else:
+        field, value = _profile_field(key, payload.answer)
+        result = await User.find_one(User.id == user.id).update({"$set": {field: value}})
+        if not result.matched_count:
+            raise HTTPException(status_code=404, detail="User not found")
 
-    key = payload.question_key
-    val = payload.answer
+    return SuccessResponse(message="Answer saved", data={})
 
-    if key == "current_country":
-        user.current_country = val
-    elif key == "current_city":
-        user.current_city = val
-    elif key.startswith("q") and key[1:].isdigit():
-        index = int(key[1:])
-        if 0 <= index < 15:
-            # Map index to trait
-            trait_map = ["O", "C", "E", "A", "N",
-                        "O", "C", "E", "A", "N",
-                        "O", "C", "E", "A", "N"]
-            trait = trait_map[index]
-
-            # Ensure valid list
-            if not user.personality_answers or len(user.personality_answers) < 15:
-                user.personality_answers = [
-                    PersonalityAnswer(trait=trait_map[i], question="", answer="") for i in range(15)
-                ]
-
-            user.personality_answers[index] = PersonalityAnswer(
-                trait=trait,
-                question=payload.question or "",
-                answer=val
+
+@router.post(
+    "/save-batch",
+    response_model=SuccessResponse[SaveJourneyBatchResponse],
+    summary="Save several journey answers at once",
+    description="""
+Accepts any mix of the `question_key` values supported by `/journey/save` and
+applies them in a single update. When the batch contains personality answers,
+the personality scores are recomputed from every question answered so far and
+returned. They are only stored on the profile, and used for matching, once
+all 15 are answered.
+"""
+)
+async def save_journey_batch(
+    payload: SaveJourneyBatchRequest,
+    user: AuthPrincipal = Depends(get_current_user)
+):
+    fields: Dict[str, Any] = {}
+    personality: Dict[int, PersonalityAnswer] = {}
+    for item in payload.answers:
+        key = item.question_key.value
+        index = _question_index(key)
+        if index is not None:
+            personality[index] = PersonalityAnswer(
+                trait=QUESTION_TRAIT_MAP[index],
+                question=item.question or "",
+                answer=item.answer,
             )
         else:
-            raise HTTPException(status_code=400, detail="Invalid question index")
-    elif key in {"gender", "relationship_status", "profession", "country", "name", "mobile"}:
-        setattr(user, key, val)
-    elif key == "children":
-        user.children = bool(val)
-    elif key == "dob":
-        user.dob = val
-    else:
-        raise HTTPException(status_code=400, detail="Unknown question_key")
+            field, value = _profile_field(key, item.answer)
+            fields[field] = value
 
-    await user.save()
-    return SuccessResponse(message="Answer saved", data={})
+    scores = None
+    if personality:
+        await _set_personality_answers(user.id, personality, fields)
+        scores = await _refresh_personality_scores(user.id)
+    elif fields:
+        result = await User.find_one(User.id == user.id).update({"$set": fields})
+        if not result.matched_count:
+            raise HTTPException(status_code=404, detail="User not found")
+
+    return SuccessResponse(
+        message="Answers saved",
+        data=SaveJourneyBatchResponse(saved=len(payload.answers), scores=scores),
+    )
 
 
 @router.post("/submit",summary="Submit the journey",
     description="Finalizes the journey and stores the personality scores", response_model=SuccessResponse[SubmitJourneyResponse])
-async def submit_journey(user: User = Depends(get_current_user)):
-    user = await User.find_one(User.email == user.email)
-    if not user:
+async def submit_journey(user: AuthPrincipal = Depends(get_current_user)):
+    current = await User.find_one(User.id == user.id, projection_model=JourneyAnswers)
+    if not current:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not user.personality_answers or any(a is None or not a.trait for a in user.personality_answers):
+    answers = current.personality_answers
+    if not answers or any(a is None or not a.trait for a in answers):
         raise HTTPException(status_code=400, detail="Not all personality questions are answered")
 
 
-    scores = compute_personality_scores(user.personality_answers)
-    user.personality_scores = scores
-    await user.save()
+    scores = compute_personality_scores(answers)
+    await User.find_one(User.id == user.id).update({"$set": {"personality_scores": scores}})
 
     return SuccessResponse(
         message="Journey submitted successfully",
         data=SubmitJourneyResponse(message="Personality assessed", scores=scores)
-    )
\ No newline at end of file
+    )
+
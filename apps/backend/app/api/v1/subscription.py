@@ -1,30 +1,34 @@
 
 # app/api/v1/subscription.py
-from fastapi import APIRouter, Depends, Request, HTTPException
-from stripe import stripe, error as stripe_error
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, HTTPException
 from app.models.subscription import Subscription
-from app.models.user import User
+from app.models.stripe_event import StripeEvent
+from app.models.user import User, AuthPrincipal
 from app.dependencies.auth import get_current_user
 from app.core.config import settings
+from app.core.clients import clients
 from datetime import datetime, timezone
 from pydantic import BaseModel
-from app.core.notifications.producer import queue_email_notification
-from beanie import PydanticObjectId
+from app.core.executors import run_blocking
+from app.services.stripe_events import process_stripe_event
+from pymongo.errors import DuplicateKeyError
+from beanie.operators import Set
+import orjson
 router = APIRouter(prefix="/subscription", tags=["Subscription"])
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
 class CheckoutSessionRequest(BaseModel):
     price_id: str  # from frontend
 
 
 @router.post("/create-checkout-session", dependencies=[Depends(get_current_user)])
-def create_checkout_session(
+async def create_checkout_session(
     data: CheckoutSessionRequest,
-    user: User = Depends(get_current_user)
+    user: AuthPrincipal = Depends(get_current_user)
 ):
     try:
-        checkout_session = stripe.checkout.Session.create(
-            
+        stripe = await clients.get_stripe()
+        checkout_session = await run_blocking(
+            stripe.checkout.Session.create,
             payment_method_types=["card"],
             billing_address_collection="required",  # ✅ This collects address on the checkout page
             mode="subscription",
@@ -45,118 +49,58 @@ def create_checkout_session(
         raise HTTPException(status_code=400, detail=str(e))
     
 @router.post("/cancel", dependencies=[Depends(get_current_user)])
-async def cancel_subscription(user: User = Depends(get_current_user)):
+async def cancel_subscription(user: AuthPrincipal = Depends(get_current_user)):
     subscription = await Subscription.find_one(Subscription.user_email == user.email, Subscription.status == "active")
     if not subscription:
         raise HTTPException(status_code=404, detail="No active subscription found")
 
-    stripe.Subscription.delete(subscription.stripe_subscription_id)
-    subscription.status = "cancelled"
-    subscription.end_date = datetime.now(timezone.utc)
-    await subscription.save()
-
-    user.subscription_status = "cancelled"
-    user.subscription_end_date = subscription.end_date
-    await user.save()
+    stripe = await clients.get_stripe()
+    await run_blocking(stripe.Subscription.delete, subscription.stripe_subscription_id)
+    end_date = datetime.now(timezone.utc)
+    await subscription.set({Subscription.status: "cancelled", Subscription.end_date: end_date})
+    await User.find_one(User.id == user.id).update(Set({
+        User.subscription_status: "cancelled",
+        User.subscription_end_date: end_date,
+    }))
     
     return {"message": "Subscription cancelled"}
 
 
 @router.post("/webhook")
-async def stripe_webhook(request: Request):
+async def stripe_webhook(request: Request, background_tasks: BackgroundTasks):
+    """
+    Verify and record the event, then acknowledge it. The event is applied
+    after the response is sent; Stripe retries of an event we already hold
+    are acknowledged without being applied again.
+    """
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
 
+    stripe = await clients.get_stripe()
     try:
         event = stripe.Webhook.construct_event(
             payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
         )
-    except stripe.error.SignatureVerificationError:
+    except (ValueError, stripe.error.SignatureVerificationError):
         raise HTTPException(status_code=400, detail="Invalid signature")
 
-    if event['type'] == 'checkout.session.completed':
-        session = event['data']['object']
-        customer_email = session['customer_email']
-        subscription_id = session['subscription']
-        subscription = stripe.Subscription.retrieve(subscription_id)
-        user_id = session["metadata"]["user_id"]
-        customer_id = session["customer"]
-
-        user = await User.get(PydanticObjectId(user_id))
-        if user:
-            user.stripe_customer_id = customer_id
-            user.subscription_status = "active"
-            user.subscription_end_date = datetime.fromtimestamp(subscription['current_period_end'], tz=timezone.utc)
-            await user.save()
-
-        new_sub = Subscription(
-            user_email=customer_email,
-            stripe_customer_id=session['customer'],
-            stripe_subscription_id=subscription_id,
-            status="active",
-            start_date=datetime.fromtimestamp(subscription['start_date'], tz=timezone.utc),
-            end_date=datetime.fromtimestamp(subscription['current_period_end'], tz=timezone.utc)
-        )
-        await new_sub.insert()
-
-        queue_email_notification(
-            to_email=customer_email,
-            template="subscription",
-            data={
-                "status": "active"
-            }
-        )
-
-
-    elif event['type'] == 'invoice.payment_failed':
-            sub_id = event['data']['object']['subscription']
-            subscription = await Subscription.find_one(Subscription.stripe_subscription_id == sub_id)
-            if subscription:
-                subscription.status = "payment_failed"
-                await subscription.save()
-
-                user = await User.find_one(User.email == subscription.user_email)
-                if user:
-                    user.subscription_status = "payment_failed"
-                    await user.save()
-
-                    queue_email_notification(
-                        to_email=subscription.user_email,
-                        template="subscription",
-                        data={
-                            "status": "failed"
-                        }
-                    )
-
-
-    elif event['type'] == 'customer.subscription.deleted':
-        sub_id = event['data']['object']['id']
-        subscription = await Subscription.find_one(Subscription.stripe_subscription_id == sub_id)
-        if subscription:
-            subscription.status = "cancelled"
-            subscription.end_date = datetime.now(timezone.utc)
-            await subscription.save()
-
-            user = await User.find_one(User.email == subscription.user_email)
-            if user:
-                user.subscription_status = "cancelled"
-                user.subscription_end_date = subscription.end_date
-                await user.save()
-
-            queue_email_notification(
-                to_email=subscription.user_email,
-                template="subscription",
-                data={
-                    "status": "cancelled"
-                }
-            )
-
+    try:
+        await StripeEvent(
+            event_id=event["id"],
+            type=event["type"],
+            payload=orjson.loads(payload),
+        ).insert()
+    except DuplicateKeyError:
+        return {"status": "duplicate"}
+
+    background_tasks.add_task(process_stripe_event, event["id"])
     return {"status": "success"}
 
 @router.get("/session-info")
-async def get_session_info(session_id: str, user: User = Depends(get_current_user)):
+async def get_session_info(session_id: str, user: AuthPrincipal = Depends(get_current_user)):
     try:
-        session = stripe.checkout.Session.retrieve(session_id, expand=["subscription"])
+        stripe = await clients.get_stripe()
+        session = await run_blocking(stripe.checkout.Session.retrieve, session_id, expand=["subscription"])
         subscription = session.get("subscription")
 
         return {
@@ -2,14 +2,14 @@ from fastapi import APIRouter
 from fastapi import Depends
 from app.schemas.response import SuccessResponse
 from app.schemas.user import MeResponse
-from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.dependencies.auth import get_current_profile
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/me", response_model=SuccessResponse[MeResponse])
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(profile: MeResponse = Depends(get_current_profile)):
+    # Projected straight into the response model, validated once
     return SuccessResponse(
         message="User profile fetched",
-        data=MeResponse.model_validate(current_user.model_dump())
+        data=profile
     )
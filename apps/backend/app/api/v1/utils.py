@@ -1,41 +1,60 @@
-from fastapi import APIRouter, HTTPException, Body
-import httpx
+from fastapi import APIRouter, HTTPException, Body, Query, Response
+from functools import lru_cache
+from typing import Optional
+import orjson
 from app.schemas.response import SuccessResponse
+from app.services.geo import geo_index, get_geo_index
 from pydantic import BaseModel
-from async_lru import alru_cache
 
 
 class CountryRequest(BaseModel):
     country: str
 
 router = APIRouter()
-BASE_URL = "https://countriesnow.space/api/v0.1/countries"
 
-@alru_cache(maxsize=1)
-async def fetch_all_countries():
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{BASE_URL}")
-        return resp.json()["data"]
+
+def _json(message: str, data: dict) -> bytes:
+    return orjson.dumps(SuccessResponse(message=message, data=data).model_dump())
+
+
+# The dataset is immutable for the life of the process, so bodies can be cached
+# forever. Endpoints await geo_index() first, so these never load it themselves
+@lru_cache(maxsize=1)
+def _countries_body() -> bytes:
+    return _json("Countries fetched successfully", {"countries": list(get_geo_index().countries)})
+
+
+@lru_cache(maxsize=512)
+def _cities_body(country: str) -> Optional[bytes]:
+    cities = get_geo_index().cities(country)
+    if cities is None:
+        return None
+    return _json("Cities fetched successfully", {"cities": list(cities)})
+
 
 @router.get("/geo/countries")
 async def list_countries():
-    countries = await fetch_all_countries()
-    return SuccessResponse(
-        message="Countries fetched successfully",
-        data={"countries": [c["country"] for c in countries]}
-    )
+    await geo_index()
+    return Response(content=_countries_body(), media_type="application/json")
+
 @router.post("/geo/country")
 async def list_cities(payload: CountryRequest = Body(...)):
-    formatted_country = payload.country.strip().title()
-    url = f"https://countriesnow.space/api/v0.1/countries/cities/q?country={formatted_country}"
-
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-            return SuccessResponse(message="Cities fetched successfully", data={"cities": data.get("data", [])})
-        except httpx.HTTPStatusError:
-            raise HTTPException(status_code=resp.status_code, detail=f"Upstream error: {resp.text}")
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
\ No newline at end of file
+    index = await geo_index()
+    country = index.resolve_country(payload.country)
+    if not country:
+        raise HTTPException(status_code=404, detail=f"Unknown country: {payload.country}")
+    return Response(content=_cities_body(country), media_type="application/json")
+
+@router.get("/geo/autocomplete")
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100),
+    country: Optional[str] = None,
+    kind: str = Query("city", pattern="^(city|country)$"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    index = await geo_index()
+    if kind == "country":
+        results = [{"country": name} for name in index.autocomplete_countries(q, limit)]
+    else:
+        results = index.autocomplete_cities(q, country, limit)
+    return SuccessResponse(message="Suggestions fetched successfully", data={"results": results})
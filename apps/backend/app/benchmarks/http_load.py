@@ -0,0 +1,392 @@
+"""
+HTTP load benchmark for the API, run in-process through httpx's ASGI transport.
+
+Seeds a database with users, dinners with thousands of opt-ins, matched
+groups, venues and sessions, then drives the auth, dinner, journey and admin
+routes at a fixed concurrency and reports p50/p95/p99 latency and throughput
+per route. p95 is checked against a baseline saved per backend by the first
+run (or --update-baseline). Absolute timings only compare on the same
+machine, so baselines are not committed; record one on the machine that runs
+the check, before the change under test.
+
+    python -m app.benchmarks.http_load --in-memory [--update-baseline]
+    python -m app.benchmarks.http_load --mongo-uri mongodb://localhost:27017 [--database bichance_bench]
+
+--in-memory uses mongomock-motor (pip install mongomock-motor), which cannot
+run the $lookup pipelines behind /dinner/my-bookings; that route is only
+exercised against a real mongod. The target database is dropped first.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from beanie import PydanticObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from passlib.context import CryptContext
+
+from app.core.clients import clients
+from app.core.config import settings
+from app.core.executors import shutdown_pools
+from app.db.init import init_db
+from app.main import app
+from app.models.admin import AdminUser
+from app.models.dinner import Dinner, DinnerGroup
+from app.models.dinner_opt_in import DinnerOptIn
+from app.models.otp import OTP
+from app.models.session import Session
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.models.venue import Venue
+from app.services.matchmaking.v1 import QUESTION_TRAIT_MAP
+from app.utils.jwt import create_tokens
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+CITIES = [("Gurugram", "India"), ("Bengaluru", "India"), ("Mumbai", "India"), ("Dubai", "United Arab Emirates")]
+BUDGETS = ["low", "medium", "high"]
+DIETS = ["veg", "non-veg", "vegan"]
+ADMIN_EMAIL = "bench-admin@example.com"
+ADMIN_PASSWORD = "bench-password"
+INSERT_BATCH = 5000
+# Latencies are only comparable between runs with the same data and load
+BASELINE_PARAMS = ("users", "dinners", "opt_ins", "requests", "concurrency", "seed")
+
+
+class _NullSQS:
+    """Accepts notification sends so the benchmark never reaches AWS."""
+
+    def send_message(self, **kwargs):
+        return {"MessageId": "bench"}
+
+    def send_message_batch(self, Entries, **kwargs):
+        return {"Successful": [{"Id": entry["Id"]} for entry in Entries], "Failed": []}
+
+    def close(self):
+        pass
+
+
+@dataclass
+class Fixture:
+    users: List[Dict[str, Any]]  # id, email, access_token
+    optin_dinner_id: str
+    admin_token: str
+
+
+async def _insert(model, docs: List[Dict[str, Any]]):
+    collection = model.get_motor_collection()
+    for start in range(0, len(docs), INSERT_BATCH):
+        await collection.insert_many(docs[start:start + INSERT_BATCH], ordered=False)
+
+
+def _personality_answers(rng: random.Random) -> List[Dict[str, str]]:
+    return [
+        {"trait": QUESTION_TRAIT_MAP[i], "question": "", "answer": rng.choice(["yes", "no"])}
+        for i in range(len(QUESTION_TRAIT_MAP))
+    ]
+
+
+async def seed(rng: random.Random, users: int, dinners: int, opt_ins_per_dinner: int) -> Fixture:
+    now = datetime.now(timezone.utc)
+
+    user_docs, session_docs, subscription_docs, fixture_users = [], [], [], []
+    for i in range(users):
+        user_id = PydanticObjectId()
+        email = f"bench-user-{i}@example.com"
+        city, country = rng.choice(CITIES)
+        user_docs.append({
+            "_id": user_id, "email": email, "name": f"Bench User {i}",
+            "city": city, "country": country, "current_city": city, "current_country": country,
+            "gender": rng.choice(["Male", "Female"]), "profession": "Engineer",
+            "personality_answers": _personality_answers(rng),
+            "personality_scores": {trait: rng.random() for trait in "OCEAN"},
+            "identity_verified": True, "subscription_status": "active",
+            "subscription_end_date": now + timedelta(days=30),
+        })
+        access_token, refresh_token = create_tokens(email)
+        session_docs.append({
+            "session_id": f"bench-{i}", "email": email,
+            "access_token": access_token, "refresh_token": refresh_token,
+            "created_at": now, "expires_at": now + timedelta(days=7), "is_active": True,
+        })
+        subscription_docs.append({
+            "user_email": email, "stripe_customer_id": f"cus_bench_{i}",
+            "stripe_subscription_id": f"sub_bench_{i}", "status": "active",
+            "start_date": now - timedelta(days=1), "end_date": now + timedelta(days=30),
+        })
+        fixture_users.append({"id": str(user_id), "email": email, "access_token": access_token})
+
+    venue_docs = [
+        {
+            "_id": PydanticObjectId(), "name": f"Venue {i}", "address": f"{i} Main Street",
+            "city": city, "country": country, "is_active": True,
+            "max_group_size": 6, "capacity": 20, "budget_category": rng.choice(BUDGETS),
+        }
+        for i, (city, country) in enumerate(CITIES * 10)
+    ]
+
+    dinner_docs, opt_in_docs, group_docs = [], [], []
+    for d in range(dinners):
+        city, country = CITIES[d % len(CITIES)]
+        # Half in the past (matched, with groups), half upcoming
+        past = d % 2 == 0
+        dinner_id = PydanticObjectId()
+        dinner_docs.append({
+            "_id": dinner_id, "city": city, "country": country, "opted_in_users": [],
+            "date": now + timedelta(days=(-7 if past else 7) * (d // 2 + 1)), "matched": past,
+        })
+        participants = rng.sample(user_docs, min(opt_ins_per_dinner, len(user_docs)))
+        for user in participants:
+            opt_in_docs.append({
+                "dinner_id": dinner_id, "user_id": user["_id"], "created_at": now,
+                "budget_category": rng.choice(BUDGETS), "dietary_category": rng.choice(DIETS),
+            })
+        if past:
+            venues = [v for v in venue_docs if v["city"] == city]
+            for start in range(0, len(participants) - 5, 6):
+                group_docs.append({
+                    "dinner_id": dinner_id, "participant_ids": [u["_id"] for u in participants[start:start + 6]],
+                    "venue_id": rng.choice(venues)["_id"], "budget_category": rng.choice(BUDGETS),
+                    "dietary_category": rng.choice(DIETS), "match_score": rng.random(),
+                })
+
+    # A fresh upcoming dinner nobody has opted into yet, for the opt-in route
+    optin_dinner_id = PydanticObjectId()
+    dinner_docs.append({
+        "_id": optin_dinner_id, "city": CITIES[0][0], "country": CITIES[0][1],
+        "date": now + timedelta(days=10), "matched": False, "opted_in_users": [],
+    })
+
+    admin_hash = CryptContext(schemes=["bcrypt"]).hash(ADMIN_PASSWORD)
+    admin_access, admin_refresh = create_tokens(ADMIN_EMAIL)
+
+    await _insert(User, user_docs)
+    await _insert(Session, session_docs + [{
+        "session_id": "bench-admin", "email": ADMIN_EMAIL, "access_token": admin_access,
+        "refresh_token": admin_refresh, "created_at": now, "expires_at": now + timedelta(days=7), "is_active": True,
+    }])
+    await _insert(Subscription, subscription_docs)
+    await _insert(Venue, venue_docs)
+    await _insert(Dinner, dinner_docs)
+    await _insert(DinnerOptIn, opt_in_docs)
+    if group_docs:
+        await _insert(DinnerGroup, group_docs)
+    await _insert(AdminUser, [{"email": ADMIN_EMAIL, "name": "Bench Admin", "password_hash": admin_hash}])
+
+    print(f"🌱 Seeded {len(user_docs)} users, {len(dinner_docs)} dinners, {len(opt_in_docs)} opt-ins, "
+          f"{len(group_docs)} groups, {len(venue_docs)} venues")
+    return Fixture(users=fixture_users, optin_dinner_id=str(optin_dinner_id), admin_token=admin_access)
+
+
+RequestBuilder = Callable[[int], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    build: RequestBuilder
+    needs_server: bool = False  # uses aggregation features the in-memory stand-in lacks
+    expected: Tuple[int, ...] = (200,)
+
+
+def scenarios(fixture: Fixture, rng: random.Random) -> List[Scenario]:
+    users = fixture.users
+
+    def auth(user: Dict[str, Any]) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {user['access_token']}"}
+
+    async def random_user(i: int) -> Dict[str, Any]:
+        return {"headers": auth(rng.choice(users))}
+
+    async def send_otp(i: int) -> Dict[str, Any]:
+        return {"json": {"email": f"bench-login-{i}@example.com"}}
+
+    async def verify_otp(i: int) -> Dict[str, Any]:
+        email = f"bench-login-{i}@example.com"
+        otp = await OTP.find_one(OTP.email == email)
+        return {"json": {"email": email, "otp": otp.otp if otp else "000000"}}
+
+    async def opt_in(i: int) -> Dict[str, Any]:
+        # One request per user, so every opt-in is a first-time insert
+        return {"headers": auth(users[i % len(users)]), "json": {
+            "dinner_id": fixture.optin_dinner_id,
+            "budget_category": rng.choice(BUDGETS), "dietary_category": rng.choice(DIETS),
+        }}
+
+    async def journey_save(i: int) -> Dict[str, Any]:
+        return {"headers": auth(rng.choice(users)), "json": {
+            "question_key": f"q{rng.randrange(len(QUESTION_TRAIT_MAP))}", "answer": rng.choice(["yes", "no"]),
+        }}
+
+    async def admin_login(i: int) -> Dict[str, Any]:
+        return {"json": {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}}
+
+    async def admin(i: int) -> Dict[str, Any]:
+        return {"headers": {"Authorization": f"Bearer {fixture.admin_token}"}, "params": {"limit": 50}}
+
+    return [
+        Scenario("auth_send_otp", "POST", "/api/v1/auth/send-otp", send_otp),
+        Scenario("auth_verify_otp", "POST", "/api/v1/auth/verify-otp", verify_otp),
+        Scenario("users_me", "GET", "/api/v1/users/me", random_user),
+        Scenario("dinner_upcoming", "GET", "/api/v1/dinner/upcoming", random_user),
+        Scenario("dinner_opt_in", "POST", "/api/v1/dinner/opt-in", opt_in),
+        Scenario("dinner_user_view", "GET", "/api/v1/dinner/dinners/user-view", random_user),
+        Scenario("dinner_my_bookings", "GET", "/api/v1/dinner/my-bookings", random_user, needs_server=True),
+        Scenario("journey_save", "POST", "/api/v1/journey/save", journey_save),
+        Scenario("admin_login", "POST", "/api/v1/admin/login", admin_login),
+        Scenario("admin_dinners", "GET", "/api/v1/admin/dinner/all", admin),
+        Scenario("admin_venues", "GET", "/api/v1/admin/venues", admin),
+    ]
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+async def drive(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    first_error: Optional[str] = None
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors, first_error
+        while (i := next(counter)) < requests:
+            kwargs = await scenario.build(i)
+            started = time.perf_counter()
+            response = await client.request(scenario.method, scenario.path, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code not in scenario.expected:
+                errors += 1
+                first_error = first_error or f"{response.status_code} {response.text[:200]}"
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "rps": round(requests / elapsed, 1),
+    }
+    if first_error:
+        result["first_error"] = first_error
+    return result
+
+
+async def run(args) -> Dict[str, Dict[str, Any]]:
+    if args.in_memory:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("--in-memory needs mongomock-motor: pip install mongomock-motor")
+        mongo = AsyncMongoMockClient()
+        # mongomock-motor's with_options() hands back a synchronous collection
+        settings.MONGO_SECONDARY_READ_PREFERENCE = "primary"
+    else:
+        if args.database == settings.DATABASE_NAME:
+            sys.exit(f"Refusing to drop the application database {args.database!r}; pass another --database")
+        mongo = AsyncIOMotorClient(args.mongo_uri)
+        await mongo.drop_database(args.database)
+
+    await init_db(client=mongo, database_name=args.database, sync_indexes=True)
+    clients._sqs = _NullSQS()
+
+    rng = random.Random(args.seed)
+    fixture = await seed(rng, args.users, args.dinners, args.opt_ins)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for scenario in scenarios(fixture, rng):
+            if args.only and scenario.name not in args.only:
+                continue
+            if scenario.needs_server and args.in_memory:
+                print(f"{scenario.name:20} skipped (needs a real mongod)")
+                continue
+            # Routes that create state get one request per fixture user at most
+            requests = min(args.requests, len(fixture.users)) if scenario.name == "dinner_opt_in" else args.requests
+            row = await drive(client, scenario, requests, args.concurrency)
+            results[scenario.name] = row
+            print(f"{scenario.name:20} p50 {row['p50_ms']:>8.2f} ms  p95 {row['p95_ms']:>8.2f} ms  "
+                  f"p99 {row['p99_ms']:>8.2f} ms  {row['rps']:>8.1f} req/s  errors {row['errors']}"
+                  + (f"  ({row['first_error']})" if row.get("first_error") else ""))
+
+    await clients.close()
+    shutdown_pools()
+    if not args.in_memory:
+        await mongo.drop_database(args.database)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP load benchmark")
+    backend = parser.add_mutually_exclusive_group(required=True)
+    backend.add_argument("--in-memory", action="store_true", help="Use mongomock-motor instead of a server")
+    backend.add_argument("--mongo-uri", help="mongod to seed and benchmark against")
+    parser.add_argument("--database", default="bichance_bench", help="Dropped before and after the run")
+    parser.add_argument("--users", type=int, default=3000)
+    parser.add_argument("--dinners", type=int, default=8)
+    parser.add_argument("--opt-ins", type=int, default=2000, help="Opt-ins per seeded dinner")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", nargs="*", help="Run only these scenarios")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed p95 increase versus baseline (0.5 = 50%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    baseline_file = os.path.join(BASELINE_DIR, f"http_load.{'in_memory' if args.in_memory else 'mongod'}.json")
+    failed = [name for name, row in results.items() if row["errors"]]
+    if failed:
+        print("❌ Requests failed in: " + ", ".join(failed))
+        sys.exit(1)
+
+    params = {key: getattr(args, key) for key in BASELINE_PARAMS}
+    if args.update_baseline or not os.path.exists(baseline_file):
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_file, "w") as f:
+            json.dump({"params": params, "routes": results}, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {baseline_file}")
+        return
+
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+    if baseline.get("params") != params:
+        print(f"❌ Baseline was recorded with {baseline.get('params')}; rerun with those "
+              f"settings or pass --update-baseline")
+        sys.exit(1)
+
+    regressions = []
+    for name, row in results.items():
+        expected = baseline["routes"].get(name, {}).get("p95_ms")
+        if expected and row["p95_ms"] > expected * (1 + args.tolerance):
+            regressions.append(f"{name}: p95 {row['p95_ms']} ms vs baseline {expected} ms")
+
+    if regressions:
+        print("❌ Latency regressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("✅ No latency regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Serialization regression benchmark for the largest list payloads.
+
+Compares FastAPI's default path (response_model validation + jsonable_encoder
++ json.dumps) with ModelResponse for my-bookings, the admin dinner list and
+the admin venue list. The speedup ratio is checked against a saved baseline;
+ratios carry across machines where absolute timings do not.
+
+    python -m app.benchmarks.serialization [--update-baseline] [--tolerance 0.5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+from beanie import PydanticObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.responses import ModelResponse
+from app.models.venue import Venue
+from app.schemas.dinner import BookingParticipant, BookingResponse, BookingVenue, DinnerAdminSummary
+from app.schemas.response import PaginatedResponse, SuccessResponse
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baselines", "serialization.json")
+
+
+def _bookings(count: int = 200, group_size: int = 6) -> SuccessResponse[List[BookingResponse]]:
+    now = datetime.now(timezone.utc)
+    bookings = []
+    for i in range(count):
+        participants = [
+            BookingParticipant(
+                id=str(PydanticObjectId()),
+                name=f"Member {i}-{j}",
+                city="Gurugram",
+                country="India",
+                gender="Female" if j % 2 else "Male",
+                profession="Software Engineer",
+                image_url=f"https://cdn.example.com/u/{i}-{j}.jpg",
+                identity_verified=bool(j % 3),
+            )
+            for j in range(group_size)
+        ]
+        bookings.append(BookingResponse(
+            id=str(PydanticObjectId()),
+            dinner_id=str(PydanticObjectId()),
+            date=now - timedelta(days=7 * i),
+            city="Gurugram",
+            country="India",
+            budget_category="medium",
+            dietary_category="veg",
+            match_score=0.8123,
+            venue_id=str(PydanticObjectId()),
+            venue=BookingVenue(
+                id=str(PydanticObjectId()), name="Cafe", address="MG Road",
+                city="Gurugram", country="India", google_maps_url="https://maps.example.com/x",
+            ),
+            participant_ids=[p.id for p in participants],
+            participant_details=participants,
+        ))
+    return SuccessResponse[List[BookingResponse]](message="Bookings Fetched successfully", data=bookings)
+
+
+def _admin_dinners(count: int = 200) -> PaginatedResponse[DinnerAdminSummary]:
+    now = datetime.now(timezone.utc)
+    return PaginatedResponse[DinnerAdminSummary](
+        message="Dinners fetched successfully",
+        data=[
+            DinnerAdminSummary(
+                id=str(PydanticObjectId()), date=now - timedelta(days=i),
+                city="Gurugram", country="India", matched=bool(i % 2), opt_in_count=1000 + i,
+            )
+            for i in range(count)
+        ],
+        next_cursor="eyJkYXRlIjoiMjAyNi0wMS0wMSIsImlkIjoiNjUwMDAwMDAwMDAwMDAwMDAwMDAwMDAwIn0",
+    )
+
+
+def _admin_venues(count: int = 200) -> PaginatedResponse[Venue]:
+    return PaginatedResponse[Venue](
+        message="Venues fetched",
+        data=[
+            # model_construct: Documents cannot be instantiated before init_beanie
+            Venue.model_construct(
+                id=PydanticObjectId(), name=f"Venue {i}", address=f"{i} Main Street",
+                city="Gurugram", country="India", google_maps_url="https://maps.example.com/v",
+                contact_number="+91 98765 43210", is_active=True,
+            )
+            for i in range(count)
+        ],
+    )
+
+
+PAYLOADS = {
+    "my_bookings": _bookings,
+    "admin_dinners": _admin_dinners,
+    "admin_venues": _admin_venues,
+}
+
+
+def _default_path(model) -> Callable[[], bytes]:
+    # What FastAPI does for a response_model route returning a model
+    adapter = TypeAdapter(type(model))
+
+    def run() -> bytes:
+        validated = adapter.validate_python(model, from_attributes=True)
+        return json.dumps(jsonable_encoder(validated), ensure_ascii=False).encode()
+    return run
+
+
+def _model_response_path(model) -> Callable[[], bytes]:
+    return lambda: ModelResponse(model).body
+
+
+def _time_per_call(fn: Callable[[], bytes], rounds: int, repeat: int = 7) -> float:
+    fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        samples.append((time.perf_counter() - started) / rounds)
+    # Best-of-N: the least disturbed run is the most repeatable figure
+    return min(samples)
+
+
+def run(rounds: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, build in PAYLOADS.items():
+        model = build()
+        default_s = _time_per_call(_default_path(model), rounds)
+        fast_s = _time_per_call(_model_response_path(model), rounds)
+        results[name] = {
+            "bytes": len(ModelResponse(model).body),
+            "default_ms": round(default_s * 1000, 4),
+            "model_response_ms": round(fast_s * 1000, 4),
+            "speedup": round(default_s / fast_s, 2),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialization regression benchmark")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed drop in speedup versus baseline (0.5 = 50%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.rounds)
+    for name, row in results.items():
+        print(f"{name:15} {row['bytes']:>9} B  default {row['default_ms']:>8.3f} ms  "
+              f"model_response {row['model_response_ms']:>8.3f} ms  x{row['speedup']}")
+
+    if args.update_baseline or not os.path.exists(BASELINE_FILE):
+        os.makedirs(os.path.dirname(BASELINE_FILE), exist_ok=True)
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {BASELINE_FILE}")
+        return
+
+    with open(BASELINE_FILE) as f:
+        baseline = json.load(f)
+
+    regressions = []
+    for name, row in results.items():
+        expected = baseline.get(name, {}).get("speedup")
+        if expected and row["speedup"] < expected * (1 - args.tolerance):
+            regressions.append(f"{name}: x{row['speedup']} vs baseline x{expected}")
+
+    if regressions:
+        print("❌ Serialization regressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("✅ No serialization regressions")
+
+
+if __name__ == "__main__":
+    main()
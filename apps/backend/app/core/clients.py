@@ -0,0 +1,134 @@
+# app/core/clients.py
+"""
+Shared outbound clients (HTTP, AWS, Stripe) with pooled keep-alive connections.
+
+Every client is built on first use, and the SDKs behind them (boto3, stripe,
+httpx) are only imported then: together they account for more than a second
+of import time. The API warms them on a worker thread right after startup
+(see warm_up) and closes them on shutdown; other processes (the SQS consumer,
+scripts) simply pay on first use. Code on the event loop gets the Stripe
+client through get_stripe(), so a request that arrives before warm-up has
+finished builds it on the blocking pool instead of stalling the loop.
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+from app.core.config import settings
+from app.core.executors import run_blocking
+from app.core.logger import logger
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+
+class ClientRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._http: Optional["httpx.AsyncClient"] = None
+        self._sqs = None
+        self._stripe = None
+        self._stripe_session: Optional["requests.Session"] = None
+
+    @property
+    def http(self) -> "httpx.AsyncClient":
+        if self._http is None:
+            import httpx
+
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+                timeout=httpx.Timeout(
+                    settings.HTTP_TIMEOUT_SECONDS,
+                    connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+                ),
+            )
+        return self._http
+
+    @property
+    def sqs(self):
+        if self._sqs is None:
+            with self._lock:
+                if self._sqs is None:
+                    import boto3
+                    from botocore.config import Config as BotoConfig
+
+                    self._sqs = boto3.session.Session().client(
+                        "sqs",
+                        region_name=settings.AWS_REGION,
+                        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                        config=BotoConfig(
+                            max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+                            connect_timeout=settings.AWS_CONNECT_TIMEOUT_SECONDS,
+                            read_timeout=settings.AWS_READ_TIMEOUT_SECONDS,
+                            retries={"mode": "standard", "max_attempts": settings.AWS_MAX_ATTEMPTS},
+                            tcp_keepalive=True,
+                        ),
+                    )
+        return self._sqs
+
+    @property
+    def stripe(self):
+        """The stripe module, keyed and pointed at a pooled keep-alive session with bounded timeouts."""
+        if self._stripe is None:
+            with self._lock:
+                if self._stripe is None:
+                    import requests
+                    import stripe
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=settings.STRIPE_POOL_SIZE,
+                    )
+                    session.mount("https://", adapter)
+                    stripe.api_key = settings.STRIPE_SECRET_KEY
+                    stripe.default_http_client = stripe.RequestsClient(
+                        timeout=settings.STRIPE_TIMEOUT_SECONDS,
+                        session=session,
+                    )
+                    stripe.max_network_retries = settings.STRIPE_MAX_NETWORK_RETRIES
+                    self._stripe_session = session
+                    self._stripe = stripe
+        return self._stripe
+
+    async def get_stripe(self):
+        """The stripe property for callers on the event loop; a first build runs on the blocking pool."""
+        if self._stripe is not None:
+            return self._stripe
+        return await run_blocking(lambda: self.stripe)
+
+    def warm_up(self):
+        """Build the SDK-backed clients ahead of the first request. Blocking; run it off the event loop."""
+        started = time.perf_counter()
+        try:
+            self.sqs
+            self.stripe
+        except Exception:
+            # Not fatal: the first request that needs the client tries again
+            logger.exception("Warming up outbound clients failed")
+            return
+        logger.info("🔌 Outbound clients ready in %.2fs", time.perf_counter() - started)
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._sqs is not None:
+            self._sqs.close()
+            self._sqs = None
+        if self._stripe_session is not None:
+            self._stripe_session.close()
+            self._stripe_session = None
+            self._stripe.default_http_client = None
+            self._stripe = None
+
+
+clients = ClientRegistry()
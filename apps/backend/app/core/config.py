@@ -2,6 +2,7 @@
 
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Literal
 
 class Settings(BaseSettings):
     MONGO_URI: str
@@ -21,6 +22,100 @@ class Settings(BaseSettings):
     STRIPE_PRICE_ID:str
     FRONTEND_URL:str
 
+    # Motor connection pool, per process (see app/db/init.py). Checkouts that wait
+    # longer than MONGO_WAIT_QUEUE_TIMEOUT_MS fail fast with a 503 instead of queueing forever
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 5
+    MONGO_MAX_CONNECTING: int = 4
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 2000
+    MONGO_MAX_IDLE_TIME_MS: int = 300000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    # Wire compression, in order of preference; ones whose library is not installed are skipped
+    MONGO_COMPRESSORS: str = "zstd,snappy,zlib"
+    # Used by read-heavy endpoints that tolerate slightly stale data (see app/db/read_preference.py)
+    MONGO_SECONDARY_READ_PREFERENCE: Literal[
+        "primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"
+    ] = "secondaryPreferred"
+    MONGO_SECONDARY_MAX_STALENESS_SECONDS: int = 90
+
+    # Indexes are created by app/launcher.py before it starts its children, or by
+    # python -m app.scripts.sync_indexes; processes only sync them at startup if
+    # this is turned on (the launcher turns it off again for its children)
+    MONGO_SYNC_INDEXES_ON_STARTUP: bool = False
+
+    # Thread pools for CPU-bound and blocking SDK work (see app/core/executors.py)
+    CPU_POOL_WORKERS: int = 2
+    CPU_POOL_MAX_PENDING: int = 32
+    BLOCKING_POOL_WORKERS: int = 16
+    BLOCKING_POOL_MAX_PENDING: int = 128
+
+    # Read-through cache for /dinner/upcoming, keyed by (city, country)
+    UPCOMING_DINNERS_CACHE_TTL_SECONDS: int = 60
+    UPCOMING_DINNERS_CACHE_MAXSIZE: int = 2048
+
+    # Responses at least this large (bytes) are gzip-compressed
+    GZIP_MINIMUM_SIZE: int = 1024
+
+    # Bundled country/city dataset (app/data/geo/countries_cities.v<N>.json.gz)
+    GEO_DATASET_VERSION: str = "1"
+
+    # Shared outbound clients (see app/core/clients.py)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    AWS_MAX_POOL_CONNECTIONS: int = 20
+    AWS_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    AWS_READ_TIMEOUT_SECONDS: float = 25.0  # above the consumer's 10s long poll
+    AWS_MAX_ATTEMPTS: int = 3
+    STRIPE_POOL_SIZE: int = 16
+    STRIPE_TIMEOUT_SECONDS: int = 20
+    STRIPE_MAX_NETWORK_RETRIES: int = 2
+
+    # Level of the "dinnerconnect" logger (see app/core/logger.py)
+    LOG_LEVEL: str = "INFO"
+
+    # Requests slower than this are logged with their Mongo command count
+    SLOW_REQUEST_SECONDS: float = 1.0
+    # Bearer token the Prometheus scraper sends to /metrics; unset disables the endpoint
+    METRICS_TOKEN: str = ""
+
+    # N+1 detector for development and CI: "off", "warn" or "raise" (see app/core/query_detector.py)
+    QUERY_DETECTOR_MODE: Literal["off", "warn", "raise"] = "off"
+    QUERY_DETECTOR_THRESHOLD: int = 5
+
+    # Stripe webhook events are applied in the background (see app/services/stripe_events.py)
+    STRIPE_EVENT_MAX_ATTEMPTS: int = 5
+    STRIPE_EVENT_RETRY_AFTER_SECONDS: int = 120
+    STRIPE_EVENT_CLAIM_TIMEOUT_SECONDS: int = 600
+    STRIPE_EVENT_SWEEP_INTERVAL_SECONDS: int = 60
+
+    # Process layout for app/launcher.py; API_WORKERS=0 starts one per available CPU
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    API_WORKERS: int = 0
+    CONSUMER_WORKERS: int = 1
+    RESTART_BACKOFF_INITIAL_SECONDS: float = 1.0
+    RESTART_BACKOFF_MAX_SECONDS: float = 30.0
+    SHUTDOWN_GRACE_SECONDS: int = 30
+
+    # Matching runs hold a lease per dinner (see app/services/leases.py); nodes
+    # advertise themselves with a lease renewed every heartbeat
+    MATCHING_LEASE_TTL_SECONDS: int = 120
+    MATCHING_NODE_HEARTBEAT_SECONDS: int = 15
+
+    # Matchmaker cron (app/crons/matchmaker.py): how often each node looks for
+    # dinners past the cut-off and how many it matches at once, how long a
+    # dinner skipped for lack of users waits before it is tried again, and how
+    # long MatchingRun records are kept
+    MATCHMAKER_WORKERS: int = 1
+    MATCHMAKER_INTERVAL_SECONDS: int = 300
+    MATCHMAKER_CONCURRENCY: int = 8
+    MATCHMAKER_SKIP_BACKOFF_SECONDS: int = 3600
+    MATCHING_RUN_RETENTION_DAYS: int = 30
+
     class Config:
         env_file = ".env"
 
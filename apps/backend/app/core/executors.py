@@ -0,0 +1,156 @@
+# app/core/executors.py
+"""
+Bounded thread pools for work that must not run on the event loop.
+
+- ``cpu`` pool: CPU-heavy work that releases the GIL (bcrypt hashing, etc.)
+- ``blocking_io`` pool: blocking SDK calls (Stripe, boto3, SMTP)
+
+Each pool caps both the number of worker threads and the number of calls
+allowed to wait for a thread, so a burst of slow calls applies backpressure
+to the callers instead of piling up unbounded work.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.active = 0
+        self.waiting = 0
+        self.wait_seconds_total = 0.0
+        self.run_seconds_total = 0.0
+        self.run_seconds_max = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=f"pool-{self.name}",
+                    )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the running loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_pending)
+        return self._slots
+
+    def _timed_call(self, fn: Callable[..., T], queued_at: float) -> T:
+        started = time.perf_counter()
+        with self._stats_lock:
+            self.wait_seconds_total += started - queued_at
+            self.active += 1
+        try:
+            return fn()
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self.active -= 1
+                self.run_seconds_total += elapsed
+                if elapsed > self.run_seconds_max:
+                    self.run_seconds_max = elapsed
+
+    async def run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """
+        Run ``fn(*args, **kwargs)`` on the pool and await its result.
+        Context variables of the caller are visible inside ``fn``.
+        """
+        slots = self._get_slots()
+        self.waiting += 1
+        queued_at = time.perf_counter()
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.submitted += 1
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, fn, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._get_executor(), self._timed_call, call, queued_at
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            slots.release()
+
+        self.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "active": self.active,
+            "waiting": self.waiting,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "run_seconds_total": round(self.run_seconds_total, 6),
+            "run_seconds_max": round(self.run_seconds_max, 6),
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+        self._slots = None
+
+
+cpu_pool = BoundedExecutor(
+    "cpu",
+    max_workers=settings.CPU_POOL_WORKERS,
+    max_pending=settings.CPU_POOL_MAX_PENDING,
+)
+blocking_pool = BoundedExecutor(
+    "blocking_io",
+    max_workers=settings.BLOCKING_POOL_WORKERS,
+    max_pending=settings.BLOCKING_POOL_MAX_PENDING,
+)
+
+POOLS = {pool.name: pool for pool in (cpu_pool, blocking_pool)}
+
+
+async def run_cpu_bound(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    return await cpu_pool.run(fn, *args, **kwargs)
+
+
+async def run_blocking(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    return await blocking_pool.run(fn, *args, **kwargs)
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: pool.stats() for name, pool in POOLS.items()}
+
+
+def shutdown_pools(wait: bool = True):
+    for pool in POOLS.values():
+        pool.shutdown(wait=wait)
@@ -1,26 +1,112 @@
+# app/core/logger.py
+"""
+Non-blocking, structured logging.
+
+Callers only enqueue records: the QueueHandler on the "dinnerconnect" logger
+interpolates the message and stamps the request id, and a QueueListener
+thread does the JSON encoding and the file/console writes. Log calls from
+request handlers therefore never touch the disk on the event loop.
+"""
+
+import atexit
+import copy
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+import queue
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+import orjson
+
+from app.core.config import settings
 
 LOG_DIR = "logs"
 os.makedirs(LOG_DIR, exist_ok=True)
 
 LOG_FILE = os.path.join(LOG_DIR, "app.log")
 
+# Set per request by RequestIdMiddleware (app/core/request_context.py)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "request_id"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            # Cached on the record, which is shared by the file and console handlers
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class _EnqueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the whole record in the caller's thread.
+        # Only interpolate the message (its args may change after we return)
+        # and leave JSON encoding and traceback formatting to the listener.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.request_id = request_id_var.get()
+        return record
+
+
+formatter = JsonFormatter()
+
 handler = RotatingFileHandler(
     LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=3
 )
-formatter = logging.Formatter(
-    "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
 handler.setFormatter(formatter)
 
-logger = logging.getLogger("dinnerconnect")
-logger.setLevel(logging.DEBUG)
-logger.addHandler(handler)
-
 # Console logging too
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+listener = QueueListener(_log_queue, handler, console_handler, respect_handler_level=True)
+
+logger = logging.getLogger("dinnerconnect")
+logger.setLevel(settings.LOG_LEVEL.upper())
+logger.addHandler(_EnqueueHandler(_log_queue))
+logger.propagate = False
+
+_listener_lock = threading.Lock()
+
+
+def start_logging():
+    """Start the writer thread unless it is running, e.g. again after stop_logging()."""
+    with _listener_lock:
+        if listener._thread is None:
+            listener.start()
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread. Safe to call twice."""
+    with _listener_lock:
+        if listener._thread is not None:
+            listener.stop()
+
+
+start_logging()
+
+
+atexit.register(stop_logging)
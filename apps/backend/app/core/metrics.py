@@ -0,0 +1,316 @@
+# app/core/metrics.py
+"""
+Request latency, MongoDB command and connection pool metrics, rendered in
+the Prometheus text format at /metrics, for scrapers holding METRICS_TOKEN.
+
+MetricsMiddleware times every HTTP request under its route template and
+binds a RequestStats to a context variable for the duration of the request.
+MongoCommandListener (registered on the Motor client) reads that variable,
+so each command's count and time are attributed to the request that issued
+it. Motor runs pymongo on executor threads with a copy of the caller's
+context, which is what makes the attribution work.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+
+from app.core.config import settings
+from app.core.logger import logger
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COMMAND_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()):
+        self.name, self.help, self.label_names = name, help, tuple(label_names)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Labels = (), amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(self.label_names, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name, self.help, self.label_names = name, help, tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> (per-bucket counts incl. +Inf, sum, count)
+        self._values: Dict[Labels, Tuple[List[int], float, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Labels, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._values.get(labels) or ([0] * (len(self.buckets) + 1), 0.0, 0)
+            counts[index] += 1
+            self._values[labels] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(c), s, n)) for labels, (c, s, n) in self._values.items())
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                le_label = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{_label_str(self.label_names, labels, le_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(self.label_names, labels)} {total}")
+            lines.append(f"{self.name}_count{_label_str(self.label_names, labels)} {count}")
+        return lines
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+http_request_db_commands = Histogram(
+    "http_request_db_commands", "MongoDB commands issued per HTTP request.",
+    ("method", "route"), COMMAND_COUNT_BUCKETS,
+)
+mongo_command_duration = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency.",
+    ("command", "collection"), LATENCY_BUCKETS,
+)
+mongo_command_failures = Counter(
+    "mongo_command_failures_total", "MongoDB commands that returned an error.",
+    ("command", "collection"),
+)
+
+mongo_pool_checkout_wait = Histogram(
+    "mongo_pool_checkout_wait_seconds", "Time spent waiting to check a connection out of the pool.",
+    ("address",), LATENCY_BUCKETS,
+)
+mongo_pool_checkout_failures = Counter(
+    "mongo_pool_checkout_failures_total", "Connection checkouts that failed, by reason (timeout = pool exhausted).",
+    ("address", "reason"),
+)
+
+REGISTRY = [
+    http_request_duration, http_request_db_commands, mongo_command_duration, mongo_command_failures,
+    mongo_pool_checkout_wait, mongo_pool_checkout_failures,
+]
+
+
+@dataclass
+class RequestStats:
+    db_commands: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_stats_lock = threading.Lock()
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    def __init__(self):
+        # (connection, request id) -> collection, since only the started event carries the command
+        self._collections: Dict[Tuple[object, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        collection = event.command.get(event.command_name)
+        self._collections[(event.connection_id, event.request_id)] = (
+            collection if isinstance(collection, str) else ""
+        )
+
+    def _finish(self, event, failed: bool):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        seconds = event.duration_micros / 1_000_000
+        labels = (event.command_name, collection)
+        mongo_command_duration.observe(labels, seconds)
+        if failed:
+            mongo_command_failures.inc(labels)
+
+        stats = _request_stats.get()
+        if stats is not None:
+            # Commands of one request can run concurrently on different executor threads
+            with _stats_lock:
+                stats.db_commands += 1
+                stats.db_seconds += seconds
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finish(event, failed=True)
+
+
+mongo_listener = MongoCommandListener()
+
+
+def _address(address: Tuple[str, int]) -> str:
+    return f"{address[0]}:{address[1]}"
+
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """Connection pool occupancy and checkout latency, per server address."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open: Dict[str, int] = {}
+        self.in_use: Dict[str, int] = {}
+
+    def _add(self, gauge: Dict[str, int], address: Tuple[str, int], delta: int):
+        key = _address(address)
+        with self._lock:
+            gauge[key] = gauge.get(key, 0) + delta
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent):
+        self._add(self.open, event.address, 1)
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent):
+        self._add(self.open, event.address, -1)
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent):
+        self._add(self.in_use, event.address, 1)
+        mongo_pool_checkout_wait.observe((_address(event.address),), event.duration or 0.0)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent):
+        self._add(self.in_use, event.address, -1)
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent):
+        mongo_pool_checkout_failures.inc((_address(event.address), event.reason))
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent):
+        pass
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent):
+        pass
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent):
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent):
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent):
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent):
+        pass
+
+
+mongo_pool_listener = MongoPoolListener()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so the handler runs in the same context it binds."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+
+            route = scope.get("route")
+            # Unmatched paths share one label so scanners cannot blow up cardinality
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_request_duration.observe((method, route_path, str(status)), elapsed)
+            http_request_db_commands.observe((method, route_path), stats.db_commands)
+
+            if elapsed >= settings.SLOW_REQUEST_SECONDS:
+                logger.warning(
+                    "Slow request %s %s -> %d in %.3fs (%d db commands, %.3fs in db)",
+                    method, route_path, status, elapsed, stats.db_commands, stats.db_seconds,
+                )
+
+
+def _gauge_lines(name: str, help: str, label_name: str, values: Iterable[Tuple[str, float]]) -> List[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    lines.extend(f'{name}{{{label_name}="{_escape(label)}"}} {value}' for label, value in values)
+    return lines
+
+
+EXECUTOR_FIELDS = {
+    "active": "Tasks running on the pool.",
+    "waiting": "Tasks queued for a pool worker.",
+    "submitted": "Tasks submitted since start.",
+    "completed": "Tasks completed since start.",
+    "failed": "Tasks that raised since start.",
+    "wait_seconds_total": "Total seconds tasks spent queued.",
+    "run_seconds_total": "Total seconds tasks spent running.",
+}
+
+
+def render_metrics() -> str:
+    # Imported here to keep this module importable from app.db.init without cycles
+    from app.core.executors import pool_stats
+    from app.services.dinner_cache import upcoming_dinners_cache
+
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+
+    pools = pool_stats()
+    for field, help in EXECUTOR_FIELDS.items():
+        lines.extend(_gauge_lines(
+            f"executor_{field}", help, "pool",
+            ((name, stats[field]) for name, stats in pools.items()),
+        ))
+
+    with mongo_pool_listener._lock:
+        pool_open, pool_in_use = dict(mongo_pool_listener.open), dict(mongo_pool_listener.in_use)
+    lines.extend(_gauge_lines("mongo_pool_connections_open", "Pooled MongoDB connections currently open.",
+                              "address", sorted(pool_open.items())))
+    lines.extend(_gauge_lines("mongo_pool_connections_in_use", "Pooled MongoDB connections checked out.",
+                              "address", sorted(pool_in_use.items())))
+
+    caches = {"upcoming_dinners": upcoming_dinners_cache}
+    lines.extend(_gauge_lines("cache_hits", "Read-through cache hits.", "cache",
+                              ((name, cache.hits) for name, cache in caches.items())))
+    lines.extend(_gauge_lines("cache_misses", "Read-through cache misses.", "cache",
+                              ((name, cache.misses) for name, cache in caches.items())))
+    return "\n".join(lines) + "\n"
@@ -1,24 +1,54 @@
-import boto3
 import json
+from typing import List
 from app.core.config import settings
+from app.core.clients import clients
+from app.core.logger import logger
+
+# SQS SendMessageBatch accepts at most 10 entries
+SQS_BATCH_SIZE = 10
+
+
+def _message_body(to_email: str, template: str, data: dict) -> str:
+    return json.dumps({
+        "from": "Bichance <support@bichance.com>",
+        "email": to_email,
+        "template": template,
+        "data": data
+    })
 
-sqs = boto3.client(
-    "sqs",
-    region_name=settings.AWS_REGION,
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-)
 
 def queue_email_notification(to_email: str, template: str, data: dict):
     """
     Generic producer for all email notifications.
     """
-    return sqs.send_message(
+    return clients.sqs.send_message(
         QueueUrl=settings.SQS_QUEUE_URL,
-        MessageBody=json.dumps({
-            "from": "Bichance <support@bichance.com>",
-            "email": to_email,
-            "template": template,
-            "data": data
-        })
+        MessageBody=_message_body(to_email, template, data)
     )
+
+
+def queue_email_notifications(notifications: List[dict]) -> int:
+    """
+    Batched producer. Each item has the keyword arguments of
+    queue_email_notification (to_email, template, data). Sends one
+    SendMessageBatch call per 10 messages and returns how many failed.
+    """
+    failed = 0
+    for start in range(0, len(notifications), SQS_BATCH_SIZE):
+        chunk = notifications[start:start + SQS_BATCH_SIZE]
+        response = clients.sqs.send_message_batch(
+            QueueUrl=settings.SQS_QUEUE_URL,
+            Entries=[
+                {"Id": str(i), "MessageBody": _message_body(**item)}
+                for i, item in enumerate(chunk)
+            ]
+        )
+        for entry in response.get("Failed", []):
+            failed += 1
+            logger.error(
+                "Failed to queue %s email to %s: %s",
+                chunk[int(entry["Id"])]["template"],
+                chunk[int(entry["Id"])]["to_email"],
+                entry.get("Message"),
+            )
+    return failed
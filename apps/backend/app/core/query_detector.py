@@ -0,0 +1,206 @@
+# app/core/query_detector.py
+"""
+Development/test detector for N+1 query patterns.
+
+While a detection session is active, every Mongo command is recorded under
+its normalized shape (command, collection and filter keys with the values
+stripped) together with the line of app code that issued it. A shape that
+repeats more than the threshold from the same call site is reported, either
+as a warning or by raising RepeatedQueryError.
+
+The call site is taken on the event loop, at the moment Motor hands the
+operation to its executor (the issuing coroutine is still on the stack
+then), and travels to the command listener in a context variable.
+
+Sessions are bound per request by QueryDetectorMiddleware when
+QUERY_DETECTOR_MODE is "warn" or "raise", or explicitly in tests:
+
+    with detect_repeated_queries(threshold=3):
+        await run_matching(dinner_id)
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import motor.frameworks.asyncio as motor_asyncio
+from pymongo import monitoring
+
+from app.core.config import settings
+from app.core.logger import logger
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames in these files are plumbing, never the call site worth reporting
+_SKIPPED_PATHS = (os.path.join(APP_ROOT, "core") + os.sep, os.path.join(APP_ROOT, "db", "init.py"))
+
+# Commands that are part of normal cursor/session handling rather than queries
+IGNORED_COMMANDS = {
+    "getMore", "killCursors", "endSessions", "hello", "isMaster", "ismaster", "ping",
+    "buildInfo", "saslStart", "saslContinue", "listIndexes", "createIndexes",
+}
+
+# Where each command keeps the part of its body that identifies the query
+_QUERY_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "aggregate": "pipeline",
+}
+
+
+class RepeatedQueryError(AssertionError):
+    pass
+
+
+def _shape(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        # $and/$or clauses and pipeline stages keep their structure
+        return [_shape(item) for item in value]
+    return "?"
+
+
+def command_shape(command_name: str, command: Dict[str, Any]) -> str:
+    collection = command.get(command_name)
+    if command_name in _QUERY_FIELDS:
+        body = command.get(_QUERY_FIELDS[command_name])
+    elif command_name in ("update", "delete"):
+        statements = command.get(command_name + "s") or [{}]
+        body = statements[0].get("q")
+    else:
+        body = None
+    shape = json.dumps(_shape(body), sort_keys=True) if body is not None else ""
+    return f"{command_name} {collection} {shape}".rstrip()
+
+
+def _call_site() -> str:
+    # The innermost app frame on the loop's stack is the one issuing the query
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_ROOT) and not filename.startswith(_SKIPPED_PATHS):
+            return f"{os.path.relpath(filename, os.path.dirname(APP_ROOT))}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+@dataclass
+class QuerySession:
+    threshold: int
+    mode: str
+    counts: Counter = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, command_name: str, command: Dict[str, Any]):
+        key = (command_shape(command_name, command), _call_site_var.get())
+        with self._lock:
+            self.counts[key] += 1
+
+    def offenders(self) -> List[Tuple[str, str, int]]:
+        with self._lock:
+            return [
+                (shape, site, count)
+                for (shape, site), count in self.counts.most_common()
+                if count > self.threshold
+            ]
+
+    def report(self, label: str):
+        offenders = self.offenders()
+        if not offenders:
+            return
+        message = f"Repeated queries in {label} (threshold {self.threshold}):\n" + "\n".join(
+            f"  {count}x {shape}\n      at {site}" for shape, site, count in offenders
+        )
+        if self.mode == "raise":
+            raise RepeatedQueryError(message)
+        logger.warning(message)
+
+
+_session: ContextVar[Optional[QuerySession]] = ContextVar("query_session", default=None)
+_call_site_var: ContextVar[str] = ContextVar("query_call_site", default="<unknown>")
+
+_motor_run_on_executor = motor_asyncio.run_on_executor
+
+
+def _run_on_executor(loop, fn, *args, **kwargs):
+    # Motor copies the context into the executor call, so the listener sees the site set here
+    if _session.get() is None:
+        return _motor_run_on_executor(loop, fn, *args, **kwargs)
+    token = _call_site_var.set(_call_site())
+    try:
+        return _motor_run_on_executor(loop, fn, *args, **kwargs)
+    finally:
+        _call_site_var.reset(token)
+
+
+def install_motor_hook():
+    """Route Motor's executor hand-off through _run_on_executor. Idempotent."""
+    motor_asyncio.run_on_executor = _run_on_executor
+
+
+class QueryDetectorListener(monitoring.CommandListener):
+    """Does nothing unless a detection session is bound to the current context."""
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        session = _session.get()
+        if session is not None and event.command_name not in IGNORED_COMMANDS:
+            session.record(event.command_name, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        pass
+
+
+query_detector_listener = QueryDetectorListener()
+
+
+@contextmanager
+def detect_repeated_queries(
+    threshold: Optional[int] = None, mode: str = "raise", label: str = "block"
+) -> Iterator[QuerySession]:
+    install_motor_hook()
+    session = QuerySession(
+        threshold=settings.QUERY_DETECTOR_THRESHOLD if threshold is None else threshold,
+        mode=mode,
+    )
+    token = _session.set(session)
+    try:
+        yield session
+    finally:
+        _session.reset(token)
+    # Only reached when the block succeeded, so its own errors are not masked
+    session.report(label)
+
+
+class QueryDetectorMiddleware:
+    def __init__(self, app):
+        self.app = app
+        install_motor_hook()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        session = QuerySession(
+            threshold=settings.QUERY_DETECTOR_THRESHOLD,
+            mode=settings.QUERY_DETECTOR_MODE,
+        )
+        token = _session.set(session)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _session.reset(token)
+        # Reported under the route template, which is only known after routing
+        route = getattr(scope.get("route"), "path", None) or scope["path"]
+        session.report(f"{scope['method']} {route}")
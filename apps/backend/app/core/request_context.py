@@ -0,0 +1,44 @@
+# app/core/request_context.py
+
+import re
+import uuid
+
+from app.core.logger import request_id_var
+
+REQUEST_ID_HEADER = b"x-request-id"
+# Accept a caller's id only if it is short and safe to echo back and log
+_VALID_REQUEST_ID = re.compile(rb"^[A-Za-z0-9._-]{1,128}$")
+
+
+class RequestIdMiddleware:
+    """
+    Binds a correlation id to the request (the caller's X-Request-ID, or a
+    new one) so every log record emitted while handling it carries the id,
+    and echoes it in the response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(REQUEST_ID_HEADER)
+        if incoming and _VALID_REQUEST_ID.match(incoming):
+            request_id = incoming.decode()
+        else:
+            request_id = uuid.uuid4().hex
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(REQUEST_ID_HEADER, request_id.encode())]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,20 @@
+# app/core/responses.py
+
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
+
+__all__ = ["ORJSONResponse", "ModelResponse"]
+
+
+class ModelResponse(Response):
+    """
+    Response for an already-validated Pydantic model.
+
+    The model is serialized straight to JSON bytes by pydantic-core, skipping
+    FastAPI's response_model re-validation and jsonable_encoder pass. Keep
+    ``response_model=`` on the route so the OpenAPI schema stays accurate.
+    """
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content, by_alias=True)
@@ -0,0 +1,123 @@
+# app/crons/matchmaker.py
+"""
+Match every dinner once it reaches the sign-up cut-off.
+
+    python -m app.crons.matchmaker [--once]
+
+Every MATCHMAKER_INTERVAL_SECONDS the node looks for unmatched dinners less
+than UPCOMING_CUTOFF away (the point where /dinner/upcoming stops listing
+them) and matches up to MATCHMAKER_CONCURRENCY of them at a time. Any number
+of nodes can run this: they split the due dinners between them (see
+app/services/matchmaking/scheduler.py) and the per-dinner lease keeps two
+nodes from matching the same dinner. Each pass that found work is recorded
+as a MatchingRun; runs expire after MATCHING_RUN_RETENTION_DAYS.
+
+Dinners skipped for lack of users stay unmatched, in case late opt-ins make
+them viable, but are only due again MATCHMAKER_SKIP_BACKOFF_SECONDS later
+(Dinner.next_attempt_at) rather than on every pass until they start.
+"""
+
+import argparse
+import asyncio
+import signal
+from collections import Counter
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from beanie import PydanticObjectId
+
+from app.core.config import settings
+from app.core.executors import shutdown_pools
+from app.core.logger import logger
+from app.db.init import init_db
+from app.models.dinner import Dinner
+from app.models.matching_run import MatchingRun, MatchingRunDinner
+from app.services.dinner_cache import UPCOMING_CUTOFF
+from app.services.matchmaking.scheduler import MatchingNode
+
+
+async def due_dinner_ids(now: Optional[datetime] = None) -> List[PydanticObjectId]:
+    now = now or datetime.now(timezone.utc)
+    rows = await Dinner.get_motor_collection().find(
+        {
+            "matched": {"$ne": True},
+            "date": {"$gt": now, "$lte": now + UPCOMING_CUTOFF},
+            "$or": [{"next_attempt_at": None}, {"next_attempt_at": {"$lte": now}}],
+        },
+        {"_id": 1},
+    ).sort("date", 1).to_list(length=None)
+    return [row["_id"] for row in rows]
+
+
+async def run_once(node: MatchingNode) -> Optional[MatchingRun]:
+    """One pass: match everything due and record the outcome. Returns None when nothing was due."""
+    started_at = datetime.now(timezone.utc)
+    dinner_ids = await due_dinner_ids(started_at)
+    if not dinner_ids:
+        return None
+
+    results = await node.run(dinner_ids, settings.MATCHMAKER_CONCURRENCY)
+    run = MatchingRun(
+        owner=node.owner,
+        started_at=started_at,
+        finished_at=datetime.now(timezone.utc),
+        due=len(dinner_ids),
+        counts=dict(Counter(result.status for result in results)),
+        dinners=[
+            MatchingRunDinner(
+                dinner_id=result.dinner_id,
+                status=result.status,
+                groups_created=result.groups_created,
+                ungrouped_users=result.ungrouped_users,
+                reason=result.reason,
+            )
+            for result in results
+        ],
+    )
+    await run.insert()
+    logger.info(
+        "🍽️ Matchmaker pass: %d due dinners in %.1fs, %s",
+        run.due, (run.finished_at - started_at).total_seconds(), run.counts,
+    )
+    return run
+
+
+async def serve(stop: asyncio.Event, once: bool = False):
+    await init_db()
+    node = MatchingNode()
+    await node.start()
+    logger.info("🍽️ Matchmaker %s started", node.owner)
+    try:
+        while not stop.is_set():
+            try:
+                await run_once(node)
+            except Exception:
+                logger.exception("Matchmaker pass failed")
+            if once:
+                break
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.MATCHMAKER_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await node.stop()
+        shutdown_pools()
+
+
+def run(once: bool = False):
+    """Run passes until SIGTERM/SIGINT; a pass in progress is finished first."""
+
+    async def main():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stop.set)
+        await serve(stop, once=once)
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    run(parser.parse_args().once)
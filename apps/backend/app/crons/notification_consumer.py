@@ -1,21 +1,20 @@
 
-import boto3, json, time
+import json, signal, threading, time
+from typing import Optional
 from app.core.config import settings
+from app.core.clients import clients
+from app.core.logger import logger
 from app.services.notifications.email import send_email_using_template
 from app.services.email import send_venue_update_email, send_subscription_email
 from app.utils.send_dinner_match_email import send_dinner_match_email
 from app.services.email import send_otp_email
 from app.utils.dinner_opt_in_mail import send_dinner_opt_in_email
 
-sqs = boto3.client(
-    "sqs",
-    region_name=settings.AWS_REGION,
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-)
-
-def consume():
-    while True:
+def consume(stop: Optional[threading.Event] = None):
+    """Poll SQS until stop is set. A batch already received is always finished."""
+    stop = stop or threading.Event()
+    sqs = clients.sqs
+    while not stop.is_set():
         response = sqs.receive_message(
             QueueUrl=settings.SQS_QUEUE_URL,
             MaxNumberOfMessages=5,
@@ -80,9 +79,22 @@ def consume():
                     ReceiptHandle=msg["ReceiptHandle"]
                 )
 
-            except Exception as e:
-                print(f"❌ Error processing SQS message: {e}")
+            except Exception:
+                logger.exception("❌ Error processing SQS message %s", msg.get("MessageId"))
+
+
+def run():
+    """Consume until SIGTERM/SIGINT, then exit after the current batch (at most one long poll)."""
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info("📨 Consumer received signal %d, stopping after the current batch", signum)
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    consume(stop)
 
 
 if __name__ == "__main__":
-    consume()
\ No newline at end of file
+    run()
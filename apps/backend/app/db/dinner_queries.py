@@ -0,0 +1,93 @@
+# app/db/dinner_queries.py
+
+from typing import Any, Dict, List
+
+from beanie import PydanticObjectId
+
+from app.models.dinner import Dinner
+from app.models.user import PublicProfile, User
+from app.models.venue import Venue
+
+# Fields of a participant that other members of the group may see
+PARTICIPANT_PUBLIC_FIELDS = tuple(name for name in PublicProfile.model_fields if name != "id")
+
+
+def _as_object_id(expr: str) -> Dict[str, Any]:
+    # venue_id has been stored both as ObjectId and as str by older code paths
+    return {"$convert": {"input": expr, "to": "objectId", "onError": None, "onNull": None}}
+
+
+def user_bookings_pipeline(user_id: PydanticObjectId, limit: int) -> List[Dict[str, Any]]:
+    """
+    Aggregation over dinner_groups returning the user's bookings, newest dinner
+    first, joined with their dinner, venue and the public profile of every
+    participant. Sorting and limiting happen before the venue/user joins so
+    the expensive lookups only run for the page that is returned.
+    """
+    return [
+        {"$match": {"participant_ids": user_id}},
+        {"$lookup": {
+            "from": Dinner.get_collection_name(),
+            "let": {"dinner_id": "$dinner_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$dinner_id"]}}},
+                {"$project": {"_id": 0, "date": 1, "city": 1, "country": 1}},
+            ],
+            "as": "dinner",
+        }},
+        {"$unwind": "$dinner"},
+        {"$sort": {"dinner.date": -1, "_id": -1}},
+        {"$limit": limit},
+        {"$lookup": {
+            "from": Venue.get_collection_name(),
+            "let": {"venue_id": _as_object_id("$venue_id")},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$venue_id"]}}},
+                {"$project": {
+                    "_id": 0,
+                    "id": {"$toString": "$_id"},
+                    "name": 1, "address": 1, "city": 1, "country": 1, "google_maps_url": 1,
+                }},
+            ],
+            "as": "venue",
+        }},
+        {"$lookup": {
+            "from": User.get_collection_name(),
+            # localField/foreignField, unlike $expr/$in, looks participants up by the _id index
+            "localField": "participant_ids",
+            "foreignField": "_id",
+            "pipeline": [
+                {"$project": {
+                    "_id": 0,
+                    "id": {"$toString": "$_id"},
+                    **{field: 1 for field in PARTICIPANT_PUBLIC_FIELDS},
+                }},
+            ],
+            "as": "participant_details",
+        }},
+        {"$project": {
+            "_id": 0,
+            "id": {"$toString": "$_id"},
+            "dinner_id": {"$toString": "$dinner_id"},
+            "date": "$dinner.date",
+            "city": "$dinner.city",
+            "country": "$dinner.country",
+            "budget_category": 1,
+            "dietary_category": 1,
+            "match_score": 1,
+            "venue_id": {"$toString": "$venue_id"},
+            "venue": {"$arrayElemAt": ["$venue", 0]},
+            "participant_ids": {
+                "$map": {"input": "$participant_ids", "as": "pid", "in": {"$toString": "$$pid"}}
+            },
+            "participant_details": 1,
+        }},
+    ]
+
+
+def opt_in_counts_pipeline(dinner_ids: List[PydanticObjectId]) -> List[Dict[str, Any]]:
+    """Number of dinner_opt_ins rows per dinner, for the given dinners."""
+    return [
+        {"$match": {"dinner_id": {"$in": dinner_ids}}},
+        {"$group": {"_id": "$dinner_id", "count": {"$sum": 1}}},
+    ]
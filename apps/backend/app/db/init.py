@@ -1,12 +1,16 @@
 # app/db/init.py
 
+from importlib.util import find_spec
+from typing import Dict, List, Optional, Type
+
+from beanie import Document
+from beanie.odm.utils.init import Initializer
 from motor.motor_asyncio import AsyncIOMotorClient
-from beanie import init_beanie
 from app.core.config import settings
+from app.core.metrics import mongo_listener, mongo_pool_listener
+from app.core.query_detector import query_detector_listener
 
-# Import all models
 from app.models.user import User
-from app.models.group import DinnerGroup
 from app.models.feedback import Feedback
 from app.models.subscription import Subscription
 from app.models.restaurant import Restaurant
@@ -15,25 +19,89 @@ from app.models.session import Session
 from app.models.dinner import Dinner, DinnerGroup
 from app.models.admin import AdminUser
 from app.models.venue import Venue
+from app.models.dinner_opt_in import DinnerOptIn
+from app.models.stripe_event import StripeEvent
+from app.models.lease import Lease
+from app.models.matching_run import MatchingRun
+
+# Every Beanie document the app uses, one entry per collection
+DOCUMENT_MODELS: List[Type[Document]] = [
+    User,
+    Feedback,
+    Subscription,
+    Restaurant,
+    OTP,
+    Session,
+    Dinner,
+    DinnerGroup,
+    AdminUser,
+    Venue,
+    DinnerOptIn,
+    StripeEvent,
+    Lease,
+    MatchingRun,
+]
+
+# Indexes earlier versions declared and that are now superseded. Beanie only
+# creates indexes, so an index sync drops these explicitly
+RETIRED_INDEXES: Dict[Type[Document], List[str]] = {
+    MatchingRun: ["started_at_desc"],  # replaced by the started_at_ttl index
+}
+
+
+# Compressor name -> module pymongo needs for it (zlib is in the standard library)
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def available_compressors() -> List[str]:
+    requested = [name.strip() for name in settings.MONGO_COMPRESSORS.split(",") if name.strip()]
+    return [name for name in requested if name in _COMPRESSOR_MODULES and find_spec(_COMPRESSOR_MODULES[name])]
+
 
-async def init_db():
-    client = AsyncIOMotorClient(settings.MONGO_URI)
-    db = client[settings.DATABASE_NAME]
-
-    await init_beanie(
-        database=db,
-        document_models=[
-            User,
-            DinnerGroup,
-            Feedback,
-            Subscription,
-            Restaurant,
-            OTP,
-            Session,
-            Dinner,
-            DinnerGroup,
-            AdminUser,
-            Venue,
-            
-        ]
+def create_client() -> AsyncIOMotorClient:
+    return AsyncIOMotorClient(
+        settings.MONGO_URI,
+        maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        maxConnecting=settings.MONGO_MAX_CONNECTING,
+        waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+        connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        compressors=available_compressors(),
+        event_listeners=[mongo_listener, mongo_pool_listener, query_detector_listener],
     )
+
+
+class _InitializerWithoutIndexes(Initializer):
+    # Beanie reads and creates every model's indexes during init, two round
+    # trips per model; app/launcher.py does it once for all of its children
+    async def init_indexes(self, cls, allow_index_dropping: bool = False):
+        return None
+
+
+async def init_db(
+    client: Optional[AsyncIOMotorClient] = None,
+    database_name: Optional[str] = None,
+    sync_indexes: Optional[bool] = None,
+):
+    # Benchmarks and scripts may hand in their own (or a Motor-compatible in-memory) client
+    if client is None:
+        client = create_client()
+    db = client[database_name or settings.DATABASE_NAME]
+
+    if sync_indexes is None:
+        sync_indexes = settings.MONGO_SYNC_INDEXES_ON_STARTUP
+    initializer = Initializer if sync_indexes else _InitializerWithoutIndexes
+    await initializer(database=db, document_models=DOCUMENT_MODELS)
+    if sync_indexes:
+        await drop_retired_indexes()
+
+
+async def drop_retired_indexes():
+    for model, names in RETIRED_INDEXES.items():
+        collection = model.get_motor_collection()
+        existing = await collection.index_information()
+        for name in names:
+            if name in existing:
+                await collection.drop_index(name)
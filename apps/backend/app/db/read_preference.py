@@ -0,0 +1,68 @@
+# app/db/read_preference.py
+"""
+Reads that may be served by a secondary.
+
+Beanie queries always go through the collection's (primary) read preference,
+so endpoints that can tolerate data a few seconds old query the collection
+returned by secondary() directly. With the default "secondaryPreferred" a
+deployment without secondaries transparently reads from the primary.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Type, TypeVar
+
+from beanie import Document
+from beanie.odm.utils.projection import get_projection
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pydantic import BaseModel
+from pymongo.read_preferences import make_read_preference, read_pref_mode_from_name
+
+from app.core.config import settings
+
+T = TypeVar("T", bound=BaseModel)
+
+
+@lru_cache(maxsize=1)
+def secondary_read_preference():
+    mode = read_pref_mode_from_name(settings.MONGO_SECONDARY_READ_PREFERENCE)
+    if settings.MONGO_SECONDARY_READ_PREFERENCE == "primary":
+        return make_read_preference(mode, None)
+    return make_read_preference(mode, None, max_staleness=settings.MONGO_SECONDARY_MAX_STALENESS_SECONDS)
+
+
+def secondary(model: Type[Document]) -> AsyncIOMotorCollection:
+    """The model's collection, reading with MONGO_SECONDARY_READ_PREFERENCE."""
+    collection = model.get_motor_collection()
+    if settings.MONGO_SECONDARY_READ_PREFERENCE == "primary":
+        return collection
+    return collection.with_options(read_preference=secondary_read_preference())
+
+
+async def find_on_secondary(
+    model: Type[Document],
+    filter: Mapping[str, Any],
+    projection_model: Type[T],
+    sort: Optional[Sequence[Tuple[str, int]]] = None,
+    limit: int = 0,
+) -> List[T]:
+    cursor = secondary(model).find(filter, get_projection(projection_model))
+    if sort:
+        cursor = cursor.sort(list(sort))
+    if limit:
+        cursor = cursor.limit(limit)
+    return [projection_model.model_validate(doc) for doc in await cursor.to_list(length=None)]
+
+
+async def aggregate_on_secondary(
+    model: Type[Document],
+    pipeline: List[Dict[str, Any]],
+    projection_model: Optional[Type[T]] = None,
+) -> List[Any]:
+    if projection_model is not None:
+        projection = get_projection(projection_model)
+        if projection is not None:
+            pipeline = pipeline + [{"$project": projection}]
+    rows = await secondary(model).aggregate(pipeline).to_list(length=None)
+    if projection_model is None:
+        return rows
+    return [projection_model.model_validate(row) for row in rows]
@@ -1,14 +1,15 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.utils.jwt import decode_token
-from app.models.user import User
+from app.models.user import User, AuthPrincipal
 from app.models.session import Session
+from app.schemas.user import MeResponse
 
 security = HTTPBearer(auto_error=True)
 
-async def get_current_user(
+async def get_current_email(
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
+) -> str:
     if credentials.scheme.lower() != "bearer":
         raise HTTPException(status_code=401, detail="Invalid authentication scheme")
 
@@ -21,8 +22,21 @@ async def get_current_user(
     if not session or not session.is_active:
         raise HTTPException(status_code=401, detail="Session not active or token expired")
 
-    user = await User.find_one(User.email == email)
+    return email
+
+
+async def get_current_user(email: str = Depends(get_current_email)) -> AuthPrincipal:
+    # Only the handful of fields handlers read, not the full profile
+    user = await User.find_one(User.email == email, projection_model=AuthPrincipal)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     return user
+
+
+async def get_current_profile(email: str = Depends(get_current_email)) -> MeResponse:
+    profile = await User.find_one(User.email == email, projection_model=MeResponse)
+    if not profile:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return profile
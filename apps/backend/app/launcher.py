@@ -0,0 +1,234 @@
+# app/launcher.py
+"""
+Container entrypoint: supervises API worker processes sharing one listening
+socket, SQS notification consumer processes and the matchmaker cron.
+
+    python -m app.launcher [--api-workers N] [--consumers M] [--matchmakers K] [--host H] [--port P] [--skip-index-sync]
+
+Counts default to API_WORKERS / CONSUMER_WORKERS / MATCHMAKER_WORKERS from
+settings (API_WORKERS=0 means one worker per available CPU). API workers run
+uvicorn on uvloop and httptools.
+
+Before starting any child the launcher creates the indexes every model
+declares (unique ones included, which opt-in dedupe, Stripe webhook
+idempotency and matching leases rely on), then starts the children with
+MONGO_SYNC_INDEXES_ON_STARTUP off so they skip that work. --skip-index-sync
+leaves it to a separate deploy step (python -m app.scripts.sync_indexes).
+Processes started without the launcher (plain uvicorn, a consumer or cron
+run directly) do not create indexes either; run that script first.
+
+A child that exits is restarted after an exponential backoff, which resets
+once the child has stayed up for STABLE_AFTER_SECONDS. On SIGTERM or SIGINT
+the launcher stops restarting and forwards SIGTERM to every child: uvicorn
+stops accepting, finishes in-flight requests and runs the lifespan shutdown,
+consumers finish the SQS batch they hold and the matchmaker finishes its
+current pass. Children still running after SHUTDOWN_GRACE_SECONDS (plus
+KILL_MARGIN_SECONDS for the lifespan shutdown) are killed.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from typing import Callable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import logger
+
+STABLE_AFTER_SECONDS = 60
+KILL_MARGIN_SECONDS = 5
+POLL_SECONDS = 0.5
+
+# Children start from a fresh interpreter instead of forking the launcher,
+# which already runs the log writer thread
+_mp = multiprocessing.get_context("spawn")
+
+
+def run_api_worker(sock: socket.socket):
+    import uvicorn
+
+    config = uvicorn.Config(
+        "app.main:app",
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        timeout_graceful_shutdown=settings.SHUTDOWN_GRACE_SECONDS,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def run_consumer():
+    from app.crons.notification_consumer import run
+
+    run()
+
+
+def run_matchmaker():
+    from app.crons.matchmaker import run
+
+    run()
+
+
+@dataclass
+class Child:
+    name: str
+    target: Callable
+    args: Tuple = ()
+    process: Optional[multiprocessing.Process] = None
+    started_at: float = 0.0
+    failures: int = 0
+    restart_at: Optional[float] = None
+
+    def start(self):
+        self.process = _mp.Process(target=self.target, args=self.args, name=self.name)
+        self.process.start()
+        self.started_at = time.monotonic()
+        self.restart_at = None
+        logger.info("▶️ Started %s (pid %d)", self.name, self.process.pid)
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+class Supervisor:
+    def __init__(self, children: List[Child]):
+        self.children = children
+        self.stopping = False
+
+    def _request_stop(self, signum, frame):
+        if not self.stopping:
+            logger.info("⛔ Launcher received signal %d, draining children", signum)
+        self.stopping = True
+
+    def _reap(self):
+        now = time.monotonic()
+        for child in self.children:
+            if child.process is None or child.process.is_alive():
+                continue
+            exitcode = child.process.exitcode
+            uptime = now - child.started_at
+            child.process.close()
+            child.process = None
+            if uptime >= STABLE_AFTER_SECONDS:
+                child.failures = 0
+            child.failures += 1
+            delay = min(
+                settings.RESTART_BACKOFF_INITIAL_SECONDS * 2 ** (child.failures - 1),
+                settings.RESTART_BACKOFF_MAX_SECONDS,
+            )
+            child.restart_at = now + delay
+            logger.warning(
+                "%s exited with code %s after %.1fs; restarting in %.1fs",
+                child.name, exitcode, uptime, delay,
+            )
+
+    def _restart_due(self):
+        now = time.monotonic()
+        for child in self.children:
+            if child.process is None and child.restart_at is not None and child.restart_at <= now:
+                child.start()
+
+    def _shutdown(self):
+        running = [child for child in self.children if child.alive]
+        for child in running:
+            child.process.terminate()
+
+        deadline = time.monotonic() + settings.SHUTDOWN_GRACE_SECONDS + KILL_MARGIN_SECONDS
+        while running and time.monotonic() < deadline:
+            wait([child.process.sentinel for child in running], timeout=deadline - time.monotonic())
+            running = [child for child in running if child.process.is_alive()]
+
+        for child in running:
+            logger.warning("%s did not stop within the grace period, killing it", child.name)
+            child.process.kill()
+        for child in self.children:
+            if child.process is not None:
+                child.process.join()
+        logger.info("👋 All children stopped")
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        for child in self.children:
+            child.start()
+        while not self.stopping:
+            # Wakes up as soon as any child exits
+            wait([child.process.sentinel for child in self.children if child.alive], timeout=POLL_SECONDS)
+            self._reap()
+            if not self.stopping:
+                self._restart_due()
+        self._shutdown()
+
+
+def sync_indexes():
+    from app.db.init import create_client, init_db
+
+    async def run():
+        client = create_client()
+        try:
+            await init_db(client=client, sync_indexes=True)
+        finally:
+            client.close()
+
+    started = time.monotonic()
+    asyncio.run(run())
+    # Inherited by the spawned children
+    os.environ["MONGO_SYNC_INDEXES_ON_STARTUP"] = "false"
+    logger.info("🗂️ Indexes in sync (%.1fs)", time.monotonic() - started)
+
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run API workers, notification consumers and the matchmaker under one supervisor")
+    parser.add_argument("--api-workers", type=int, default=settings.API_WORKERS, help="0 = one per available CPU")
+    parser.add_argument("--consumers", type=int, default=settings.CONSUMER_WORKERS)
+    parser.add_argument("--matchmakers", type=int, default=settings.MATCHMAKER_WORKERS)
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--skip-index-sync", action="store_true", help="Indexes are created by a separate deploy step")
+    args = parser.parse_args()
+
+    if args.skip_index_sync:
+        os.environ["MONGO_SYNC_INDEXES_ON_STARTUP"] = "false"
+    else:
+        sync_indexes()
+
+    api_workers = args.api_workers or _available_cpus()
+    sock = _bind(args.host, args.port)
+    children = [Child(f"api-{i}", run_api_worker, (sock,)) for i in range(api_workers)]
+    children += [Child(f"consumer-{i}", run_consumer) for i in range(args.consumers)]
+    children += [Child(f"matchmaker-{i}", run_matchmaker) for i in range(args.matchmakers)]
+
+    logger.info(
+        "🚀 Launching %d API workers on %s:%d, %d consumers and %d matchmakers",
+        api_workers, args.host, args.port, args.consumers, args.matchmakers,
+    )
+    try:
+        Supervisor(children).run()
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,57 @@
 # app/main.py
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 from app.db.init import init_db
-from app.core.logger import logger
-from fastapi.responses import JSONResponse
+from app.core.logger import logger, start_logging, stop_logging
+from app.core.request_context import RequestIdMiddleware
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.query_detector import QueryDetectorMiddleware
+from app.dependencies.metrics import require_metrics_token
+from fastapi.responses import PlainTextResponse
 from fastapi.requests import Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.encoders import jsonable_encoder
 from fastapi.security import HTTPBearer
+from pymongo.errors import WaitQueueTimeoutError
+from app.core.executors import run_blocking, shutdown_pools, pool_stats
+from app.services.geo import warm_up_geo_index
+from app.core.clients import clients
+from app.services.stripe_events import run_event_sweeper
+import asyncio
 
 
 
 # Import all routers
-from app.routes.routes import router as api_router
+from app.routes.routes import include_api_routes
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # A lifespan run again in the same process (tests, reloads) finds the writer stopped
+    start_logging()
     logger.info("🔄 App starting up...")
     await init_db()
     logger.info("✅ DB initialized")
+    # boto3 and stripe take over a second to import; load them while already serving
+    clients_warm_up = asyncio.create_task(run_blocking(clients.warm_up))
+    # Same for the geo dataset; geo requests that arrive first load it off the loop themselves
+    geo_warm_up = asyncio.create_task(warm_up_geo_index())
+    stripe_sweeper = asyncio.create_task(run_event_sweeper())
     yield
     logger.info("⛔ App shutting down...")
-app = FastAPI(lifespan=lifespan)
+    stripe_sweeper.cancel()
+    clients_warm_up.cancel()
+    geo_warm_up.cancel()
+    logger.info("Executor pool stats: %s", pool_stats())
+    shutdown_pools()
+    await clients.close()
+    stop_logging()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS Middleware (adjust origins in prod)
 app.add_middleware(
@@ -34,19 +61,36 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+if settings.QUERY_DETECTOR_MODE != "off":
+    app.add_middleware(QueryDetectorMiddleware)
+# Added last so it wraps everything else and times the full request
+app.add_middleware(MetricsMiddleware)
+# Outermost, so every log line of the request (slow-request ones included) carries its id
+app.add_middleware(RequestIdMiddleware)
 
 @app.get("/")
 async def root():
     return {"status": "DinnerConnect API running 🚀"}
 
 
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.exception("Unhandled error:")
-    return JSONResponse(status_code=500, content={"error": "Internal Server Error"})
+    return ORJSONResponse(status_code=500, content={"error": "Internal Server Error"})
+@app.exception_handler(WaitQueueTimeoutError)
+async def pool_exhausted_handler(request: Request, exc: WaitQueueTimeoutError):
+    # Every pooled Mongo connection stayed busy for MONGO_WAIT_QUEUE_TIMEOUT_MS
+    logger.warning("Mongo connection pool exhausted: %s %s", request.method, request.url.path)
+    return ORJSONResponse(status_code=503, content={"error": "Service busy, please retry"}, headers={"Retry-After": "1"})
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "code": 422,
@@ -55,5 +99,5 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         },
     )
 
-app.include_router(api_router)
+include_api_routes(app)
 security_scheme = HTTPBearer()
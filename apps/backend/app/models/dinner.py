@@ -2,6 +2,7 @@ from datetime import datetime
 from beanie import Document, PydanticObjectId
 from typing import List, Optional
 from pydantic import Field, BaseModel
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class DinnerOptInUser(BaseModel):
     user_id: PydanticObjectId
@@ -11,11 +12,22 @@ class Dinner(Document):
     date: datetime
     city: str
     country: str
+    # Legacy: opt-ins now live in the dinner_opt_ins collection (DinnerOptIn)
     opted_in_users: List[DinnerOptInUser] = Field(default_factory=list)
     matched: bool = False  # <== NEW
+    # Fencing token of the matching run that claimed the dinner (see app/services/matchmaking/runner.py)
+    matching_token: Optional[int] = None
+    # Set when matching skipped the dinner for lack of users; not due again before then
+    next_attempt_at: Optional[datetime] = None
 
     class Settings:
         name = "dinners"
+        indexes = [
+            # Due-dinner scan of the matchmaker cron
+            IndexModel([("matched", ASCENDING), ("date", ASCENDING)], name="matched_date"),
+            # Keyset pagination of the admin dinner list (newest first)
+            IndexModel([("date", DESCENDING), ("_id", DESCENDING)], name="date_id_desc"),
+        ]
 
 class DinnerGroup(Document):  # should be Document, not BaseModel
     dinner_id: PydanticObjectId  # FK to Dinner
@@ -24,9 +36,16 @@ class DinnerGroup(Document):  # should be Document, not BaseModel
     participant_ids: List[PydanticObjectId] = Field(default_factory=list)
     venue_id: Optional[PydanticObjectId]
     match_score: Optional[float] = None  # <== NEW
+    matching_token: Optional[int] = None  # token of the matching run that created the group
 
     class Settings:
         name = "dinner_groups"
+        indexes = [
+            # Groups of a dinner, and a user's group in it (dinner status, venue assignment, matching)
+            IndexModel([("dinner_id", ASCENDING), ("participant_ids", ASCENDING)], name="dinner_participants"),
+            # A user's bookings (app/db/dinner_queries.py)
+            IndexModel([("participant_ids", ASCENDING)], name="participant_ids"),
+        ]
 class DinnerGroupResponse(BaseModel):
     id: str
     dinner_id: str
@@ -35,6 +54,14 @@ class DinnerGroupResponse(BaseModel):
     participant_ids: List[str]
     venue_id: Optional[str]
 
+class DinnerSummary(BaseModel):
+    """Projection of a Dinner without its embedded opt-in list."""
+    id: PydanticObjectId = Field(alias="_id")
+    date: datetime
+    city: str
+    country: str
+    matched: bool = False
+
 class DinnerPublicResponse(BaseModel):
     id: PydanticObjectId
     date: datetime
@@ -0,0 +1,28 @@
+# app/models/dinner_opt_in.py
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class DinnerOptIn(Document):
+    """One user's sign-up for one dinner. Replaces the embedded Dinner.opted_in_users array."""
+    dinner_id: PydanticObjectId
+    user_id: PydanticObjectId
+    budget_category: Optional[str] = None
+    dietary_category: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "dinner_opt_ins"
+        indexes = [
+            IndexModel(
+                [("dinner_id", ASCENDING), ("user_id", ASCENDING)],
+                unique=True,
+                name="dinner_user_unique",
+            ),
+            IndexModel([("user_id", ASCENDING)], name="user_id"),
+        ]
@@ -0,0 +1,30 @@
+# app/models/lease.py
+
+from datetime import datetime
+from typing import Optional
+
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+
+
+class Lease(Document):
+    """
+    A named, expiring lock (see app/services/leases.py). The document outlives
+    its holders so that token keeps increasing across acquisitions and can be
+    used as a fencing token. Disposable leases, whose token nothing fences
+    on, set purge_at instead and are deleted once it has passed.
+    """
+    name: str
+    owner: Optional[str] = None
+    token: int = 0
+    acquired_at: Optional[datetime] = None
+    expires_at: datetime
+    purge_at: Optional[datetime] = None
+
+    class Settings:
+        name = "leases"
+        indexes = [
+            IndexModel([("name", ASCENDING)], unique=True, name="name_unique"),
+            # Only documents with purge_at expire
+            IndexModel([("purge_at", ASCENDING)], expireAfterSeconds=0, name="purge_at_ttl"),
+        ]
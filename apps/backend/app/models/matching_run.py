@@ -0,0 +1,40 @@
+# app/models/matching_run.py
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
+
+from app.core.config import settings
+
+
+class MatchingRunDinner(BaseModel):
+    dinner_id: PydanticObjectId
+    status: str
+    groups_created: int = 0
+    ungrouped_users: int = 0
+    reason: Optional[str] = None
+
+
+class MatchingRun(Document):
+    """One pass of the matchmaker cron (app/crons/matchmaker.py) on one node."""
+    owner: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    due: int = 0
+    # status -> number of dinners that ended with it
+    counts: Dict[str, int] = Field(default_factory=dict)
+    dinners: List[MatchingRunDinner] = Field(default_factory=list)
+
+    class Settings:
+        name = "matching_runs"
+        indexes = [
+            # Expires old runs; also serves newest-first listings
+            IndexModel(
+                [("started_at", ASCENDING)],
+                name="started_at_ttl",
+                expireAfterSeconds=settings.MATCHING_RUN_RETENTION_DAYS * 24 * 3600,
+            ),
+        ]
@@ -0,0 +1,33 @@
+# app/models/stripe_event.py
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Literal, Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class StripeEvent(Document):
+    """
+    Idempotency record for a Stripe webhook event. The unique event_id index
+    means a retried delivery is acknowledged without being applied twice.
+    """
+    event_id: str
+    type: str
+    payload: Dict[str, Any]
+    status: Literal["pending", "processing", "processed", "failed"] = "pending"
+    attempts: int = 0
+    last_error: Optional[str] = None
+    received_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    claimed_at: Optional[datetime] = None
+    processed_at: Optional[datetime] = None
+    # Set once the event's email has been queued, so retries do not send it again
+    notified_at: Optional[datetime] = None
+
+    class Settings:
+        name = "stripe_events"
+        indexes = [
+            IndexModel([("event_id", ASCENDING)], unique=True, name="event_id_unique"),
+            IndexModel([("status", ASCENDING), ("received_at", ASCENDING)], name="status_received_at"),
+        ]
@@ -3,6 +3,7 @@ from beanie import Document
 from pydantic import EmailStr, Field
 from typing import Optional
 from datetime import datetime
+from pymongo import ASCENDING, IndexModel
 
 class Subscription(Document):
     user_email: EmailStr
@@ -13,4 +14,8 @@ class Subscription(Document):
     end_date: Optional[datetime] = None
 
     class Settings:
-        name = "subscriptions"
\ No newline at end of file
+        name = "subscriptions"
+        indexes = [
+            IndexModel([("stripe_subscription_id", ASCENDING)], unique=True, name="stripe_subscription_id_unique"),
+            IndexModel([("user_email", ASCENDING)], name="user_email"),
+        ]
\ No newline at end of file
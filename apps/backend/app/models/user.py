@@ -1,4 +1,4 @@
-from beanie import Document
+from beanie import Document, PydanticObjectId
 from pydantic import EmailStr, Field, BaseModel
 from typing import Optional, Dict, List
 from datetime import date, datetime
@@ -39,3 +39,46 @@ class User(Document):
 
     class Settings:
         name = "users"
+
+
+class UserContact(BaseModel):
+    """Projection of a User with just what an email notification needs."""
+    id: PydanticObjectId = Field(alias="_id")
+    email: EmailStr
+    name: Optional[str] = ""
+
+
+class JourneyAnswers(BaseModel):
+    """Projection of a User with only the onboarding answers."""
+    id: PydanticObjectId = Field(alias="_id")
+    personality_answers: Optional[List[Optional[PersonalityAnswer]]] = None
+
+
+class AuthPrincipal(BaseModel):
+    """Projection of a User loaded on every authenticated request."""
+    id: PydanticObjectId = Field(alias="_id")
+    email: EmailStr
+    name: Optional[str] = ""
+    current_country: Optional[str] = ""
+    current_city: Optional[str] = ""
+    subscription_status: str = "none"
+
+
+class MatchCandidate(BaseModel):
+    """Projection of a User with what matchmaking and its notification need."""
+    id: PydanticObjectId = Field(alias="_id")
+    email: EmailStr
+    name: Optional[str] = ""
+    personality_scores: Optional[Dict[str, float]] = Field(default_factory=dict)
+
+
+class PublicProfile(BaseModel):
+    """Fields of a User that other members of their dinner group may see."""
+    id: PydanticObjectId = Field(alias="_id")
+    name: Optional[str] = ""
+    city: Optional[str] = ""
+    country: Optional[str] = ""
+    gender: Optional[str] = ""
+    profession: Optional[str] = ""
+    image_url: Optional[str] = None
+    identity_verified: bool = False
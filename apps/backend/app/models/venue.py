@@ -13,6 +13,9 @@ class Venue(Document):
     google_maps_url: Optional[str] = ""
     contact_number: Optional[str] = ""
     is_active: bool = True  # to allow deactivating venues without deleting
+    max_group_size: int = 6  # largest group a single table can seat
+    capacity: int = 1  # number of groups the venue can host on one dinner night
+    budget_category: Optional[str] = None  # "low" | "medium" | "high"
 
     class Settings:
         name = "venues"
@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import FastAPI
 
 # Import each modular routerfrom datetime import datetime
 
@@ -11,15 +11,23 @@ from app.api.v1.journey import router as journey_router
 from app.api.v1.dinner_users import router as dinner_router
 from app.api.v1.utils import router as countries_router
 
-# Create a base API router for version v1
-router = APIRouter(prefix="/api/v1")
+API_PREFIX = "/api/v1"
 
-# Include all modular routers
-router.include_router(auth_router)
-router.include_router(users_router)
-router.include_router(subscription_router)
-router.include_router(feedback_router)
-router.include_router(admin_router)
-router.include_router(journey_router)
-router.include_router(dinner_router)
-router.include_router(countries_router)
+# All modular routers, mounted under API_PREFIX. Each include_router() call
+# rebuilds every route it copies, so they are included straight into the app
+# rather than through an intermediate /api/v1 router.
+routers = [
+    auth_router,
+    users_router,
+    subscription_router,
+    feedback_router,
+    admin_router,
+    journey_router,
+    dinner_router,
+    countries_router,
+]
+
+
+def include_api_routes(app: FastAPI):
+    for router in routers:
+        app.include_router(router, prefix=API_PREFIX)
@@ -21,6 +21,14 @@ class DinnerResponse(BaseModel):
     participant_ids: Optional[List[str]]
     venue: Optional[str]
     
+class DinnerAdminSummary(BaseModel):
+    id: str
+    date: datetime
+    city: str
+    country: str
+    matched: bool
+    opt_in_count: int = 0
+
 class DinnerGroupResponse(BaseModel):
     dinner_id: str
     participant_ids: List[str]
@@ -31,4 +39,39 @@ class DinnerGroupResponse(BaseModel):
     
 class UpdateDinnerResponse(BaseModel):
     id: str
-    venue_id:str
\ No newline at end of file
+    venue_id:str
+
+
+class BookingParticipant(BaseModel):
+    id: str
+    name: Optional[str] = ""
+    city: Optional[str] = ""
+    country: Optional[str] = ""
+    gender: Optional[str] = ""
+    profession: Optional[str] = ""
+    image_url: Optional[str] = None
+    identity_verified: bool = False
+
+
+class BookingVenue(BaseModel):
+    id: str
+    name: str
+    address: Optional[str] = ""
+    city: str
+    country: str
+    google_maps_url: Optional[str] = ""
+
+
+class BookingResponse(BaseModel):
+    id: str  # dinner group id
+    dinner_id: str
+    date: datetime
+    city: str
+    country: str
+    budget_category: Optional[str] = None
+    dietary_category: Optional[str] = None
+    match_score: Optional[float] = None
+    venue_id: Optional[str] = None
+    venue: Optional[BookingVenue] = None
+    participant_ids: List[str] = []
+    participant_details: List[BookingParticipant] = []
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, field_validator
 from app.constants.questionsEnum import QuestionKey
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 
 class SaveJourneyRequest(BaseModel):
@@ -25,3 +25,12 @@ class SaveJourneyRequest(BaseModel):
 class SubmitJourneyResponse(BaseModel):
     message: str
     scores: Dict[str, float]
+
+
+class SaveJourneyBatchRequest(BaseModel):
+    answers: List[SaveJourneyRequest] = Field(..., min_length=1, max_length=50)
+
+
+class SaveJourneyBatchResponse(BaseModel):
+    saved: int
+    scores: Optional[Dict[str, float]] = None
@@ -1,11 +1,17 @@
 # app/schemas/response.py
-from typing import Generic, TypeVar, Optional
+from typing import Generic, TypeVar, Optional, List
 from pydantic import BaseModel
-from pydantic.generics import GenericModel
 
 T = TypeVar("T")
 
-class SuccessResponse(GenericModel, Generic[T]):
+class SuccessResponse(BaseModel, Generic[T]):
     code: int = 200
     message: str = "Success"
     data: Optional[T] = None
+
+
+class PaginatedResponse(BaseModel, Generic[T]):
+    code: int = 200
+    message: str = "Success"
+    data: List[T] = []
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
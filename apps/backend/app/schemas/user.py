@@ -8,20 +8,21 @@ class PersonalityAnswer(BaseModel):
     answer: str
 
 class MeResponse(BaseModel):
+    # Defaults mirror app.models.user.User, as this is also its projection for /users/me
     email: EmailStr
-    name: Optional[str]
-    mobile: Optional[str]
-    city: Optional[str]
-    country: Optional[str]
-    dob: Optional[date]
-    gender: Optional[str]
-    relationship_status: Optional[str]
-    children: Optional[bool]
-    profession: Optional[str]
-    personality_answers: Optional[List[PersonalityAnswer]]
-    personality_scores: Optional[Dict[str, float]]
-    identity_verified: bool
-    subscription_status: str
-    image_url: Optional[str]
-    current_country: Optional[str] 
-    current_city: Optional[str]
+    name: Optional[str] = ""
+    mobile: Optional[str] = ""
+    city: Optional[str] = ""
+    country: Optional[str] = ""
+    dob: Optional[date] = None
+    gender: Optional[str] = ""
+    relationship_status: Optional[str] = ""
+    children: Optional[bool] = False
+    profession: Optional[str] = ""
+    personality_answers: Optional[List[PersonalityAnswer]] = None
+    personality_scores: Optional[Dict[str, float]] = None
+    identity_verified: bool = False
+    subscription_status: str = "none"
+    image_url: Optional[str] = None
+    current_country: Optional[str] = ""
+    current_city: Optional[str] = ""
@@ -9,6 +9,9 @@ class CreateVenueRequest(BaseModel):
     address: str
     city: str
     country: str
+    max_group_size: int = 6
+    capacity: int = 1
+    budget_category: Optional[str] = None
 
 
 class UpdateVenueRequest(BaseModel):
@@ -17,6 +20,9 @@ class UpdateVenueRequest(BaseModel):
     city: Optional[str]
     country: Optional[str]
     is_active: Optional[bool]
+    max_group_size: Optional[int] = None
+    capacity: Optional[int] = None
+    budget_category: Optional[str] = None
 
 
 class VenueResponse(BaseModel):
@@ -26,3 +32,6 @@ class VenueResponse(BaseModel):
     city: str
     country: str
     is_active: bool
+    max_group_size: int = 6
+    capacity: int = 1
+    budget_category: Optional[str] = None
@@ -0,0 +1,112 @@
+"""
+Recompute personality_scores for every user from their stored answers.
+
+Users are read in _id order, one batch at a time, and scored in one pass
+per batch with compute_personality_scores_batch. Only changed scores are
+written, with an unordered bulk_write. After each batch, the last _id is
+saved in the backfill_checkpoints collection. An interrupted run resumes
+from there, and a finished run can be re-run with --restart after a
+scoring change. --ops-per-second caps the write rate so the job can run
+alongside live traffic.
+
+    python -m app.scripts.backfill_personality_scores [--batch-size 1000] [--ops-per-second 500] [--restart] [--dry-run]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+from app.db.init import init_db
+from app.models.user import User
+from app.services.matchmaking.v1 import compute_personality_scores_batch
+
+JOB_NAME = "personality_scores"
+CHECKPOINTS = "backfill_checkpoints"
+
+
+class Throttle:
+    """Sleeps just enough to keep the average rate at or under ops_per_second."""
+
+    def __init__(self, ops_per_second: float):
+        self.ops_per_second = ops_per_second
+        self.started = time.monotonic()
+        self.ops = 0
+
+    async def wait(self, ops: int):
+        self.ops += ops
+        if self.ops_per_second <= 0:
+            return
+        ahead = self.ops / self.ops_per_second - (time.monotonic() - self.started)
+        if ahead > 0:
+            await asyncio.sleep(ahead)
+
+
+async def backfill(batch_size: int, ops_per_second: float, restart: bool, dry_run: bool):
+    await init_db()
+    users = User.get_motor_collection()
+    checkpoints = users.database[CHECKPOINTS]
+    now = datetime.now(timezone.utc)
+
+    checkpoint = None if restart else await checkpoints.find_one({"_id": JOB_NAME})
+    if checkpoint and checkpoint.get("completed_at"):
+        print(f"✅ Already completed at {checkpoint['completed_at']}; use --restart to run again")
+        return
+    if not checkpoint:
+        checkpoint = {"_id": JOB_NAME, "last_id": None, "scanned": 0, "updated": 0, "started_at": now}
+    else:
+        print(f"⏩ Resuming after {checkpoint['last_id']} ({checkpoint['scanned']} users scanned)")
+
+    throttle = Throttle(ops_per_second)
+    while True:
+        query = {"_id": {"$gt": checkpoint["last_id"]}} if checkpoint["last_id"] else {}
+        # A fresh range query per batch instead of one long-lived cursor, so
+        # throttling pauses can never outlive the server's cursor timeout
+        batch = await (
+            users.find(query, {"personality_answers": 1, "personality_scores": 1})
+            .sort("_id", 1)
+            .limit(batch_size)
+            .to_list(length=batch_size)
+        )
+        if not batch:
+            break
+
+        scores = compute_personality_scores_batch([doc.get("personality_answers") for doc in batch])
+        writes = [
+            UpdateOne({"_id": doc["_id"]}, {"$set": {"personality_scores": new}})
+            for doc, new in zip(batch, scores)
+            if new is not None and new != doc.get("personality_scores")
+        ]
+        if writes and not dry_run:
+            await users.bulk_write(writes, ordered=False)
+
+        checkpoint["last_id"] = batch[-1]["_id"]
+        checkpoint["scanned"] += len(batch)
+        checkpoint["updated"] += len(writes)
+        if not dry_run:
+            checkpoint["updated_at"] = datetime.now(timezone.utc)
+            await checkpoints.replace_one({"_id": JOB_NAME}, checkpoint, upsert=True)
+        print(f"   … {checkpoint['scanned']} scanned, {checkpoint['updated']} updated")
+
+        await throttle.wait(len(writes))
+
+    if not dry_run:
+        await checkpoints.update_one(
+            {"_id": JOB_NAME}, {"$set": {"completed_at": datetime.now(timezone.utc)}}, upsert=True
+        )
+    verb = "would update" if dry_run else "updated"
+    print(f"🎉 Backfill complete: {checkpoint['scanned']} users scanned, {checkpoint['updated']} {verb}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--ops-per-second", type=float, default=500,
+        help="Maximum average user updates per second (0 disables throttling)",
+    )
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint and start over")
+    parser.add_argument("--dry-run", action="store_true", help="Count the changes without writing anything")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size, args.ops_per_second, args.restart, args.dry_run))
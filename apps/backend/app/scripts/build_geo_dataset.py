@@ -0,0 +1,62 @@
+"""
+Rebuild the bundled country/city dataset used by the /geo endpoints.
+
+Source is GeoNames (CC BY 4.0) via the geonamescache package, which is a
+build-time tool only and not part of requirements.txt:
+
+    pip install geonamescache
+    python -m app.scripts.build_geo_dataset --version 2 --min-population 15000
+
+Bump --version whenever the data changes; GEO_DATASET_VERSION in settings
+selects which file the API loads.
+"""
+import argparse
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+
+from app.services.geo import dataset_path
+
+
+def build(version: str, min_population: int) -> str:
+    try:
+        import geonamescache
+    except ImportError:
+        raise SystemExit("geonamescache is required to build the dataset: pip install geonamescache")
+
+    gc = geonamescache.GeonamesCache(min_city_population=min_population)
+    countries = gc.get_countries()
+    cities_by_country = {country["name"]: set() for country in countries.values()}
+    for city in gc.get_cities().values():
+        country = countries.get(city["countrycode"])
+        if country:
+            cities_by_country[country["name"]].add(city["name"])
+
+    dataset = {
+        "version": version,
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        "source": f"GeoNames via geonamescache {getattr(geonamescache, '__version__', '')}".strip(),
+        "license": "CC BY 4.0, https://www.geonames.org",
+        "min_city_population": min_population,
+        "countries": {
+            name: sorted(cities) for name, cities in sorted(cities_by_country.items())
+        },
+    }
+
+    path = dataset_path(version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    raw = json.dumps(dataset, ensure_ascii=False, separators=(",", ":")).encode()
+    # mtime=0 keeps the output byte-identical across rebuilds of the same data
+    with open(path, "wb") as f:
+        f.write(gzip.compress(raw, mtime=0))
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the bundled geo dataset")
+    parser.add_argument("--version", required=True)
+    parser.add_argument("--min-population", type=int, default=15000)
+    args = parser.parse_args()
+    path = build(args.version, args.min_population)
+    print(f"✅ Wrote {path}")
@@ -0,0 +1,110 @@
+"""
+Fail when importing the API gets slower than the budget.
+
+Imports app.main in fresh interpreters and takes the best of --runs, so one
+noisy run does not fail the check. Each run first imports the frameworks the
+app is built on (FRAMEWORK_MODULES) and then app.main, so the report splits
+the total into the framework floor and the app's own share. The floor is
+mostly FastAPI itself: fastapi.params pulls in fastapi.openapi.models, whose
+pydantic models take roughly half of it to build, and nothing the app does
+can defer that. The app's share is what this check guards:
+
+- the total must stay under --budget-seconds. Measured totals are 1.4-1.6s
+  (0.9-1.1s frameworks + 0.4-0.5s app, mostly building the pydantic models
+  and routes), so the default leaves headroom above that rather than
+  promising a sub-second start the frameworks alone nearly use up;
+- the app's share must stay under --max-app-share of the floor, which holds
+  on slow and fast hardware alike;
+- an SDK that is meant to load lazily (see app/core/clients.py) must not be
+  imported at module level again.
+
+    python -m app.scripts.check_import_time [--budget-seconds 2.0] [--max-app-share 0.6] [--runs 3]
+
+tests/test_import_time.py runs the same checks.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, NamedTuple
+
+# Loaded on first use or during warm-up, never while importing the app
+LAZY_MODULES = ("stripe", "boto3", "botocore", "httpx", "requests")
+
+# Third-party imports every worker needs; their cost is the floor for app.main
+FRAMEWORK_MODULES = (
+    "fastapi", "fastapi.security", "beanie", "motor.motor_asyncio",
+    "pydantic_settings", "email_validator", "orjson", "jwt",
+)
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_BUDGET_SECONDS = 2.0
+DEFAULT_MAX_APP_SHARE = 0.6
+
+_PROBE = f"""
+import importlib, sys, time
+started = time.perf_counter()
+for name in {FRAMEWORK_MODULES!r}:
+    importlib.import_module(name)
+framework = time.perf_counter() - started
+started = time.perf_counter()
+import app.main
+app = time.perf_counter() - started
+print(framework, app, ",".join(m for m in {LAZY_MODULES!r} if m in sys.modules))
+"""
+
+
+class ImportTiming(NamedTuple):
+    framework: float
+    app: float
+    eager: List[str]
+
+    @property
+    def total(self) -> float:
+        return self.framework + self.app
+
+
+def measure() -> ImportTiming:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE], check=True, capture_output=True, text=True, cwd=BACKEND_ROOT
+    ).stdout.strip().splitlines()[-1]
+    framework, app, eager = (output.split(" ") + [""])[:3]
+    return ImportTiming(float(framework), float(app), [name for name in eager.split(",") if name])
+
+
+def best_of(runs: int) -> ImportTiming:
+    timings = [measure() for _ in range(runs)]
+    eager = sorted({name for timing in timings for name in timing.eager})
+    return ImportTiming(
+        framework=min(timing.framework for timing in timings),
+        app=min(timing.app for timing in timings),
+        eager=eager,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-seconds", type=float, default=DEFAULT_BUDGET_SECONDS)
+    parser.add_argument("--max-app-share", type=float, default=DEFAULT_MAX_APP_SHARE)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    timing = best_of(args.runs)
+    print(
+        f"⏱️ import app.main: {timing.total:.3f}s = {timing.framework:.3f}s frameworks "
+        f"+ {timing.app:.3f}s app (best of {args.runs}, budget {args.budget_seconds:.3f}s)"
+    )
+    failed = False
+    if timing.total > args.budget_seconds:
+        print(f"❌ Over budget by {timing.total - args.budget_seconds:.3f}s; profile with: python -X importtime -c 'import app.main'")
+        failed = True
+    if timing.app > timing.framework * args.max_app_share:
+        print(f"❌ The app's own imports cost {timing.app / timing.framework:.0%} of the frameworks' (max {args.max_app_share:.0%})")
+        failed = True
+    if timing.eager:
+        print(f"❌ Imported at startup but meant to load lazily: {', '.join(timing.eager)}")
+        failed = True
+    if not failed:
+        print("✅ Within budget")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,316 @@
+"""
+Generate production-sized synthetic data: users with correlated personality
+answers, weekly dinners per city, opt-ins, matched groups for past dinners,
+venues, subscriptions and sessions.
+
+Documents are built as plain dicts and written with insert_many in large
+unordered batches. The same --seed and --now produce the same documents,
+ids included (they are drawn from the seeded generator); only the session
+tokens differ, as they are signed against the real clock. --scale
+1.0 is one million users; per-dinner opt-ins grow with it, reaching the
+low thousands in the biggest cities.
+
+    python -m app.scripts.generate_synthetic_data --database bichance_scale [--scale 0.01] [--seed 42] [--now 2025-01-04T12:00:00+00:00] [--drop]
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Sequence, Tuple
+
+from beanie import PydanticObjectId
+from faker import Faker
+
+from app.core.config import settings
+from app.db.init import init_db
+from app.models.dinner import Dinner, DinnerGroup
+from app.models.dinner_opt_in import DinnerOptIn
+from app.models.session import Session
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.models.venue import Venue
+from app.scripts.seed_test_users import questions
+from app.services.matchmaking.v1 import QUESTION_TRAIT_MAP, compute_personality_scores
+from app.utils.jwt import create_tokens
+
+USERS_AT_SCALE_1 = 1_000_000
+
+# (city, country, share of users)
+CITIES = [
+    ("Bengaluru", "India", 0.16),
+    ("Mumbai", "India", 0.16),
+    ("Gurugram", "India", 0.14),
+    ("Delhi", "India", 0.14),
+    ("Pune", "India", 0.08),
+    ("Hyderabad", "India", 0.08),
+    ("Chennai", "India", 0.06),
+    ("Dubai", "United Arab Emirates", 0.08),
+    ("London", "United Kingdom", 0.05),
+    ("Singapore", "Singapore", 0.05),
+]
+BUDGETS = (["low", "medium", "high"], [0.35, 0.45, 0.20])
+DIETS = (["non-veg", "veg", "vegan"], [0.55, 0.38, 0.07])
+GENDERS = (["Male", "Female", "Other"], [0.49, 0.49, 0.02])
+RELATIONSHIPS = ["Single", "In a relationship", "Married", "Complicated"]
+PROFESSIONS = [
+    "Software Engineer", "Designer", "Doctor", "Entrepreneur", "Marketer",
+    "Consultant", "Teacher", "Lawyer", "Product Manager", "Finance",
+]
+
+WEEKS_PAST = 26
+WEEKS_AHEAD = 4
+OPT_IN_RATE = 0.02  # share of a city's users opting into each of its dinners
+SUBSCRIBED_SHARE = 0.4
+SESSION_SHARE = 0.3
+VENUES_PER_CITY = 25
+GROUP_SIZE = 6
+
+# compute_personality_scores only reads .trait and .answer
+_Answer = namedtuple("_Answer", "trait question answer")
+
+
+class Batcher:
+    """Buffers documents and writes them with unordered insert_many."""
+
+    def __init__(self, model, batch_size: int):
+        self.collection = model.get_motor_collection()
+        self.name = model.get_collection_name()
+        self.batch_size = batch_size
+        self.buffer: List[Dict[str, Any]] = []
+        self.written = 0
+
+    async def add(self, doc: Dict[str, Any]):
+        self.buffer.append(doc)
+        if len(self.buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        if self.buffer:
+            await self.collection.insert_many(self.buffer, ordered=False)
+            self.written += len(self.buffer)
+            self.buffer = []
+
+
+def _object_id(rng: random.Random) -> PydanticObjectId:
+    # PydanticObjectId() would embed the wall clock and the process
+    return PydanticObjectId(rng.randbytes(12))
+
+
+def _weighted(rng: random.Random, choices: Tuple[Sequence[str], Sequence[float]]) -> str:
+    return rng.choices(choices[0], weights=choices[1])[0]
+
+
+def _personality(rng: random.Random) -> Tuple[List[Dict[str, str]], Dict[str, float]]:
+    # One latent level per trait, so answers to the same trait agree with each other
+    levels = {trait: rng.betavariate(2, 2) for trait in "OCEAN"}
+    answers = [
+        _Answer(trait, questions[i], "Yes" if rng.random() < levels[trait] else "No")
+        for i, trait in sorted(QUESTION_TRAIT_MAP.items())
+    ]
+    return [a._asdict() for a in answers], compute_personality_scores(answers)
+
+
+async def generate_users(
+    rng: random.Random, fake: Faker, count: int, batch_size: int, now: datetime
+) -> Dict[int, List[PydanticObjectId]]:
+    """Insert users, subscriptions and sessions; returns user ids per city index."""
+    users = Batcher(User, batch_size)
+    subscriptions = Batcher(Subscription, batch_size)
+    sessions = Batcher(Session, batch_size)
+    by_city: Dict[int, List[PydanticObjectId]] = defaultdict(list)
+    city_weights = [share for _, _, share in CITIES]
+
+    for i in range(count):
+        city_index = rng.choices(range(len(CITIES)), weights=city_weights)[0]
+        city, country, _ = CITIES[city_index]
+        user_id = _object_id(rng)
+        email = f"synthetic.{i}@example.com"
+        answers, scores = _personality(rng)
+        subscribed = rng.random() < SUBSCRIBED_SHARE
+        end_date = now + timedelta(days=rng.randint(1, 30)) if subscribed else None
+        # Faker's date_of_birth counts back from today, not from `now`
+        birth = now - timedelta(days=rng.randint(21 * 365, 55 * 365))
+
+        await users.add({
+            "_id": user_id,
+            "email": email,
+            "name": fake.name(),
+            "mobile": fake.msisdn()[:10],
+            "city": city,
+            "country": country,
+            "dob": datetime(birth.year, birth.month, birth.day),
+            "gender": _weighted(rng, GENDERS),
+            "relationship_status": rng.choice(RELATIONSHIPS),
+            "children": rng.random() < 0.25,
+            "profession": rng.choice(PROFESSIONS),
+            "personality_answers": answers,
+            "personality_scores": scores,
+            "identity_verified": rng.random() < 0.6,
+            "subscription_status": "active" if subscribed else "none",
+            "subscription_end_date": end_date,
+            "image_url": None,
+            "current_city": city,
+            "current_country": country,
+            "stripe_customer_id": f"cus_synthetic_{i}" if subscribed else None,
+        })
+        by_city[city_index].append(user_id)
+
+        if subscribed:
+            await subscriptions.add({
+                "_id": _object_id(rng),
+                "user_email": email,
+                "stripe_customer_id": f"cus_synthetic_{i}",
+                "stripe_subscription_id": f"sub_synthetic_{i}",
+                "status": "active",
+                "start_date": end_date - timedelta(days=30),
+                "end_date": end_date,
+            })
+        if rng.random() < SESSION_SHARE:
+            access_token, refresh_token = create_tokens(email)
+            await sessions.add({
+                "_id": _object_id(rng),
+                "session_id": f"synthetic-{i}",
+                "email": email,
+                "access_token": access_token,
+                "refresh_token": refresh_token,
+                "created_at": now,
+                "expires_at": now + timedelta(days=7),
+                "user_agent": fake.user_agent(),
+                "ip_address": fake.ipv4_public(),
+                "is_active": True,
+                "type": "user",
+            })
+
+        if (i + 1) % (batch_size * 10) == 0:
+            print(f"   … {i + 1} users")
+
+    for batcher in (users, subscriptions, sessions):
+        await batcher.flush()
+        print(f"✅ {batcher.name}: {batcher.written}")
+    return by_city
+
+
+async def generate_venues(rng: random.Random, fake: Faker) -> Dict[int, List[PydanticObjectId]]:
+    venues = Batcher(Venue, 1000)
+    by_city: Dict[int, List[PydanticObjectId]] = defaultdict(list)
+    for city_index, (city, country, _) in enumerate(CITIES):
+        for _ in range(VENUES_PER_CITY):
+            venue_id = _object_id(rng)
+            await venues.add({
+                "_id": venue_id,
+                "name": fake.company(),
+                "address": fake.street_address(),
+                "city": city,
+                "country": country,
+                "google_maps_url": "",
+                "contact_number": fake.msisdn()[:10],
+                "is_active": rng.random() < 0.95,
+                "max_group_size": rng.choice([6, 6, 8]),
+                "capacity": rng.randint(1, 4),
+                "budget_category": _weighted(rng, BUDGETS),
+            })
+            by_city[city_index].append(venue_id)
+    await venues.flush()
+    print(f"✅ {venues.name}: {venues.written}")
+    return by_city
+
+
+async def generate_dinners(
+    rng: random.Random,
+    users_by_city: Dict[int, List[PydanticObjectId]],
+    venues_by_city: Dict[int, List[PydanticObjectId]],
+    batch_size: int,
+    now: datetime,
+):
+    dinners = Batcher(Dinner, 1000)
+    opt_ins = Batcher(DinnerOptIn, batch_size)
+    groups = Batcher(DinnerGroup, batch_size)
+    # Dinners are on Saturdays at 20:00 UTC
+    saturday = (now + timedelta(days=(5 - now.weekday()) % 7)).replace(hour=20, minute=0, second=0, microsecond=0)
+
+    for city_index, (city, country, _) in enumerate(CITIES):
+        city_users = users_by_city.get(city_index, [])
+        for week in range(-WEEKS_PAST, WEEKS_AHEAD):
+            dinner_id = _object_id(rng)
+            date = saturday + timedelta(weeks=week)
+            past = date < now
+            await dinners.add({
+                "_id": dinner_id, "date": date, "city": city, "country": country,
+                "opted_in_users": [], "matched": past,
+            })
+
+            size = min(len(city_users), int(len(city_users) * OPT_IN_RATE * rng.uniform(0.5, 1.5)))
+            buckets: Dict[Tuple[str, str], List[PydanticObjectId]] = defaultdict(list)
+            for user_id in rng.sample(city_users, size):
+                budget, diet = _weighted(rng, BUDGETS), _weighted(rng, DIETS)
+                await opt_ins.add({
+                    "_id": _object_id(rng),
+                    "dinner_id": dinner_id, "user_id": user_id,
+                    "budget_category": budget, "dietary_category": diet,
+                    "created_at": date - timedelta(days=rng.randint(3, 20)),
+                })
+                buckets[(budget, diet)].append(user_id)
+
+            if not past:
+                continue
+            for (budget, diet), members in buckets.items():
+                for start in range(0, len(members) - GROUP_SIZE + 1, GROUP_SIZE):
+                    venues = venues_by_city[city_index]
+                    await groups.add({
+                        "_id": _object_id(rng),
+                        "dinner_id": dinner_id,
+                        "participant_ids": members[start:start + GROUP_SIZE],
+                        "budget_category": budget,
+                        "dietary_category": diet,
+                        "venue_id": rng.choice(venues) if rng.random() < 0.85 else None,
+                        "match_score": round(rng.uniform(0.6, 0.95), 4),
+                    })
+
+    for batcher in (dinners, opt_ins, groups):
+        await batcher.flush()
+        print(f"✅ {batcher.name}: {batcher.written}")
+
+
+async def generate(database: str, scale: float, seed: int, now: datetime, batch_size: int, drop: bool):
+    await init_db(database_name=database, sync_indexes=True)
+    if drop:
+        db = User.get_motor_collection().database
+        for model in (User, Subscription, Session, Venue, Dinner, DinnerOptIn, DinnerGroup):
+            await db[model.get_collection_name()].delete_many({})
+        print("🧹 Emptied existing collections")
+
+    rng = random.Random(seed)
+    Faker.seed(seed)
+    fake = Faker(["en_IN", "en_GB", "en_US"])
+    count = max(1, int(USERS_AT_SCALE_1 * scale))
+
+    started = time.perf_counter()
+    print(f"🚀 Generating {count} users into {database!r} (seed {seed})")
+    users_by_city = await generate_users(rng, fake, count, batch_size, now)
+    venues_by_city = await generate_venues(rng, fake)
+    await generate_dinners(rng, users_by_city, venues_by_city, batch_size, now)
+    print(f"🎉 Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database", required=True, help="Target database (not the application's own)")
+    parser.add_argument("--scale", type=float, default=1.0, help=f"1.0 = {USERS_AT_SCALE_1:,} users")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--now",
+        type=datetime.fromisoformat,
+        default=datetime.now(timezone.utc),
+        help="Reference time for dinner dates, subscriptions and sessions (ISO 8601, with offset)",
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--drop", action="store_true", help="Empty the generated collections first")
+    args = parser.parse_args()
+
+    if args.database == settings.DATABASE_NAME:
+        parser.error(f"refusing to write synthetic data into the application database {args.database!r}")
+    if args.now.tzinfo is None:
+        parser.error("--now needs a UTC offset, e.g. 2025-01-04T12:00:00+00:00")
+    asyncio.run(generate(args.database, args.scale, args.seed, args.now, args.batch_size, args.drop))
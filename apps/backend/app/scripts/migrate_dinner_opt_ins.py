@@ -0,0 +1,70 @@
+"""
+Copy the legacy embedded Dinner.opted_in_users arrays into the
+dinner_opt_ins collection.
+
+Safe to re-run: rows that already exist are skipped by the unique
+(dinner_id, user_id) index.
+
+    python -m app.scripts.migrate_dinner_opt_ins [--drop-embedded]
+"""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+
+from pymongo.errors import BulkWriteError
+
+from app.db.init import init_db
+from app.models.dinner import Dinner
+from app.models.dinner_opt_in import DinnerOptIn
+
+DUPLICATE_KEY = 11000
+
+
+async def migrate(drop_embedded: bool):
+    # The unique (dinner_id, user_id) index has to exist for re-runs to be safe
+    await init_db(sync_indexes=True)
+    dinners = Dinner.get_motor_collection()
+    opt_ins = DinnerOptIn.get_motor_collection()
+
+    copied = 0
+    cursor = dinners.find(
+        {"opted_in_users.0": {"$exists": True}},
+        {"opted_in_users": 1},
+    )
+    async for dinner in cursor:
+        now = datetime.now(timezone.utc)
+        docs = [
+            {
+                "dinner_id": dinner["_id"],
+                "user_id": entry["user_id"],
+                "budget_category": entry.get("budget_category"),
+                "dietary_category": entry.get("dietary_category"),
+                "created_at": now,
+            }
+            for entry in dinner["opted_in_users"]
+        ]
+        try:
+            result = await opt_ins.insert_many(docs, ordered=False)
+            copied += len(result.inserted_ids)
+        except BulkWriteError as e:
+            if any(err["code"] != DUPLICATE_KEY for err in e.details["writeErrors"]):
+                raise
+            copied += e.details["nInserted"]
+
+        if drop_embedded:
+            await dinners.update_one({"_id": dinner["_id"]}, {"$set": {"opted_in_users": []}})
+
+        print(f"✅ Dinner {dinner['_id']}: {len(docs)} opt-ins")
+
+    print(f"🎉 Migration complete, {copied} opt-ins copied")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--drop-embedded",
+        action="store_true",
+        help="Empty Dinner.opted_in_users once its entries are copied",
+    )
+    args = parser.parse_args()
+    asyncio.run(migrate(args.drop_embedded))
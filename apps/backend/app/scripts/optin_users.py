@@ -1,9 +1,9 @@
 import asyncio
 import random
-from beanie import PydanticObjectId
 from app.db.init import init_db
 from app.models.user import User
-from app.models.dinner import Dinner, DinnerOptInUser
+from app.models.dinner import Dinner
+from app.models.dinner_opt_in import DinnerOptIn
 
 budget_options = ["low", "medium", "high"]
 dietary_options = ["veg", "halal", "jain", "vegan"]
@@ -18,17 +18,22 @@ async def opt_in_users_to_dinner():
 
     users = await User.find(User.current_city == "Gurugram", User.current_country == "India").to_list()
 
-    dinner.opted_in_users = []
+    await DinnerOptIn.find(DinnerOptIn.dinner_id == dinner.id).delete()
 
-    for user in users[:20]:
-        dinner.opted_in_users.append(DinnerOptInUser(
+    opt_ins = [
+        DinnerOptIn(
+            dinner_id=dinner.id,
             user_id=user.id,
             budget_category=random.choice(budget_options),
             dietary_category=random.choice(dietary_options)
-        ))
+        )
+        for user in users[:20]
+    ]
+    if opt_ins:
+        await DinnerOptIn.insert_many(opt_ins)
+    for user in users[:20]:
         print(f"✅ Opted in {user.email}")
 
-    await dinner.save()
     print("🎉 Opt-in complete!")
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+"""
+Create the indexes declared on every document model.
+
+app/launcher.py does this before starting its children; run it as a deploy
+step instead when the launcher is started with --skip-index-sync, and before
+running the API, consumers or crons without the launcher, since they do not
+create indexes on startup. Existing indexes are left alone, apart from the
+ones listed in RETIRED_INDEXES (app/db/init.py), which are dropped.
+
+    python -m app.scripts.sync_indexes
+"""
+import argparse
+import asyncio
+
+from app.db.init import DOCUMENT_MODELS, init_db
+
+
+async def sync():
+    await init_db(sync_indexes=True)
+    for model in DOCUMENT_MODELS:
+        indexes = await model.get_motor_collection().index_information()
+        print(f"✅ {model.get_collection_name()}: {', '.join(sorted(indexes))}")
+    print("🎉 Indexes in sync")
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__.strip().splitlines()[0]).parse_args()
+    asyncio.run(sync())
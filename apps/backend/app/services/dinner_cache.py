@@ -0,0 +1,52 @@
+# app/services/dinner_cache.py
+
+from datetime import datetime, timezone, timedelta
+from typing import List
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.dinner import Dinner, DinnerPublicResponse, DinnerSummary
+from app.schemas.response import SuccessResponse
+
+# Dinners are only listed once they are at least this far away
+UPCOMING_CUTOFF = timedelta(hours=48)
+UPCOMING_LIMIT = 3
+
+# (city, country) -> serialized SuccessResponse body
+upcoming_dinners_cache: TTLCache[bytes] = TTLCache(
+    ttl_seconds=settings.UPCOMING_DINNERS_CACHE_TTL_SECONDS,
+    maxsize=settings.UPCOMING_DINNERS_CACHE_MAXSIZE,
+)
+
+
+async def _load_upcoming_dinners(city: str, country: str) -> bytes:
+    cutoff_datetime = datetime.now(timezone.utc) + UPCOMING_CUTOFF
+    # Read from the primary: this runs right after create_dinner invalidates the
+    # entry, and a lagging secondary would cache the stale list for a full TTL.
+    # The cache already keeps the load off the primary
+    dinners = await Dinner.find(
+        Dinner.city == city,
+        Dinner.country == country,
+        Dinner.date >= cutoff_datetime,
+        projection_model=DinnerSummary,
+    ).sort(+Dinner.date).limit(UPCOMING_LIMIT).to_list()
+
+    response = SuccessResponse[List[DinnerPublicResponse]](
+        message="Upcoming dinners fetched",
+        data=[
+            DinnerPublicResponse(id=d.id, date=d.date, city=d.city, country=d.country)
+            for d in dinners
+        ],
+    )
+    return response.model_dump_json().encode()
+
+
+async def get_upcoming_dinners_body(city: str, country: str) -> bytes:
+    """Pre-serialized /dinner/upcoming response for a city, cached per (city, country)."""
+    return await upcoming_dinners_cache.get_or_load(
+        (city, country), lambda: _load_upcoming_dinners(city, country)
+    )
+
+
+def invalidate_upcoming_dinners(city: str, country: str):
+    upcoming_dinners_cache.invalidate((city, country))
@@ -89,3 +89,16 @@ def send_subscription_email(to_email: str, status: str):
         server.starttls()
         server.login(settings.EMAIL_SENDER, settings.EMAIL_PASSWORD)
         server.send_message(message)
+
+
+def send_email_raw(to_email: str, subject: str, body: str):
+    message = MIMEText(body, "plain")
+    message["Subject"] = subject
+    message["From"] = settings.EMAIL_SENDER
+    message["To"] = to_email
+
+    with SMTP(settings.SMTP_SERVER, int(settings.SMTP_PORT)) as server:
+        server.starttls()
+        server.login(settings.EMAIL_SENDER, settings.EMAIL_PASSWORD)
+        server.send_message(message)
+    logger.info(f"✅ Email '{subject}' sent to {to_email}")
@@ -0,0 +1,126 @@
+# app/services/geo.py
+"""
+In-memory country/city index backed by the bundled dataset in app/data/geo.
+
+Names are matched on a normalized key (case-folded, accents stripped), so
+"sao" finds "São Paulo". Prefix lookups bisect a sorted key array.
+
+Loading the dataset (gunzip, JSON parse, index build) takes a few hundred
+milliseconds, so the API loads it on a worker thread after startup (see
+warm_up_geo_index) and request handlers go through geo_index(), which never
+parses on the event loop.
+"""
+
+import gzip
+import json
+import os
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.executors import run_blocking
+from app.core.logger import logger
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "geo")
+
+
+def dataset_path(version: str) -> str:
+    return os.path.join(DATA_DIR, f"countries_cities.v{version}.json.gz")
+
+
+def normalize(name: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", name.strip().casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _prefix_range(keys: Sequence[str], prefix: str, limit: int) -> range:
+    start = bisect_left(keys, prefix)
+    end = start
+    while end < len(keys) and end - start < limit and keys[end].startswith(prefix):
+        end += 1
+    return range(start, end)
+
+
+class GeoIndex:
+    def __init__(self, version: str, countries: Dict[str, List[str]]):
+        self.version = version
+        self.countries: Tuple[str, ...] = tuple(sorted(countries))
+        self._cities: Dict[str, Tuple[str, ...]] = {
+            country: tuple(cities) for country, cities in countries.items()
+        }
+
+        self._country_by_key: Dict[str, str] = {normalize(c): c for c in self.countries}
+        country_entries = sorted(self._country_by_key.items())
+        self._country_keys = [key for key, _ in country_entries]
+        self._country_names = [name for _, name in country_entries]
+
+        city_entries = sorted(
+            (normalize(city), city, country)
+            for country, cities in self._cities.items()
+            for city in cities
+        )
+        self._city_keys = [key for key, _, _ in city_entries]
+        self._city_entries = [(city, country) for _, city, country in city_entries]
+
+        # Per-country key arrays so country-scoped lookups bisect a small list
+        self._country_city_keys: Dict[str, Tuple[List[str], List[str]]] = {}
+        for key, city, country in city_entries:
+            keys, names = self._country_city_keys.setdefault(country, ([], []))
+            keys.append(key)
+            names.append(city)
+
+    def resolve_country(self, name: str) -> Optional[str]:
+        return self._country_by_key.get(normalize(name))
+
+    def cities(self, country: str) -> Optional[Tuple[str, ...]]:
+        resolved = self.resolve_country(country)
+        return self._cities[resolved] if resolved else None
+
+    def autocomplete_countries(self, prefix: str, limit: int = 10) -> List[str]:
+        return [self._country_names[i] for i in _prefix_range(self._country_keys, normalize(prefix), limit)]
+
+    def autocomplete_cities(
+        self, prefix: str, country: Optional[str] = None, limit: int = 10
+    ) -> List[Dict[str, str]]:
+        key = normalize(prefix)
+        if country is None:
+            return [
+                {"city": self._city_entries[i][0], "country": self._city_entries[i][1]}
+                for i in _prefix_range(self._city_keys, key, limit)
+            ]
+
+        resolved = self.resolve_country(country)
+        if not resolved or resolved not in self._country_city_keys:
+            return []
+        keys, names = self._country_city_keys[resolved]
+        return [{"city": names[i], "country": resolved} for i in _prefix_range(keys, key, limit)]
+
+
+def load_geo_index(version: str) -> GeoIndex:
+    with gzip.open(dataset_path(version), "rb") as f:
+        dataset = json.loads(f.read())
+    return GeoIndex(dataset["version"], dataset["countries"])
+
+
+@lru_cache(maxsize=1)
+def get_geo_index() -> GeoIndex:
+    return load_geo_index(settings.GEO_DATASET_VERSION)
+
+
+async def geo_index() -> GeoIndex:
+    """get_geo_index for callers on the event loop; a first load runs on the blocking pool."""
+    if get_geo_index.cache_info().currsize:
+        return get_geo_index()
+    return await run_blocking(get_geo_index)
+
+
+async def warm_up_geo_index():
+    try:
+        geo = await geo_index()
+    except Exception:
+        # Not fatal: the first geo request tries again
+        logger.exception("Loading the geo dataset failed")
+        return
+    logger.info("🌍 Geo dataset v%s loaded (%d countries)", geo.version, len(geo.countries))
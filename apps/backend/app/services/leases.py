@@ -0,0 +1,140 @@
+# app/services/leases.py
+"""
+Mongo-backed leases: named locks that expire unless renewed.
+
+acquire() takes a lease that is free or expired in one atomic upsert and
+bumps its token. The token only ever grows, so it doubles as a fencing
+token: a holder that stalled past its expiry still has the old, smaller
+token, and writes guarded on "token is still mine" or "token only moves
+forward" (see app/services/matchmaking/runner.py) turn its late writes
+into no-ops instead of trusting that it still holds the lease.
+
+A lease taken with disposable=True gives up that guarantee: it is deleted
+on release, and a holder that dies without releasing it leaves a document
+that Mongo's TTL monitor deletes one TTL after it expired. Use it for
+leases whose names are not reused, such as per-process ones.
+
+    async with hold_lease(f"matching:{dinner_id}", ttl_seconds=120) as lease:
+        ...  # lease.token fences the writes; lease.lost is set if renewal failed
+"""
+
+import asyncio
+import os
+import socket
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.logger import logger
+from app.models.lease import Lease
+
+
+class LeaseUnavailable(Exception):
+    """Another owner holds an unexpired lease."""
+
+
+@dataclass
+class LeaseHandle:
+    name: str
+    owner: str
+    token: int
+    expires_at: datetime
+    lost: bool = False
+    disposable: bool = False
+
+
+def _expiry(ttl_seconds: float, disposable: bool, now: datetime) -> dict:
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    fields = {"expires_at": expires_at}
+    if disposable:
+        fields["purge_at"] = expires_at + timedelta(seconds=ttl_seconds)
+    return fields
+
+
+def process_owner() -> str:
+    """Identifies this process as a lease owner."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def acquire(
+    name: str, ttl_seconds: float, owner: Optional[str] = None, disposable: bool = False
+) -> Optional[LeaseHandle]:
+    """Take the lease if it is free or expired. Returns None if someone else holds it."""
+    owner = owner or process_owner()
+    now = datetime.now(timezone.utc)
+    expiry = _expiry(ttl_seconds, disposable, now)
+    try:
+        doc = await Lease.get_motor_collection().find_one_and_update(
+            # A held lease fails the filter, the upsert then collides on the unique name
+            {"name": name, "expires_at": {"$lte": now}},
+            {
+                "$set": {"owner": owner, "acquired_at": now, **expiry},
+                "$inc": {"token": 1},
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        return None
+    return LeaseHandle(
+        name=name, owner=owner, token=doc["token"], expires_at=expiry["expires_at"], disposable=disposable
+    )
+
+
+async def renew(lease: LeaseHandle, ttl_seconds: float) -> bool:
+    """Extend a lease we still hold. False means it expired and may belong to someone else."""
+    now = datetime.now(timezone.utc)
+    expiry = _expiry(ttl_seconds, lease.disposable, now)
+    result = await Lease.get_motor_collection().update_one(
+        {"name": lease.name, "token": lease.token, "expires_at": {"$gt": now}},
+        {"$set": expiry},
+    )
+    if result.matched_count:
+        lease.expires_at = expiry["expires_at"]
+        return True
+    return False
+
+
+async def release(lease: LeaseHandle):
+    """Expire the lease now (delete it, if disposable), unless a newer holder already took it over."""
+    collection = Lease.get_motor_collection()
+    if lease.disposable:
+        await collection.delete_one({"name": lease.name, "token": lease.token})
+        return
+    await collection.update_one(
+        {"name": lease.name, "token": lease.token},
+        {"$set": {"owner": None, "expires_at": datetime.now(timezone.utc)}},
+    )
+
+
+async def _keep_renewed(lease: LeaseHandle, ttl_seconds: float):
+    while True:
+        await asyncio.sleep(ttl_seconds / 3)
+        try:
+            renewed = await renew(lease, ttl_seconds)
+        except Exception:
+            # A failed renewal is retried on the next tick; the lease outlives two misses
+            logger.exception("Renewing lease %s failed", lease.name)
+            continue
+        if not renewed:
+            logger.warning("Lease %s (token %d) was lost", lease.name, lease.token)
+            lease.lost = True
+            return
+
+
+@asynccontextmanager
+async def hold_lease(name: str, ttl_seconds: float, owner: Optional[str] = None) -> AsyncIterator[LeaseHandle]:
+    """Acquire, renew in the background every ttl/3 and release on exit. Raises LeaseUnavailable."""
+    lease = await acquire(name, ttl_seconds, owner)
+    if lease is None:
+        raise LeaseUnavailable(name)
+    renewer = asyncio.create_task(_keep_renewed(lease, ttl_seconds))
+    try:
+        yield lease
+    finally:
+        renewer.cancel()
+        await release(lease)
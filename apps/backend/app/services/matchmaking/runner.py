@@ -0,0 +1,181 @@
+# app/services/matchmaking/runner.py
+"""
+Match one dinner, safely against concurrent runs on any number of nodes.
+
+A run first takes the dinner's lease, then claims the dinner itself with the
+lease's fencing token: the claim only succeeds while the dinner is unmatched
+and no newer run has claimed it. Groups are written tagged with the token,
+and the dinner is only flipped to matched if it still carries that token.
+A run that stalled past its lease and was overtaken therefore cannot mark
+the dinner matched, and removes the groups it wrote; the winning run
+removes any groups left behind by runs that crashed before finishing.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from beanie.operators import In
+
+from app.core.config import settings
+from app.core.executors import run_blocking, run_cpu_bound
+from app.core.logger import logger
+from app.core.notifications.producer import queue_email_notifications
+from app.models.dinner import Dinner, DinnerGroup, DinnerSummary
+from app.models.dinner_opt_in import DinnerOptIn
+from app.models.user import MatchCandidate, User
+from app.services.leases import LeaseHandle, LeaseUnavailable, hold_lease
+from app.services.matchmaking.v1 import calculate_group_score, group_users_by_preferences, match_users_into_groups
+
+GROUP_SIZE = 6
+
+
+@dataclass
+class MatchingResult:
+    dinner_id: PydanticObjectId
+    # matched | skipped | busy | lost | already_matched | not_found | failed
+    status: str
+    groups_created: int = 0
+    ungrouped_users: int = 0
+    reason: Optional[str] = None
+
+
+def lease_name(dinner_id: PydanticObjectId) -> str:
+    return f"matching:{dinner_id}"
+
+
+def _build_groups(preference_groups: Dict) -> List[Tuple[str, str, List[MatchCandidate], float]]:
+    """CPU-bound part of a run: (budget, dietary, members, score) for every group formed."""
+    groups = []
+    for (budget, dietary), candidates in preference_groups.items():
+        if len(candidates) < GROUP_SIZE:
+            continue
+        for members in match_users_into_groups(candidates, group_size=GROUP_SIZE):
+            groups.append((budget, dietary, members, calculate_group_score(members)))
+    return groups
+
+
+async def _claim(dinner_id: PydanticObjectId, token: int) -> bool:
+    result = await Dinner.get_motor_collection().update_one(
+        {
+            "_id": dinner_id,
+            "matched": {"$ne": True},
+            "$or": [{"matching_token": None}, {"matching_token": {"$lt": token}}],
+        },
+        {"$set": {"matching_token": token}},
+    )
+    return result.matched_count == 1
+
+
+async def _back_off(dinner_id: PydanticObjectId, token: int):
+    next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=settings.MATCHMAKER_SKIP_BACKOFF_SECONDS)
+    await Dinner.get_motor_collection().update_one(
+        {"_id": dinner_id, "matching_token": token},
+        {"$set": {"next_attempt_at": next_attempt_at}},
+    )
+
+
+async def _load_candidates(dinner_id: PydanticObjectId) -> Dict[PydanticObjectId, Dict]:
+    opt_ins = await DinnerOptIn.find(DinnerOptIn.dinner_id == dinner_id).to_list()
+    users = await User.find(
+        In(User.id, [opt_in.user_id for opt_in in opt_ins]),
+        {"personality_answers.0": {"$exists": True}},
+        projection_model=MatchCandidate,
+    ).to_list()
+    users_by_id = {user.id: user for user in users}
+
+    user_map = {}
+    for opt_in in opt_ins:
+        user = users_by_id.get(opt_in.user_id)
+        if user and user.personality_scores:
+            user_map[user.id] = {
+                "user": user,
+                "budget_category": opt_in.budget_category,
+                "dietary_category": opt_in.dietary_category,
+            }
+    return user_map
+
+
+async def _notify(dinner: DinnerSummary, groups: List[Tuple[str, str, List[MatchCandidate], float]]):
+    date = dinner.date.strftime("%A, %d %B %Y")
+    time = dinner.date.strftime("%I:%M %p")
+    notifications = [
+        {
+            "to_email": user.email,
+            "template": "dinner_update",
+            "data": {"name": user.name or "there", "date": date, "time": time, "city": dinner.city},
+        }
+        for _, _, members, _ in groups
+        for user in members
+    ]
+    if notifications:
+        await run_blocking(queue_email_notifications, notifications)
+
+
+async def _run(dinner: DinnerSummary, lease: LeaseHandle) -> MatchingResult:
+    token = lease.token
+    if not await _claim(dinner.id, token):
+        return MatchingResult(dinner.id, "busy", reason="Claimed by a newer run or already matched")
+
+    user_map = await _load_candidates(dinner.id)
+    if len(user_map) < GROUP_SIZE:
+        await _back_off(dinner.id, token)
+        return MatchingResult(dinner.id, "skipped", reason=f"Only {len(user_map)} valid users")
+
+    groups = await run_cpu_bound(_build_groups, group_users_by_preferences(user_map))
+    if lease.lost:
+        return MatchingResult(dinner.id, "lost", reason="Lease expired before groups were written")
+
+    collection = DinnerGroup.get_motor_collection()
+    if groups:
+        await DinnerGroup.insert_many([
+            DinnerGroup(
+                dinner_id=dinner.id,
+                participant_ids=[user.id for user in members],
+                venue_id=None,
+                budget_category=budget,
+                dietary_category=dietary,
+                match_score=score,
+                matching_token=token,
+            )
+            for budget, dietary, members, score in groups
+        ])
+
+    finished = await Dinner.get_motor_collection().update_one(
+        {"_id": dinner.id, "matching_token": token, "matched": {"$ne": True}},
+        {"$set": {"matched": True}},
+    )
+    if not finished.matched_count:
+        await collection.delete_many({"dinner_id": dinner.id, "matching_token": token})
+        return MatchingResult(dinner.id, "lost", reason="Overtaken by a newer run")
+
+    # Leftovers of runs that wrote groups and then died before finishing
+    await collection.delete_many({"dinner_id": dinner.id, "matching_token": {"$ne": token}})
+
+    await _notify(dinner, groups)
+    grouped = sum(len(members) for _, _, members, _ in groups)
+    return MatchingResult(
+        dinner.id, "matched", groups_created=len(groups), ungrouped_users=len(user_map) - grouped
+    )
+
+
+async def match_dinner(dinner_id: PydanticObjectId, owner: Optional[str] = None) -> MatchingResult:
+    dinner = await Dinner.find_one(Dinner.id == dinner_id, projection_model=DinnerSummary)
+    if not dinner:
+        return MatchingResult(dinner_id, "not_found")
+    if dinner.matched:
+        return MatchingResult(dinner_id, "already_matched")
+
+    try:
+        async with hold_lease(lease_name(dinner_id), settings.MATCHING_LEASE_TTL_SECONDS, owner) as lease:
+            result = await _run(dinner, lease)
+    except LeaseUnavailable:
+        return MatchingResult(dinner_id, "busy", reason="Another run holds the lease")
+
+    logger.info(
+        "Matching %s: %s (%d groups, %d ungrouped)%s",
+        dinner_id, result.status, result.groups_created, result.ungrouped_users,
+        f" - {result.reason}" if result.reason else "",
+    )
+    return result
@@ -0,0 +1,113 @@
+# app/services/matchmaking/scheduler.py
+"""
+Spread dinner matching across every node that is running a scheduler.
+
+Each node advertises itself with a "matching-node:<owner>" lease that it
+renews on a heartbeat, so the set of live nodes is simply the set of
+unexpired node leases. Node leases are disposable (see app/services/leases.py):
+a stopped node deletes its lease and a crashed node's is purged, so restarts
+do not pile up documents for live_nodes() to scan. Dinners are assigned to nodes by rendezvous hashing
+over that set: every node computes the same owner for every dinner without
+talking to the others, and when a node joins or leaves only its share of
+dinners moves. A node works through its own dinners first and then the
+rest (work stealing), so dinners owned by a node that died between
+heartbeats still get matched. The per-dinner lease in runner.py is what
+actually prevents double matching; the hashing only keeps nodes from
+contending for the same dinners.
+"""
+
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+from beanie import PydanticObjectId
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.models.lease import Lease
+from app.services.leases import LeaseHandle, acquire, process_owner, release, renew
+from app.services.matchmaking.runner import MatchingResult, match_dinner
+
+NODE_LEASE_PREFIX = "matching-node:"
+
+
+def _score(node: str, dinner_id: PydanticObjectId) -> bytes:
+    return hashlib.sha1(f"{node}|{dinner_id}".encode()).digest()
+
+
+def owner_of(dinner_id: PydanticObjectId, nodes: List[str]) -> str:
+    return max(nodes, key=lambda node: _score(node, dinner_id))
+
+
+def plan(dinner_ids: Iterable[PydanticObjectId], nodes: List[str], me: str) -> List[PydanticObjectId]:
+    """This node's dinners first, then everyone else's."""
+    nodes = sorted(set(nodes) | {me})
+    dinner_ids = list(dinner_ids)
+    mine = [dinner_id for dinner_id in dinner_ids if owner_of(dinner_id, nodes) == me]
+    others = [dinner_id for dinner_id in dinner_ids if owner_of(dinner_id, nodes) != me]
+    return mine + others
+
+
+async def live_nodes() -> List[str]:
+    now = datetime.now(timezone.utc)
+    # An anchored prefix, so the scan stays on the name index
+    leases = await Lease.find(
+        {"name": {"$regex": f"^{NODE_LEASE_PREFIX}"}, "expires_at": {"$gt": now}, "owner": {"$ne": None}}
+    ).to_list()
+    return [lease.owner for lease in leases]
+
+
+class MatchingNode:
+    """One process's membership in the matching pool, plus bounded-parallel execution."""
+
+    def __init__(self, owner: Optional[str] = None):
+        self.owner = owner or process_owner()
+        self.lease: Optional[LeaseHandle] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    @property
+    def ttl_seconds(self) -> float:
+        return settings.MATCHING_NODE_HEARTBEAT_SECONDS * 3
+
+    async def _beat(self):
+        # The node lease is never contended (the name includes the owner), so
+        # losing it only means a missed heartbeat; take it again
+        if self.lease is None or not await renew(self.lease, self.ttl_seconds):
+            self.lease = await acquire(NODE_LEASE_PREFIX + self.owner, self.ttl_seconds, self.owner, disposable=True)
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(settings.MATCHING_NODE_HEARTBEAT_SECONDS)
+            try:
+                await self._beat()
+            except Exception:
+                logger.exception("Matching node heartbeat failed")
+
+    async def start(self):
+        await self._beat()
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    async def stop(self):
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        if self.lease is not None:
+            await release(self.lease)
+            self.lease = None
+
+    async def run(self, dinner_ids: Iterable[PydanticObjectId], concurrency: int) -> List[MatchingResult]:
+        """Match the given dinners in this node's plan order, at most `concurrency` at a time."""
+        order = plan(dinner_ids, await live_nodes(), self.owner)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def run_one(dinner_id: PydanticObjectId) -> MatchingResult:
+            async with slots:
+                try:
+                    return await match_dinner(dinner_id, owner=self.owner)
+                except Exception as e:
+                    logger.exception("Matching dinner %s failed", dinner_id)
+                    return MatchingResult(dinner_id, "failed", reason=str(e)[:500])
+
+        # Tasks are created in plan order, so the semaphore admits this node's own dinners first
+        return list(await asyncio.gather(*(run_one(dinner_id) for dinner_id in order)))
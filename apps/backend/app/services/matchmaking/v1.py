@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from itertools import combinations
 import random
 from app.models.user import User  # or from wherever your User model lives
@@ -35,6 +35,31 @@ def compute_personality_scores(answers: List[PersonalityAnswer]) -> Dict[str, fl
     return scores
 
 
+def compute_personality_scores_batch(answer_lists: List[List[Dict]]) -> List[Optional[Dict[str, float]]]:
+    """compute_personality_scores over raw answer dicts, e.g. straight from a Mongo cursor.
+
+    Skips model validation, which dominates the cost when rescoring the whole
+    user base. Answers without a known trait (unanswered journey slots) are
+    ignored; a user with none left gets None.
+    """
+    results = []
+    for answers in answer_lists:
+        yes = dict.fromkeys("OCEAN", 0)
+        counts = dict.fromkeys("OCEAN", 0)
+        for item in answers or ():
+            trait = item.get("trait") if item else None
+            if trait not in counts:
+                continue
+            counts[trait] += 1
+            if (item.get("answer") or "").strip().lower() == "yes":
+                yes[trait] += 1
+        if not any(counts.values()):
+            results.append(None)
+            continue
+        results.append({trait: yes[trait] / counts[trait] if counts[trait] else 0 for trait in yes})
+    return results
+
+
 def personality_compatibility(u1: Dict[str, float], u2: Dict[str, float]) -> float:
     """Calculate personality compatibility based on trait closeness."""
     total = 0
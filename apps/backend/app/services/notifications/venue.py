@@ -0,0 +1,56 @@
+# app/services/notifications/venue.py
+
+from typing import Iterable, Tuple
+
+from beanie.operators import In
+
+from app.core.executors import run_blocking
+from app.core.notifications.producer import queue_email_notifications
+from app.models.dinner import DinnerGroup, DinnerSummary
+from app.models.user import User, UserContact
+from app.models.venue import Venue
+
+
+async def notify_venue_assignments(
+    dinner: DinnerSummary,
+    assignments: Iterable[Tuple[DinnerGroup, Venue]],
+) -> int:
+    """
+    Email every participant of the given groups about their venue.
+    One projected query for all participants, one batched enqueue.
+    Returns the number of notifications SQS accepted.
+    """
+    assignments = list(assignments)
+    participant_ids = {pid for group, _ in assignments for pid in group.participant_ids}
+    if not participant_ids:
+        return 0
+
+    contacts = await User.find(
+        In(User.id, list(participant_ids)),
+        projection_model=UserContact,
+    ).to_list()
+    contacts_by_id = {contact.id: contact for contact in contacts}
+
+    date = dinner.date.strftime("%A, %d %B %Y")
+    notifications = []
+    for group, venue in assignments:
+        for user_id in group.participant_ids:
+            contact = contacts_by_id.get(user_id)
+            if not contact:
+                continue
+            notifications.append({
+                "to_email": contact.email,
+                "template": "venue_update",
+                "data": {
+                    "name": contact.name or "there",
+                    "venue_name": venue.name,
+                    "venue_address": venue.address,
+                    "city": venue.city,
+                    "date": date,
+                },
+            })
+
+    if not notifications:
+        return 0
+    failed = await run_blocking(queue_email_notifications, notifications)
+    return len(notifications) - failed
@@ -0,0 +1,222 @@
+# app/services/stripe_events.py
+"""
+Apply recorded Stripe webhook events.
+
+The webhook endpoint only verifies the signature and stores the event (see
+app/models/stripe_event.py); the work happens here, after the response has
+been sent. Each event is claimed atomically before it is applied, so the
+background task and the periodic sweep never apply the same event at once,
+and every handler is written as an idempotent upsert so that re-applying an
+event after a crash leaves the same state behind. Handlers return the email
+to send instead of sending it, and an event's email is only sent once no
+matter how often the event is applied.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from beanie import PydanticObjectId
+from beanie.operators import Set
+from pymongo import ReturnDocument
+
+from app.core.clients import clients
+from app.core.config import settings
+from app.core.executors import run_blocking
+from app.core.logger import logger
+from app.core.notifications.producer import queue_email_notification
+from app.models.stripe_event import StripeEvent
+from app.models.subscription import Subscription
+from app.models.user import User
+
+
+# (email, subscription status) for the "subscription" email template
+Notification = Tuple[str, str]
+
+
+def _timestamp(value: Optional[int]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, tz=timezone.utc) if value else None
+
+
+async def _notify(email: str, status: str):
+    await run_blocking(
+        queue_email_notification,
+        to_email=email,
+        template="subscription",
+        data={"status": status},
+    )
+
+
+async def handle_checkout_completed(session: Dict[str, Any]) -> Optional[Notification]:
+    subscription_id = session["subscription"]
+    customer_email = session["customer_email"]
+    stripe = await clients.get_stripe()
+    subscription = await run_blocking(stripe.Subscription.retrieve, subscription_id)
+    start_date = _timestamp(subscription["start_date"])
+    end_date = _timestamp(subscription["current_period_end"])
+
+    user_id = (session.get("metadata") or {}).get("user_id")
+    if user_id:
+        await User.find_one(User.id == PydanticObjectId(user_id)).update(Set({
+            User.stripe_customer_id: session["customer"],
+            User.subscription_status: "active",
+            User.subscription_end_date: end_date,
+        }))
+
+    # Keyed on the (unique) Stripe id, so a replayed event updates rather than
+    # duplicates; an insert that loses a race fails the event, and its retry updates
+    await Subscription.find_one(
+        Subscription.stripe_subscription_id == subscription_id
+    ).upsert(
+        Set({
+            Subscription.status: "active",
+            Subscription.end_date: end_date,
+        }),
+        on_insert=Subscription(
+            user_email=customer_email,
+            stripe_customer_id=session["customer"],
+            stripe_subscription_id=subscription_id,
+            status="active",
+            start_date=start_date,
+            end_date=end_date,
+        ),
+    )
+
+    return customer_email, "active"
+
+
+async def handle_payment_failed(invoice: Dict[str, Any]) -> Optional[Notification]:
+    subscription = await Subscription.find_one(
+        Subscription.stripe_subscription_id == invoice["subscription"]
+    )
+    if not subscription:
+        return None
+
+    await subscription.set({Subscription.status: "payment_failed"})
+    result = await User.find_one(User.email == subscription.user_email).update(
+        Set({User.subscription_status: "payment_failed"})
+    )
+    if result and result.matched_count:
+        return subscription.user_email, "failed"
+    return None
+
+
+async def handle_subscription_deleted(stripe_subscription: Dict[str, Any]) -> Optional[Notification]:
+    subscription = await Subscription.find_one(
+        Subscription.stripe_subscription_id == stripe_subscription["id"]
+    )
+    if not subscription:
+        return None
+
+    end_date = _timestamp(stripe_subscription.get("ended_at")) or datetime.now(timezone.utc)
+    await subscription.set({Subscription.status: "cancelled", Subscription.end_date: end_date})
+    await User.find_one(User.email == subscription.user_email).update(Set({
+        User.subscription_status: "cancelled",
+        User.subscription_end_date: end_date,
+    }))
+    return subscription.user_email, "cancelled"
+
+
+HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[Optional[Notification]]]] = {
+    "checkout.session.completed": handle_checkout_completed,
+    "invoice.payment_failed": handle_payment_failed,
+    "customer.subscription.deleted": handle_subscription_deleted,
+}
+
+
+async def _claim(query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Atomically move one matching event to "processing" and return it."""
+    now = datetime.now(timezone.utc)
+    return await StripeEvent.get_motor_collection().find_one_and_update(
+        query,
+        {"$set": {"status": "processing", "claimed_at": now}, "$inc": {"attempts": 1}},
+        sort=[("received_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def _notify_once(event_id: Any, notification: Notification):
+    """Send the event's email unless an earlier application of the event already did."""
+    collection = StripeEvent.get_motor_collection()
+    marked = await collection.update_one(
+        {"_id": event_id, "notified_at": None},
+        {"$set": {"notified_at": datetime.now(timezone.utc)}},
+    )
+    if not marked.modified_count:
+        return
+    try:
+        await _notify(*notification)
+    except Exception:
+        # Let the retry send it
+        await collection.update_one({"_id": event_id}, {"$set": {"notified_at": None}})
+        raise
+
+
+async def _apply(event: Dict[str, Any]):
+    collection = StripeEvent.get_motor_collection()
+    handler = HANDLERS.get(event["type"])
+    try:
+        if handler:
+            notification = await handler(event["payload"]["data"]["object"])
+            if notification:
+                await _notify_once(event["_id"], notification)
+    except Exception as e:
+        logger.exception("Stripe event %s (%s) failed", event["event_id"], event["type"])
+        await collection.update_one(
+            {"_id": event["_id"]},
+            {"$set": {"status": "failed", "last_error": str(e)[:1000]}},
+        )
+        return
+
+    await collection.update_one(
+        {"_id": event["_id"]},
+        {"$set": {"status": "processed", "processed_at": datetime.now(timezone.utc), "last_error": None}},
+    )
+
+
+async def process_stripe_event(event_id: str):
+    """Apply one recorded event; a no-op if another worker has already claimed it."""
+    event = await _claim({"event_id": event_id, "status": "pending"})
+    if event:
+        await _apply(event)
+
+
+def _retry_query(now: datetime) -> Dict[str, Any]:
+    retry_before = now - timedelta(seconds=settings.STRIPE_EVENT_RETRY_AFTER_SECONDS)
+    stale_before = now - timedelta(seconds=settings.STRIPE_EVENT_CLAIM_TIMEOUT_SECONDS)
+    return {
+        "attempts": {"$lt": settings.STRIPE_EVENT_MAX_ATTEMPTS},
+        "$or": [
+            # Accepted but its background task never ran (e.g. the worker restarted)
+            {"status": "pending", "received_at": {"$lt": retry_before}},
+            {"status": "failed", "claimed_at": {"$lt": retry_before}},
+            # Claimed by a worker that died mid-way
+            {"status": "processing", "claimed_at": {"$lt": stale_before}},
+        ],
+    }
+
+
+async def process_pending_events(limit: int = 100) -> int:
+    """Retry events that were never applied, failed, or were abandoned. Returns the number handled."""
+    handled = 0
+    while handled < limit:
+        event = await _claim(_retry_query(datetime.now(timezone.utc)))
+        if not event:
+            break
+        await _apply(event)
+        handled += 1
+    return handled
+
+
+async def run_event_sweeper():
+    """Background loop started from the app lifespan."""
+    while True:
+        await asyncio.sleep(settings.STRIPE_EVENT_SWEEP_INTERVAL_SECONDS)
+        try:
+            handled = await process_pending_events()
+            if handled:
+                logger.info("Retried %d Stripe events", handled)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Stripe event sweep failed")
@@ -0,0 +1,192 @@
+# app/services/venue_assignment.py
+"""
+Assign the matched groups of a dinner to venues in one pass.
+
+Groups are bucketed by (budget_category, size) and solved as a min-cost
+flow: source -> group bucket -> venue -> sink, where a venue's edge to the
+sink carries its per-night capacity. Buckets keep the graph small (a handful
+of nodes per budget level) no matter how many groups the dinner has, and the
+flow is exactly the optimal assignment for the cost model below.
+"""
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from beanie import PydanticObjectId
+
+from app.models.dinner import DinnerGroup
+from app.models.venue import Venue
+
+BUDGET_LEVELS = ["low", "medium", "high"]
+
+# Cost weights: a budget step outweighs any amount of wasted seats
+BUDGET_STEP_COST = 10.0
+UNKNOWN_BUDGET_COST = 1.0
+WASTED_SEAT_COST = 0.1
+
+
+def _budget_rank(budget: Optional[str]) -> Optional[int]:
+    if not budget:
+        return None
+    try:
+        return BUDGET_LEVELS.index(budget.strip().lower())
+    except ValueError:
+        return None
+
+
+def _same_place(a: Optional[str], b: Optional[str]) -> bool:
+    return (a or "").strip().lower() == (b or "").strip().lower()
+
+
+def assignment_cost(
+    budget: Optional[str], size: int, city: str, country: str, venue: Venue
+) -> Optional[float]:
+    """Cost of seating one group at a venue, or None when it cannot be seated there."""
+    if not venue.is_active or not _same_place(venue.city, city) or not _same_place(venue.country, country):
+        return None
+    if size > venue.max_group_size:
+        return None
+
+    cost = WASTED_SEAT_COST * (venue.max_group_size - size)
+    group_rank, venue_rank = _budget_rank(budget), _budget_rank(venue.budget_category)
+    if group_rank is not None and venue_rank is not None:
+        cost += BUDGET_STEP_COST * abs(group_rank - venue_rank)
+    elif group_rank is not None or venue_rank is not None:
+        cost += UNKNOWN_BUDGET_COST
+    return cost
+
+
+class _MinCostFlow:
+    """Successive shortest paths (SPFA) on a small residual graph."""
+
+    def __init__(self, size: int):
+        self.graph: List[List[int]] = [[] for _ in range(size)]
+        # Parallel edge arrays: to, capacity, cost
+        self.to: List[int] = []
+        self.cap: List[int] = []
+        self.cost: List[float] = []
+
+    def add_edge(self, u: int, v: int, cap: int, cost: float) -> int:
+        self.graph[u].append(len(self.to))
+        self.to.append(v); self.cap.append(cap); self.cost.append(cost)
+        self.graph[v].append(len(self.to))
+        self.to.append(u); self.cap.append(0); self.cost.append(-cost)
+        return len(self.to) - 2
+
+    def flow(self, edge: int) -> int:
+        return self.cap[edge ^ 1]
+
+    def solve(self, source: int, sink: int) -> Tuple[int, float]:
+        total_flow, total_cost = 0, 0.0
+        n = len(self.graph)
+        while True:
+            dist = [float("inf")] * n
+            in_queue = [False] * n
+            prev_edge = [-1] * n
+            dist[source] = 0.0
+            queue = deque([source])
+            while queue:
+                u = queue.popleft()
+                in_queue[u] = False
+                for e in self.graph[u]:
+                    if self.cap[e] > 0 and dist[u] + self.cost[e] < dist[self.to[e]] - 1e-9:
+                        v = self.to[e]
+                        dist[v] = dist[u] + self.cost[e]
+                        prev_edge[v] = e
+                        if not in_queue[v]:
+                            in_queue[v] = True
+                            queue.append(v)
+            if dist[sink] == float("inf"):
+                return total_flow, total_cost
+
+            # Push the bottleneck along the cheapest path
+            push, v = float("inf"), sink
+            while v != source:
+                e = prev_edge[v]
+                push = min(push, self.cap[e])
+                v = self.to[e ^ 1]
+            v = sink
+            while v != source:
+                e = prev_edge[v]
+                self.cap[e] -= push
+                self.cap[e ^ 1] += push
+                v = self.to[e ^ 1]
+            total_flow += push
+            total_cost += push * dist[sink]
+
+
+def split_for_assignment(
+    groups: Sequence[DinnerGroup], overwrite: bool
+) -> Tuple[List[DinnerGroup], Dict[PydanticObjectId, int]]:
+    """
+    The groups to (re)assign, and how many groups each venue already hosts.
+    Without ``overwrite`` groups that have a venue keep it and count against
+    that venue's capacity.
+    """
+    pending = [group for group in groups if overwrite or not group.venue_id]
+    used_capacity: Dict[PydanticObjectId, int] = defaultdict(int)
+    if not overwrite:
+        for group in groups:
+            if group.venue_id:
+                used_capacity[PydanticObjectId(group.venue_id)] += 1
+    return pending, dict(used_capacity)
+
+
+@dataclass
+class AssignmentResult:
+    assignments: Dict[PydanticObjectId, PydanticObjectId] = field(default_factory=dict)  # group -> venue
+    unassigned: List[PydanticObjectId] = field(default_factory=list)
+    total_cost: float = 0.0
+
+
+def assign_groups_to_venues(
+    groups: Sequence[DinnerGroup],
+    venues: Sequence[Venue],
+    city: str,
+    country: str,
+    used_capacity: Optional[Dict[PydanticObjectId, int]] = None,
+) -> AssignmentResult:
+    """
+    Optimal venue for every group, maximising the number of seated groups
+    first and minimising total cost second. ``used_capacity`` is the number
+    of groups each venue already hosts that night.
+    """
+    used_capacity = used_capacity or {}
+    buckets: Dict[Tuple[Optional[str], int], List[PydanticObjectId]] = defaultdict(list)
+    for group in groups:
+        buckets[(group.budget_category, len(group.participant_ids))].append(group.id)
+
+    open_venues = [
+        venue for venue in venues
+        if venue.capacity - used_capacity.get(venue.id, 0) > 0
+    ]
+    bucket_keys = list(buckets)
+    source, sink = 0, 1
+    bucket_node = {key: 2 + i for i, key in enumerate(bucket_keys)}
+    venue_node = {venue.id: 2 + len(bucket_keys) + i for i, venue in enumerate(open_venues)}
+
+    mcf = _MinCostFlow(2 + len(bucket_keys) + len(open_venues))
+    for key in bucket_keys:
+        mcf.add_edge(source, bucket_node[key], len(buckets[key]), 0.0)
+    for venue in open_venues:
+        mcf.add_edge(venue_node[venue.id], sink, venue.capacity - used_capacity.get(venue.id, 0), 0.0)
+
+    pair_edges: List[Tuple[Tuple[Optional[str], int], PydanticObjectId, int]] = []
+    for key in bucket_keys:
+        budget, size = key
+        for venue in open_venues:
+            cost = assignment_cost(budget, size, city, country, venue)
+            if cost is not None:
+                edge = mcf.add_edge(bucket_node[key], venue_node[venue.id], len(buckets[key]), cost)
+                pair_edges.append((key, venue.id, edge))
+
+    _, total_cost = mcf.solve(source, sink)
+
+    result = AssignmentResult(total_cost=round(total_cost, 4))
+    for key, venue_id, edge in pair_edges:
+        for _ in range(mcf.flow(edge)):
+            result.assignments[buckets[key].pop()] = venue_id
+    for remaining in buckets.values():
+        result.unassigned.extend(remaining)
+    return result
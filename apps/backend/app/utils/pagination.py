@@ -0,0 +1,62 @@
+# app/utils/pagination.py
+"""
+Opaque keyset cursors for list endpoints.
+
+A cursor encodes the sort key of the last item on a page; the next page
+starts strictly after it, so page cost does not grow with history size.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(**values: Any) -> str:
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def id_after(cursor: Optional[str]) -> Dict[str, Any]:
+    """Filter for documents after an ``_id`` cursor (ascending ``_id`` order)."""
+    if not cursor:
+        return {}
+    try:
+        last_id = PydanticObjectId(decode_cursor(cursor)["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"_id": {"$gt": last_id}}
+
+
+def date_id_before(cursor: Optional[str], field: str = "date") -> Dict[str, Any]:
+    """Filter for documents after a ``(date, _id)`` cursor in descending order."""
+    if not cursor:
+        return {}
+    last_date, last_id = _date_id(cursor)
+    return {
+        "$or": [
+            {field: {"$lt": last_date}},
+            {field: last_date, "_id": {"$lt": last_id}},
+        ]
+    }
+
+
+def _date_id(cursor: str) -> Tuple[datetime, PydanticObjectId]:
+    values = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(values["date"]), PydanticObjectId(values["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -1,12 +1,11 @@
 from fastapi import Depends, HTTPException
 from datetime import datetime, timezone
 from app.models.subscription import Subscription
-from app.models.user import User
+from app.models.user import AuthPrincipal
 from app.dependencies.auth import get_current_user
 
-async def require_active_subscription(user: User = Depends(get_current_user)):
+async def require_active_subscription(user: AuthPrincipal = Depends(get_current_user)):
     subscription = await Subscription.find_one(Subscription.user_email == user.email)
-    print("subscription",subscription)
     if not subscription:
         raise HTTPException(status_code=403, detail="No active subscription found.")
 
@@ -1,10 +1,8 @@
 #!/bin/bash
 
-echo "🚀 Starting FastAPI server..."
-uvicorn app.main:app --host 0.0.0.0 --port 8000 &
-
-echo "📨 Starting mail cron worker..."
-python -m app.crons.notification_consumer
-
-# If consumer exits (e.g., error), container will stop. Uncomment this if needed
-# wait -n
+# API workers, the notification consumers and the matchmaker cron run as
+# children of one supervisor, which restarts them if they crash and drains
+# them on SIGTERM. Counts come from API_WORKERS / CONSUMER_WORKERS /
+# MATCHMAKER_WORKERS (see app/launcher.py).
+echo "🚀 Starting API workers, mail consumers and matchmaker..."
+exec python -m app.launcher "$@"
@@ -0,0 +1,76 @@
+# tests/conftest.py
+
+import json
+import os
+
+# Settings has no defaults for these; tests never reach the real services
+for name, value in {
+    "MONGO_URI": "mongodb://localhost:27017",
+    "DATABASE_NAME": "test",
+    "SECRET_KEY": "test-secret",
+    "EMAIL_SENDER": "test@example.com",
+    "EMAIL_PASSWORD": "test",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "25",
+    "STRIPE_SECRET_KEY": "sk_test",
+    "STRIPE_WEBHOOK_SECRET": "whsec_test",
+    "STRIPE_PRICE_ID": "price_test",
+    "FRONTEND_URL": "http://localhost:3000",
+    "SQS_QUEUE_URL": "http://localhost/queue",
+    "AWS_ACCESS_KEY_ID": "test",
+    "AWS_SECRET_ACCESS_KEY": "test",
+    "AWS_REGION": "us-east-1",
+    # mongomock-motor collections do not support with_options()
+    "MONGO_SECONDARY_READ_PREFERENCE": "primary",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """Beanie on an in-memory mongomock database, with every model's indexes created."""
+    from mongomock_motor import AsyncMongoMockClient
+
+    from app.db.init import init_db
+
+    client = AsyncMongoMockClient()
+    await init_db(client=client, database_name="test", sync_indexes=True)
+    yield client["test"]
+
+
+class FakeSQS:
+    """Records what the notification producers send instead of calling AWS."""
+
+    def __init__(self):
+        self.messages = []
+        # Batch entries addressed to these emails are reported as failed
+        self.failing_emails = set()
+
+    def send_message(self, QueueUrl, MessageBody):
+        self.messages.append(MessageBody)
+        return {"MessageId": str(len(self.messages))}
+
+    def send_message_batch(self, QueueUrl, Entries):
+        failed = [entry for entry in Entries if json.loads(entry["MessageBody"])["email"] in self.failing_emails]
+        sent = [entry for entry in Entries if entry not in failed]
+        self.messages.extend(entry["MessageBody"] for entry in sent)
+        return {
+            "Successful": [{"Id": entry["Id"]} for entry in sent],
+            "Failed": [{"Id": entry["Id"], "Message": "Rejected"} for entry in failed],
+        }
+
+
+@pytest.fixture
+def sqs(monkeypatch):
+    from app.core.clients import clients
+
+    fake = FakeSQS()
+    monkeypatch.setattr(clients, "_sqs", fake)
+    return fake
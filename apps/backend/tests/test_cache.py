@@ -0,0 +1,84 @@
+# tests/test_cache.py
+
+import asyncio
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+pytestmark = pytest.mark.anyio
+
+
+class Loader:
+    def __init__(self, values):
+        self.values = list(values)
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        value = self.values[self.calls - 1]
+        await self.release.wait()
+        return value
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = TTLCache(ttl_seconds=60)
+    loader = Loader(["a"])
+
+    tasks = [asyncio.create_task(cache.get_or_load("k", loader)) for _ in range(10)]
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    assert await asyncio.gather(*tasks) == ["a"] * 10
+    assert loader.calls == 1
+    assert cache.misses == 1
+
+
+async def test_invalidation_during_load_discards_stale_value():
+    cache = TTLCache(ttl_seconds=60)
+    stale = Loader(["stale"])
+
+    first = asyncio.create_task(cache.get_or_load("k", stale))
+    await asyncio.sleep(0)
+    cache.invalidate("k")
+
+    fresh = Loader(["fresh"])
+    fresh.release.set()
+    assert await cache.get_or_load("k", fresh) == "fresh"
+
+    stale.release.set()
+    assert await first == "stale"
+    # The load that started before the invalidation neither overwrote the
+    # entry nor evicted the newer load's in-flight slot
+    assert await cache.get_or_load("k", Loader(["unused"])) == "fresh"
+
+
+async def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl_seconds=30)
+    loader = Loader(["a", "b"])
+    loader.release.set()
+
+    assert await cache.get_or_load("k", loader) == "a"
+    now[0] += 29
+    assert await cache.get_or_load("k", loader) == "a"
+    now[0] += 2
+    assert await cache.get_or_load("k", loader) == "b"
+    assert loader.calls == 2
+
+
+async def test_failed_load_is_not_cached():
+    cache = TTLCache(ttl_seconds=60)
+
+    async def failing():
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("k", failing)
+
+    loader = Loader(["a"])
+    loader.release.set()
+    assert await cache.get_or_load("k", loader) == "a"
@@ -0,0 +1,26 @@
+# tests/test_clients.py
+
+import threading
+
+import pytest
+
+from app.core.clients import ClientRegistry
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_stripe_is_built_off_the_event_loop(monkeypatch):
+    built_on = []
+
+    def build(registry):
+        if registry._stripe is None:
+            built_on.append(threading.current_thread())
+            registry._stripe = object()
+        return registry._stripe
+
+    monkeypatch.setattr(ClientRegistry, "stripe", property(build))
+    registry = ClientRegistry()
+
+    stripe = await registry.get_stripe()
+    assert await registry.get_stripe() is stripe
+    assert len(built_on) == 1 and built_on[0] is not threading.current_thread()
@@ -0,0 +1,38 @@
+# tests/test_dinner_cache.py
+
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+
+from app.models.dinner import Dinner
+from app.services.dinner_cache import (
+    UPCOMING_CUTOFF,
+    get_upcoming_dinners_body,
+    invalidate_upcoming_dinners,
+    upcoming_dinners_cache,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def upcoming_ids():
+    body = orjson.loads(await get_upcoming_dinners_body("Pune", "India"))
+    return [dinner["id"] for dinner in body["data"]]
+
+
+async def test_created_dinner_is_listed_after_invalidation(db):
+    upcoming_dinners_cache.clear()
+    soon = datetime.now(timezone.utc) + UPCOMING_CUTOFF + timedelta(days=1)
+    first = Dinner(date=soon + timedelta(days=7), city="Pune", country="India")
+    await first.insert()
+    # Inside the cut-off, never listed
+    await Dinner(date=datetime.now(timezone.utc) + timedelta(hours=1), city="Pune", country="India").insert()
+    assert await upcoming_ids() == [str(first.id)]
+
+    created = Dinner(date=soon, city="Pune", country="India")
+    await created.insert()
+    assert await upcoming_ids() == [str(first.id)]
+
+    invalidate_upcoming_dinners("Pune", "India")
+    assert await upcoming_ids() == [str(created.id), str(first.id)]
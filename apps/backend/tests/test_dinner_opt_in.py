@@ -0,0 +1,49 @@
+# tests/test_dinner_opt_in.py
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+
+from app.api.v1 import dinner_users
+from app.api.v1.dinner_users import OptInRequest, opt_in_to_dinner
+from app.models.dinner import Dinner
+from app.models.dinner_opt_in import DinnerOptIn
+from app.models.user import AuthPrincipal
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    sent = []
+    monkeypatch.setattr(dinner_users, "queue_email_notification", lambda **kwargs: sent.append(kwargs))
+    return sent
+
+
+async def test_second_opt_in_is_rejected(db, queued):
+    dinner = Dinner(date=datetime.now(timezone.utc) + timedelta(days=5), city="Pune", country="India")
+    await dinner.insert()
+    user = AuthPrincipal(_id=PydanticObjectId(), email="guest@example.com", name="Guest")
+    payload = OptInRequest(dinner_id=dinner.id, budget_category="low", dietary_category="veg")
+
+    response = await opt_in_to_dinner(payload, user=user)
+    assert response.data.dinner_id == dinner.id
+
+    with pytest.raises(HTTPException) as error:
+        await opt_in_to_dinner(payload, user=user)
+    assert error.value.status_code == 400
+    assert error.value.detail == "Already opted in"
+
+    assert await DinnerOptIn.find(DinnerOptIn.dinner_id == dinner.id).count() == 1
+    assert len(queued) == 1
+
+
+async def test_opt_in_to_missing_dinner_is_404(db, queued):
+    user = AuthPrincipal(_id=PydanticObjectId(), email="guest@example.com")
+
+    with pytest.raises(HTTPException) as error:
+        await opt_in_to_dinner(OptInRequest(dinner_id=PydanticObjectId()), user=user)
+    assert error.value.status_code == 404
+    assert queued == []
@@ -0,0 +1,29 @@
+# tests/test_geo.py
+
+import threading
+
+import pytest
+
+from app.services import geo
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_geo_index_loads_off_the_event_loop(monkeypatch):
+    loaded_on = []
+    real_load = geo.load_geo_index
+
+    def load(version):
+        loaded_on.append(threading.current_thread())
+        return real_load(version)
+
+    monkeypatch.setattr(geo, "load_geo_index", load)
+    geo.get_geo_index.cache_clear()
+    try:
+        index = await geo.geo_index()
+        assert await geo.geo_index() is index
+    finally:
+        geo.get_geo_index.cache_clear()
+
+    assert len(loaded_on) == 1 and loaded_on[0] is not threading.current_thread()
+    assert index.resolve_country(index.countries[0]) == index.countries[0]
@@ -0,0 +1,34 @@
+# tests/test_import_time.py
+
+import os
+
+import pytest
+
+from app.scripts.check_import_time import DEFAULT_MAX_APP_SHARE, ImportTiming, best_of
+
+# The absolute budget depends on the machine, so it is only enforced where
+# the hardware is known; CI sets it to the script's default
+BUDGET_SECONDS = os.environ.get("IMPORT_TIME_BUDGET_SECONDS")
+
+
+@pytest.fixture(scope="module")
+def timing() -> ImportTiming:
+    return best_of(3)
+
+
+def test_lazy_sdks_are_not_imported(timing):
+    assert timing.eager == []
+
+
+def test_app_share_of_import_time(timing):
+    assert timing.app <= timing.framework * DEFAULT_MAX_APP_SHARE, (
+        f"app imports take {timing.app:.3f}s on top of {timing.framework:.3f}s for the frameworks"
+    )
+
+
+@pytest.mark.skipif(not BUDGET_SECONDS, reason="set IMPORT_TIME_BUDGET_SECONDS to enforce the absolute budget")
+def test_import_time_budget(timing):
+    assert timing.total <= float(BUDGET_SECONDS), (
+        f"import app.main took {timing.total:.3f}s "
+        f"({timing.framework:.3f}s frameworks + {timing.app:.3f}s app)"
+    )
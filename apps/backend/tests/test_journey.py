@@ -0,0 +1,87 @@
+# tests/test_journey.py
+
+import asyncio
+from datetime import date, datetime
+
+import pytest
+
+from app.api.v1.journey import save_journey, save_journey_batch
+from app.models.user import AuthPrincipal, User
+from app.schemas.journey import SaveJourneyBatchRequest, SaveJourneyRequest
+
+pytestmark = pytest.mark.anyio
+
+
+async def make_user(**fields) -> AuthPrincipal:
+    user = User(email="journey@example.com", **fields)
+    await user.insert()
+    return AuthPrincipal(_id=user.id, email=user.email)
+
+
+def batch(**answers) -> SaveJourneyBatchRequest:
+    return SaveJourneyBatchRequest(answers=[
+        SaveJourneyRequest(question_key=key, answer=answer) for key, answer in answers.items()
+    ])
+
+
+async def test_batch_and_single_saves_do_not_overwrite_each_other(db):
+    principal = await make_user()
+
+    await asyncio.gather(
+        save_journey_batch(batch(q0="yes", q1="no", current_city="Pune"), user=principal),
+        save_journey(SaveJourneyRequest(question_key="q2", answer="yes"), user=principal),
+    )
+
+    user = await User.get(principal.id)
+    assert [a.answer for a in user.personality_answers[:3]] == ["yes", "no", "yes"]
+    assert user.current_city == "Pune"
+
+
+async def test_batch_initialises_a_missing_answers_array(db):
+    principal = await make_user()
+    await User.get_motor_collection().update_one({"_id": principal.id}, {"$unset": {"personality_answers": ""}})
+
+    await save_journey_batch(batch(q14="yes"), user=principal)
+
+    user = await User.get(principal.id)
+    assert len(user.personality_answers) == 15
+    assert user.personality_answers[14].answer == "yes"
+    assert user.personality_answers[14].trait
+
+
+async def test_scores_are_computed_from_the_answers_so_far(db):
+    principal = await make_user()
+
+    # q0 and q5 are both openness items
+    first = await save_journey_batch(batch(q0="yes"), user=principal)
+    assert first.data.scores["O"] == 1.0
+
+    second = await save_journey_batch(batch(q5="no"), user=principal)
+    assert second.data.scores["O"] == 0.5
+    # Partial scores must not make the user a matching candidate
+    assert not (await User.get(principal.id)).personality_scores
+
+    rest = {f"q{i}": "yes" for i in range(15) if i not in (0, 5)}
+    final = await save_journey_batch(batch(**rest), user=principal)
+    assert (await User.get(principal.id)).personality_scores == final.data.scores
+
+
+async def test_dob_is_stored_as_a_date(db):
+    principal = await make_user()
+
+    await save_journey_batch(batch(dob="1990-04-02"), user=principal)
+
+    stored = await User.get_motor_collection().find_one({"_id": principal.id})
+    assert stored["dob"] == datetime(1990, 4, 2)
+    assert (await User.get(principal.id)).dob == date(1990, 4, 2)
+
+
+async def test_profile_only_batch_leaves_scores_alone(db):
+    principal = await make_user()
+
+    response = await save_journey_batch(batch(profession="Engineer"), user=principal)
+
+    assert response.data.scores is None
+    user = await User.get(principal.id)
+    assert user.profession == "Engineer"
+    assert not user.personality_scores
@@ -0,0 +1,88 @@
+# tests/test_leases.py
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.lease import Lease
+from app.services.leases import LeaseUnavailable, acquire, hold_lease, release, renew
+from app.services.matchmaking.scheduler import MatchingNode, live_nodes
+
+pytestmark = pytest.mark.anyio
+
+
+async def expire_now(name: str):
+    await Lease.get_motor_collection().update_one(
+        {"name": name}, {"$set": {"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}}
+    )
+
+
+async def test_held_lease_cannot_be_acquired(db):
+    first = await acquire("job", ttl_seconds=60, owner="a")
+    assert first is not None and first.token == 1
+
+    assert await acquire("job", ttl_seconds=60, owner="b") is None
+    with pytest.raises(LeaseUnavailable):
+        async with hold_lease("job", ttl_seconds=60, owner="b"):
+            pass
+
+    # Released leases are free again and the token keeps growing
+    await release(first)
+    second = await acquire("job", ttl_seconds=60, owner="b")
+    assert second.token == 2
+
+
+async def test_expired_lease_cannot_be_renewed(db):
+    lease = await acquire("job", ttl_seconds=60, owner="a")
+    assert await renew(lease, ttl_seconds=60)
+
+    await expire_now("job")
+    assert not await renew(lease, ttl_seconds=60)
+
+    newer = await acquire("job", ttl_seconds=60, owner="b")
+    assert newer.token == lease.token + 1
+    # The stale holder neither renews nor releases the newer holder's lease
+    assert not await renew(lease, ttl_seconds=60)
+    await release(lease)
+    assert (await Lease.find_one(Lease.name == "job")).owner == "b"
+
+
+async def test_holder_notices_a_lost_lease(db):
+    ttl = 0.3
+    async with hold_lease("job", ttl_seconds=ttl, owner="a") as lease:
+        # Renewal keeps the lease alive past its first expiry
+        await asyncio.sleep(ttl * 1.5)
+        assert not lease.lost
+        assert await acquire("job", ttl_seconds=60, owner="b") is None
+
+        # Stalled past its expiry and taken over
+        await expire_now("job")
+        assert await acquire("job", ttl_seconds=60, owner="b") is not None
+        await asyncio.sleep(ttl / 3 * 2)
+        assert lease.lost
+
+    assert (await Lease.find_one(Lease.name == "job")).owner == "b"
+
+
+async def test_disposable_leases_are_deleted_or_purged(db):
+    kept = await acquire("job", ttl_seconds=60, owner="a")
+    disposable = await acquire("node:a", ttl_seconds=60, owner="a", disposable=True)
+
+    docs = {doc["name"]: doc async for doc in Lease.get_motor_collection().find()}
+    assert docs["job"].get("purge_at") is None
+    assert docs["node:a"]["purge_at"] > docs["node:a"]["expires_at"]
+
+    await release(kept)
+    await release(disposable)
+    assert [lease.name for lease in await Lease.find_all().to_list()] == ["job"]
+
+
+async def test_stopped_node_leaves_no_lease(db):
+    node = MatchingNode(owner="node-a")
+    await node.start()
+    assert await live_nodes() == ["node-a"]
+
+    await node.stop()
+    assert await live_nodes() == []
+    assert await Lease.find_all().count() == 0
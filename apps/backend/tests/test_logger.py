@@ -0,0 +1,31 @@
+# tests/test_logger.py
+
+import logging
+
+from app.core import logger as logger_module
+from app.core.logger import logger, start_logging, stop_logging
+
+
+class Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_logging_survives_a_stop_start_cycle(monkeypatch):
+    collect = Collect()
+    monkeypatch.setattr(logger_module.listener, "handlers", (collect,))
+
+    logger.warning("before")
+    stop_logging()
+    stop_logging()
+    start_logging()
+    start_logging()
+    logger.warning("after")
+    stop_logging()
+    start_logging()
+
+    assert collect.messages == ["before", "after"]
@@ -0,0 +1,155 @@
+# tests/test_matchmaking.py
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from beanie import PydanticObjectId
+
+from app.core.config import settings
+from app.crons.matchmaker import due_dinner_ids
+from app.db.init import init_db
+from app.models.dinner import Dinner, DinnerGroup
+from app.models.dinner_opt_in import DinnerOptIn
+from app.models.matching_run import MatchingRun
+from app.models.user import User
+from app.services.leases import acquire
+from app.services.matchmaking import runner
+from app.services.matchmaking.runner import GROUP_SIZE, _claim, lease_name, match_dinner
+from app.services.matchmaking.scheduler import owner_of, plan
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    sent = []
+    monkeypatch.setattr(runner, "queue_email_notifications", sent.extend)
+    return sent
+
+
+async def make_dinner(users: int = GROUP_SIZE, days: float = 1) -> Dinner:
+    dinner = Dinner(date=datetime.now(timezone.utc) + timedelta(days=days), city="Pune", country="India")
+    await dinner.insert()
+    for i in range(users):
+        user = User(
+            email=f"guest{i}@example.com",
+            name=f"Guest {i}",
+            personality_scores={"O": 3.0, "C": 3.0, "E": 3.0 + i % 2, "A": 3.0, "N": 3.0},
+        )
+        await user.insert()
+        await DinnerOptIn(dinner_id=dinner.id, user_id=user.id, budget_category="low", dietary_category="veg").insert()
+    return dinner
+
+
+async def test_match_dinner(db, queued):
+    dinner = await make_dinner()
+
+    result = await match_dinner(dinner.id, owner="a")
+
+    assert (result.status, result.groups_created, result.ungrouped_users) == ("matched", 1, 0)
+    assert (await Dinner.get(dinner.id)).matched
+    assert await DinnerGroup.find(DinnerGroup.dinner_id == dinner.id).count() == 1
+    assert len(queued) == GROUP_SIZE
+    assert (await match_dinner(dinner.id, owner="a")).status == "already_matched"
+
+
+async def test_too_few_users_are_skipped_and_backed_off(db, queued):
+    dinner = await make_dinner(users=GROUP_SIZE - 1)
+
+    result = await match_dinner(dinner.id, owner="a")
+
+    assert result.status == "skipped"
+    assert not (await Dinner.get(dinner.id)).matched
+    assert queued == []
+
+    now = datetime.now(timezone.utc)
+    assert await due_dinner_ids(now) == []
+    later = now + timedelta(seconds=settings.MATCHMAKER_SKIP_BACKOFF_SECONDS + 1)
+    assert await due_dinner_ids(later) == [dinner.id]
+
+
+async def test_due_dinners(db):
+    now = datetime.now(timezone.utc)
+    later = await make_dinner(users=0, days=1)
+    sooner = await make_dinner(users=0, days=0.5)
+    await make_dinner(users=0, days=3)  # Before the cut-off
+    await make_dinner(users=0, days=-1)  # Already started
+    matched = await make_dinner(users=0)
+    await Dinner.find_one(Dinner.id == matched.id).update({"$set": {"matched": True}})
+
+    assert await due_dinner_ids(now) == [sooner.id, later.id]
+
+
+async def test_held_lease_makes_the_run_busy(db, queued):
+    dinner = await make_dinner()
+    assert await acquire(lease_name(dinner.id), ttl_seconds=60, owner="b")
+
+    assert (await match_dinner(dinner.id, owner="a")).status == "busy"
+    assert await DinnerGroup.find(DinnerGroup.dinner_id == dinner.id).count() == 0
+
+
+async def test_stale_token_cannot_claim(db):
+    dinner = await make_dinner(users=0)
+
+    assert await _claim(dinner.id, 2)
+    assert not await _claim(dinner.id, 1)
+    assert not await _claim(dinner.id, 2)
+    assert await _claim(dinner.id, 3)
+
+
+async def test_overtaken_run_removes_its_groups(db, queued, monkeypatch):
+    dinner = await make_dinner()
+    build_groups = runner.run_cpu_bound
+
+    async def overtaken(fn, *args):
+        # A newer run claims the dinner while this one is still grouping
+        groups = await build_groups(fn, *args)
+        current = await Dinner.get(dinner.id)
+        assert await _claim(dinner.id, current.matching_token + 1)
+        return groups
+
+    monkeypatch.setattr(runner, "run_cpu_bound", overtaken)
+
+    result = await match_dinner(dinner.id, owner="a")
+
+    assert result.status == "lost"
+    assert not (await Dinner.get(dinner.id)).matched
+    assert await DinnerGroup.find(DinnerGroup.dinner_id == dinner.id).count() == 0
+    assert queued == []
+
+
+async def test_winning_run_removes_leftover_groups(db, queued):
+    dinner = await make_dinner()
+    # Written by a run that died before flipping the dinner to matched
+    await DinnerGroup(dinner_id=dinner.id, budget_category="low", dietary_category="veg", venue_id=None, matching_token=0).insert()
+
+    assert (await match_dinner(dinner.id, owner="a")).status == "matched"
+    groups = await DinnerGroup.find(DinnerGroup.dinner_id == dinner.id).to_list()
+    assert [group.matching_token for group in groups] == [(await Dinner.get(dinner.id)).matching_token]
+
+
+def test_plan_puts_own_dinners_first():
+    nodes = ["a", "b", "c"]
+    dinner_ids = [PydanticObjectId() for _ in range(30)]
+
+    order = plan(dinner_ids, nodes, "b")
+
+    assert sorted(order) == sorted(dinner_ids)
+    mine = [dinner_id for dinner_id in dinner_ids if owner_of(dinner_id, nodes) == "b"]
+    assert order[:len(mine)] == mine
+    assert order[len(mine):] == [dinner_id for dinner_id in dinner_ids if dinner_id not in mine]
+    # Every node agrees on the owners, whatever order it lists the nodes in
+    assert all(owner_of(dinner_id, nodes) == owner_of(dinner_id, nodes[::-1]) for dinner_id in dinner_ids)
+    # A node missing from the live set still plans with itself included
+    assert plan(dinner_ids, ["a", "c"], "b") == order
+
+
+async def test_index_sync_drops_the_old_matching_run_index(db):
+    collection = MatchingRun.get_motor_collection()
+    await collection.create_index([("started_at", -1)], name="started_at_desc")
+
+    await init_db(client=db.client, database_name=db.name, sync_indexes=True)
+
+    indexes = await collection.index_information()
+    assert "started_at_desc" not in indexes
+    assert indexes["started_at_ttl"]["expireAfterSeconds"] == settings.MATCHING_RUN_RETENTION_DAYS * 24 * 3600
@@ -0,0 +1,133 @@
+# tests/test_n_plus_one.py
+"""
+Drive the endpoints that used to query in loops with the N+1 detector in
+raise mode. The detector listens to real driver commands, so this needs a
+MongoDB server: set MONGO_TEST_URI (CI runs one as a service).
+"""
+
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.query_detector import QueryDetectorMiddleware, query_detector_listener
+from app.db.init import init_db
+from app.dependencies.admin import get_current_admin_user
+from app.dependencies.auth import get_current_user
+from app.models.dinner import Dinner, DinnerGroup
+from app.models.dinner_opt_in import DinnerOptIn
+from app.models.user import AuthPrincipal, User
+from app.models.venue import Venue
+
+MONGO_TEST_URI = os.environ.get("MONGO_TEST_URI")
+
+pytestmark = [
+    pytest.mark.anyio,
+    pytest.mark.skipif(not MONGO_TEST_URI, reason="needs a MongoDB server (set MONGO_TEST_URI)"),
+]
+
+# Low enough that a query per dinner, group or user in the seed data trips it
+THRESHOLD = 2
+DINNERS = 4
+USERS = 12
+
+
+@pytest.fixture
+async def mongo_db():
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    name = f"test_n_plus_one_{uuid4().hex[:8]}"
+    client = AsyncIOMotorClient(MONGO_TEST_URI, event_listeners=[query_detector_listener])
+    await init_db(client=client, database_name=name, sync_indexes=True)
+    yield client[name]
+    await client.drop_database(name)
+    client.close()
+
+
+@pytest.fixture
+async def seeded(mongo_db):
+    now = datetime.now(timezone.utc)
+    users = [
+        User(
+            email=f"guest{i}@example.com",
+            name=f"Guest {i}",
+            personality_scores={trait: random.random() for trait in "OCEAN"},
+        )
+        for i in range(USERS)
+    ]
+    await User.insert_many(users)
+    users = await User.find_all().to_list()
+    venues = [Venue(name=f"Venue {i}", city="Pune", country="India") for i in range(DINNERS)]
+    await Venue.insert_many(venues)
+    venues = await Venue.find_all().to_list()
+
+    dinners = [
+        Dinner(date=now - timedelta(days=7 * i), city="Pune", country="India", matched=True)
+        for i in range(DINNERS)
+    ]
+    dinners.append(Dinner(date=now + timedelta(days=1), city="Pune", country="India"))
+    await Dinner.insert_many(dinners)
+    dinners = await Dinner.find_all().to_list()
+
+    await DinnerOptIn.insert_many([
+        DinnerOptIn(dinner_id=dinner.id, user_id=user.id, budget_category="low", dietary_category="veg")
+        for dinner in dinners
+        for user in users
+    ])
+    await DinnerGroup.insert_many([
+        DinnerGroup(
+            dinner_id=dinner.id,
+            participant_ids=[user.id for user in users[:6]],
+            venue_id=venue.id,
+            budget_category="low",
+            dietary_category="veg",
+        )
+        for dinner, venue in zip(dinners[:DINNERS], venues)
+    ])
+    groups = await DinnerGroup.find_all().to_list()
+    return {"user": users[0], "venues": venues, "groups": groups, "unmatched": dinners[-1]}
+
+
+@pytest.fixture
+async def api(seeded, sqs, monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "QUERY_DETECTOR_MODE", "raise")
+    monkeypatch.setattr(settings, "QUERY_DETECTOR_THRESHOLD", THRESHOLD)
+    user = seeded["user"]
+    app.dependency_overrides[get_current_user] = lambda: AuthPrincipal(
+        _id=user.id, email=user.email, name=user.name, current_city="Pune", current_country="India"
+    )
+    app.dependency_overrides[get_current_admin_user] = lambda: {"email": "admin@example.com"}
+    transport = httpx.ASGITransport(app=QueryDetectorMiddleware(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("path", [
+    "/dinner/dinners/user-view",
+    "/dinner/my-bookings",
+    "/dinner/upcoming",
+    "/admin/dinner/all",
+    "/admin/venues",
+])
+async def test_listing_endpoints(api, path):
+    response = await api.get(path)
+    assert response.status_code == 200, response.text
+
+
+async def test_update_group_venue(api, seeded):
+    group, venue = seeded["groups"][0], seeded["venues"][-1]
+    response = await api.patch(f"/admin/dinner-group/{group.id}/venue", json={"venue_id": str(venue.id)})
+    assert response.status_code == 200, response.text
+
+
+async def test_run_matching(api, seeded, sqs):
+    response = await api.post("/admin/run-matching", params={"dinner_id": str(seeded["unmatched"].id)})
+    assert response.status_code == 200, response.text
+    assert sqs.messages
@@ -0,0 +1,78 @@
+# tests/test_query_detector.py
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import motor.frameworks.asyncio as motor_asyncio
+import pytest
+
+from app.core import query_detector
+from app.core.query_detector import RepeatedQueryError, command_shape, detect_repeated_queries
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def tests_are_app_code(monkeypatch):
+    # Let frames in this file count as call sites
+    monkeypatch.setattr(query_detector, "APP_ROOT", os.path.dirname(os.path.abspath(__file__)))
+    monkeypatch.setattr(query_detector, "_SKIPPED_PATHS", ())
+
+
+def issue_find(user_id: int):
+    # Runs on Motor's executor thread, where pymongo calls the listener
+    query_detector.query_detector_listener.started(
+        SimpleNamespace(command_name="find", command={"find": "users", "filter": {"_id": user_id}})
+    )
+
+
+async def find_user(user_id: int):
+    # Goes through the same hand-off as every Motor operation
+    await motor_asyncio.run_on_executor(asyncio.get_running_loop(), issue_find, user_id)
+
+
+def test_command_shape_strips_values():
+    assert command_shape("find", {"find": "users", "filter": {"_id": 1, "city": {"$in": ["a"]}}}) == (
+        'find users {"_id": "?", "city": {"$in": "?"}}'
+    )
+    assert command_shape("update", {"update": "users", "updates": [{"q": {"email": "x"}}]}) == (
+        'update users {"email": "?"}'
+    )
+
+
+async def test_repeated_shape_from_one_call_site_raises(tests_are_app_code):
+    with pytest.raises(RepeatedQueryError) as error:
+        with detect_repeated_queries(threshold=2):
+            for user_id in range(3):
+                await find_user(user_id)
+
+    message = str(error.value)
+    assert '3x find users {"_id": "?"}' in message
+    assert "test_query_detector.py" in message and "in find_user" in message
+
+
+async def test_shapes_under_threshold_pass(tests_are_app_code):
+    with detect_repeated_queries(threshold=2) as session:
+        for user_id in range(2):
+            await find_user(user_id)
+
+    assert session.offenders() == []
+    assert sum(session.counts.values()) == 2
+
+
+async def test_concurrent_queries_keep_their_own_call_site(tests_are_app_code):
+    async def lookup_guest(user_id: int):
+        await motor_asyncio.run_on_executor(asyncio.get_running_loop(), issue_find, user_id)
+
+    with detect_repeated_queries(threshold=5) as session:
+        await asyncio.gather(find_user(1), lookup_guest(2), find_user(3), lookup_guest(4))
+
+    sites = sorted(site.rsplit(" in ", 1)[1] for _, site in session.counts)
+    assert sites == ["find_user", "lookup_guest"]
+    assert sorted(session.counts.values()) == [2, 2]
+
+
+async def test_nothing_is_recorded_outside_a_session():
+    await find_user(1)
+    assert query_detector._session.get() is None
@@ -0,0 +1,79 @@
+# tests/test_stripe_events.py
+
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.core.clients import clients
+from app.models.stripe_event import StripeEvent
+from app.models.subscription import Subscription
+from app.services import stripe_events
+from app.services.stripe_events import _apply, _claim, process_stripe_event
+
+pytestmark = pytest.mark.anyio
+
+CHECKOUT = {
+    "subscription": "sub_1",
+    "customer_email": "payer@example.com",
+    "customer": "cus_1",
+    "metadata": {},
+}
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    sent = []
+
+    async def notify(email, status):
+        sent.append((email, status))
+
+    monkeypatch.setattr(stripe_events, "_notify", notify)
+    retrieve = lambda subscription_id: {"start_date": 1_700_000_000, "current_period_end": 1_702_592_000}
+    monkeypatch.setattr(clients, "_stripe", SimpleNamespace(Subscription=SimpleNamespace(retrieve=retrieve)))
+    return sent
+
+
+async def record(event_id: str, type: str, obj: dict) -> StripeEvent:
+    event = StripeEvent(event_id=event_id, type=type, payload={"data": {"object": obj}})
+    await event.insert()
+    return event
+
+
+async def test_reapplied_event_sends_its_email_once(db, queued):
+    await record("evt_1", "checkout.session.completed", CHECKOUT)
+    await process_stripe_event("evt_1")
+
+    # A sweeper retry after a crash applies the same event again
+    event = await _claim({"event_id": "evt_1"})
+    await _apply(event)
+
+    assert queued == [("payer@example.com", "active")]
+    assert await Subscription.find(Subscription.stripe_subscription_id == "sub_1").count() == 1
+    stored = await StripeEvent.find_one(StripeEvent.event_id == "evt_1")
+    assert stored.status == "processed"
+    assert stored.notified_at is not None
+
+
+async def test_failed_email_is_sent_by_the_retry(db, queued, monkeypatch):
+    async def broken(email, status):
+        raise RuntimeError("SQS down")
+
+    await record("evt_1", "checkout.session.completed", CHECKOUT)
+    with monkeypatch.context() as patch:
+        patch.setattr(stripe_events, "_notify", broken)
+        await process_stripe_event("evt_1")
+    assert (await StripeEvent.find_one(StripeEvent.event_id == "evt_1")).status == "failed"
+
+    await _apply(await _claim({"event_id": "evt_1"}))
+    assert queued == [("payer@example.com", "active")]
+
+
+async def test_subscription_ids_are_unique(db, queued):
+    await record("evt_1", "checkout.session.completed", CHECKOUT)
+    await process_stripe_event("evt_1")
+    existing = await Subscription.find_one(Subscription.stripe_subscription_id == "sub_1")
+
+    duplicate = Subscription(**existing.model_dump(exclude={"id", "revision_id"}))
+    with pytest.raises(DuplicateKeyError):
+        await duplicate.insert()
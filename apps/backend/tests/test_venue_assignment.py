@@ -0,0 +1,153 @@
+# tests/test_venue_assignment.py
+
+from datetime import datetime, timezone
+
+import pytest
+from beanie import PydanticObjectId
+
+from app.models.dinner import DinnerGroup, DinnerSummary
+from app.models.user import User
+from app.models.venue import Venue
+from app.services.notifications.venue import notify_venue_assignments
+from app.services.venue_assignment import (
+    BUDGET_STEP_COST,
+    UNKNOWN_BUDGET_COST,
+    WASTED_SEAT_COST,
+    assign_groups_to_venues,
+    assignment_cost,
+    split_for_assignment,
+)
+
+# Documents can only be built once Beanie is initialized
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("db")]
+
+CITY, COUNTRY = "Pune", "India"
+
+
+def make_group(budget="medium", size=6, venue_id=None) -> DinnerGroup:
+    return DinnerGroup(
+        id=PydanticObjectId(),
+        dinner_id=PydanticObjectId(),
+        budget_category=budget,
+        dietary_category=None,
+        participant_ids=[PydanticObjectId() for _ in range(size)],
+        venue_id=venue_id,
+    )
+
+
+def make_venue(budget="medium", capacity=1, max_group_size=6, **overrides) -> Venue:
+    fields = dict(
+        id=PydanticObjectId(),
+        name="Venue",
+        city=CITY,
+        country=COUNTRY,
+        budget_category=budget,
+        capacity=capacity,
+        max_group_size=max_group_size,
+    )
+    fields.update(overrides)
+    return Venue(**fields)
+
+
+async def test_cost_terms():
+    venue = make_venue(budget="medium", max_group_size=8)
+
+    assert assignment_cost("medium", 8, CITY, COUNTRY, venue) == 0
+    assert assignment_cost("medium", 6, CITY, COUNTRY, venue) == WASTED_SEAT_COST * 2
+    assert assignment_cost("high", 8, CITY, COUNTRY, venue) == BUDGET_STEP_COST
+    assert assignment_cost("low", 8, CITY, COUNTRY, make_venue(budget="high", max_group_size=8)) == 2 * BUDGET_STEP_COST
+    assert assignment_cost(None, 8, CITY, COUNTRY, venue) == UNKNOWN_BUDGET_COST
+    # Places are compared case- and whitespace-insensitively
+    assert assignment_cost("medium", 8, " pune ", "INDIA", venue) == 0
+
+
+async def test_cost_rejects_unusable_venues():
+    assert assignment_cost("medium", 7, CITY, COUNTRY, make_venue(max_group_size=6)) is None
+    assert assignment_cost("medium", 6, CITY, COUNTRY, make_venue(is_active=False)) is None
+    assert assignment_cost("medium", 6, "Mumbai", COUNTRY, make_venue()) is None
+
+
+async def test_capacity_limits_and_unassigned_groups():
+    groups = [make_group() for _ in range(5)]
+    small, large = make_venue(capacity=1), make_venue(capacity=2)
+
+    result = assign_groups_to_venues(groups, [small, large], CITY, COUNTRY)
+
+    assert len(result.assignments) == 3
+    assert list(result.assignments.values()).count(small.id) == 1
+    assert list(result.assignments.values()).count(large.id) == 2
+    assert len(result.unassigned) == 2
+    assert set(result.assignments) | set(result.unassigned) == {group.id for group in groups}
+
+
+async def test_budget_outweighs_wasted_seats():
+    group = make_group(budget="low", size=6)
+    same_budget_roomy = make_venue(budget="low", max_group_size=10)
+    other_budget_snug = make_venue(budget="high", max_group_size=6)
+
+    result = assign_groups_to_venues([group], [other_budget_snug, same_budget_roomy], CITY, COUNTRY)
+
+    assert result.assignments == {group.id: same_budget_roomy.id}
+    assert result.total_cost == round(4 * WASTED_SEAT_COST, 4)
+
+
+async def test_groups_are_seated_by_size_then_cost():
+    big = make_group(budget="medium", size=8)
+    small = make_group(budget="medium", size=6)
+    roomy = make_venue(budget="high", max_group_size=8)
+    snug = make_venue(budget="medium", max_group_size=6)
+
+    result = assign_groups_to_venues([small, big], [snug, roomy], CITY, COUNTRY)
+
+    # Seating both groups beats giving the small group the cheaper venue alone
+    assert result.assignments == {big.id: roomy.id, small.id: snug.id}
+    assert result.unassigned == []
+
+
+async def test_groups_that_fit_nowhere_stay_unassigned():
+    group = make_group(size=9)
+
+    result = assign_groups_to_venues([group], [make_venue(max_group_size=8)], CITY, COUNTRY)
+
+    assert result.assignments == {}
+    assert result.unassigned == [group.id]
+
+
+async def test_existing_assignments_use_capacity_without_overwrite():
+    venue = make_venue(capacity=2)
+    other = make_venue(capacity=1, budget="high")
+    seated = make_group(venue_id=venue.id)
+    waiting = [make_group(), make_group()]
+
+    pending, used = split_for_assignment([seated, *waiting], overwrite=False)
+    assert [group.id for group in pending] == [group.id for group in waiting]
+    assert used == {venue.id: 1}
+
+    result = assign_groups_to_venues(pending, [venue, other], CITY, COUNTRY, used)
+    assert sorted(result.assignments.values(), key=str) == sorted([venue.id, other.id], key=str)
+
+    pending, used = split_for_assignment([seated, *waiting], overwrite=True)
+    assert len(pending) == 3
+    assert used == {}
+
+
+async def test_full_venues_are_skipped():
+    venue = make_venue(capacity=1)
+    group = make_group()
+
+    result = assign_groups_to_venues([group], [venue], CITY, COUNTRY, {venue.id: 1})
+
+    assert result.unassigned == [group.id]
+
+
+async def test_only_accepted_notifications_are_counted(sqs):
+    users = [User(email=f"guest{i}@example.com") for i in range(3)]
+    for user in users:
+        await user.insert()
+    group = make_group()
+    group.participant_ids = [user.id for user in users]
+    dinner = DinnerSummary(_id=group.dinner_id, date=datetime.now(timezone.utc), city=CITY, country=COUNTRY)
+    sqs.failing_emails.add("guest1@example.com")
+
+    assert await notify_venue_assignments(dinner, [(group, make_venue())]) == 2
+    assert len(sqs.messages) == 2